@@ -0,0 +1,46 @@
+"""Shared helpers for the offline benchmark scripts."""
+
+from __future__ import annotations
+
+import json
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = Path(__file__).resolve().with_name("fixtures")
+
+if str(PACKAGE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PACKAGE_ROOT))
+
+SAMPLE_ARTICLE = (
+    "Climate finance markets are moving as central banks weigh carbon pricing and the energy transition. "
+    "Regulators in Europe argue that green bonds need stricter disclosure, while investors in Asia push "
+    "for faster approvals of renewable projects. Analysts expect payments networks and fintech lenders "
+    "to compete for the new flows, and public health researchers warn that heat waves are already "
+    "reshaping hospital budgets across the region."
+)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_ms(samples: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def emit(name: str, results: Dict) -> None:
+    print(json.dumps({"benchmark": name, "results": results}, indent=2))
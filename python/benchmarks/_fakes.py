@@ -0,0 +1,150 @@
+"""Stand-in backends so model-bound code paths can be measured without a GGUF file."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, Iterator, List
+
+FAKE_RESPONSE = json.dumps(
+    {
+        "spotlight_subject": "Climate Finance · carbon pricing",
+        "questions": [
+            "Which institutions set the carbon price and who audits them?",
+            "How do green bond disclosures compare across regions?",
+        ],
+        "presentation_prompt": "Frame carbon pricing as a trade-off between speed and fairness.",
+        "presentation_question": "What would convince a sceptical CFO to fund the transition now?",
+        "impact_hints": ["Watch hospital budgets during heat waves.", "Track fintech lending volumes."],
+    }
+)
+
+
+class FakeLlama:
+    """Mimics the slice of `llama_cpp.Llama` the toolkit uses.
+
+    Class attributes control simulated costs: `load_delay` per construction
+    (GGUF mmap + init), `prompt_delay` per prompt token evaluated, and
+    `token_delay` per generated token. Like llama.cpp, only prompt tokens past
+    the longest prefix already in the context are evaluated, and the context
+    can be captured with `save_state` and restored with `load_state`.
+    """
+
+    load_delay = 0.5
+    prompt_delay = 0.0
+    token_delay = 0.002
+    response = FAKE_RESPONSE
+    instances = 0
+    completions = 0
+
+    def __init__(self, model_path: str, n_ctx: int = 2048, n_threads: int = 4, **_: Any) -> None:
+        time.sleep(self.load_delay)
+        type(self).instances += 1
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+        self.n_threads = n_threads
+        self.closed = False
+        self.input_ids: List[int] = []
+        self.prompt_tokens_evaluated = 0
+
+    def tokenize(self, text: bytes, add_bos: bool = True, special: bool = False) -> List[int]:
+        return [hash(word) & 0xFFFF for word in text.decode("utf-8", "ignore").split()]
+
+    def _pieces(self, max_tokens: int) -> List[str]:
+        text = self.response
+        return [text[index : index + 4] for index in range(0, len(text), 4)][:max_tokens]
+
+    def reset(self) -> None:
+        self.input_ids = []
+
+    def eval(self, tokens: List[int]) -> None:
+        time.sleep(self.prompt_delay * len(tokens))
+        self.prompt_tokens_evaluated += len(tokens)
+        self.input_ids.extend(tokens)
+
+    def save_state(self) -> List[int]:
+        return list(self.input_ids)
+
+    def load_state(self, state: List[int]) -> None:
+        self.input_ids = list(state)
+
+    def _evaluate_prompt(self, prompt: str) -> None:
+        tokens = self.tokenize(prompt.encode("utf-8"))
+        shared = 0
+        for cached, token in zip(self.input_ids, tokens):
+            if cached != token:
+                break
+            shared += 1
+        self.input_ids = self.input_ids[:shared]
+        self.eval(tokens[shared:])
+
+    def _stream(self, prompt: str, max_tokens: int) -> Iterator[Dict[str, Any]]:
+        type(self).completions += 1
+        self._evaluate_prompt(prompt)
+        for piece in self._pieces(max_tokens):
+            time.sleep(self.token_delay)
+            yield {"choices": [{"text": piece, "finish_reason": None}]}
+
+    def _completion(self, text: str) -> Dict[str, Any]:
+        return {"choices": [{"text": text, "finish_reason": "stop"}], "usage": {"completion_tokens": (len(text) + 3) // 4}}
+
+    def create_completion(self, prompt: str, max_tokens: int = 16, stream: bool = False, **_: Any) -> Any:
+        chunks = self._stream(prompt, max_tokens)
+        if stream:
+            return chunks
+        return self._completion("".join(chunk["choices"][0]["text"] for chunk in chunks))
+
+
+class BatchedFakeLlama(FakeLlama):
+    """`FakeLlama` that decodes several sequences per step; each extra sequence adds `batch_overhead` to a step."""
+
+    batch_overhead = 0.15
+
+    def create_completion_batch(self, prompts: List[str], max_tokens: int = 16, **_: Any) -> List[Dict[str, Any]]:
+        prefix = list(self.input_ids)
+        for prompt in prompts:
+            self.input_ids = list(prefix)
+            self._evaluate_prompt(prompt)
+        pieces = self._pieces(max_tokens)
+        time.sleep(self.token_delay * len(pieces) * (1 + self.batch_overhead * (len(prompts) - 1)))
+        return [self._completion("".join(pieces)) for _ in prompts]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeArgosTranslation:
+    """Stands in for an Argos `ITranslation`: cost grows with the characters translated."""
+
+    char_delay = 0.00002
+
+    def __init__(self, to_code: str) -> None:
+        self.to_code = to_code
+        self.characters = 0
+
+    def translate(self, text: str) -> str:
+        # Argos translates paragraph by paragraph and keeps the line structure.
+        self.characters += len(text)
+        time.sleep(self.char_delay * len(text))
+        return "\n".join(f"[{self.to_code}] {line}" if line.strip() else line for line in text.split("\n"))
+
+
+class FakeArgosTranslate:
+    """Stands in for the `argostranslate.translate` module; `load_delay` models building a pair."""
+
+    load_delay = 0.4
+
+    def __init__(self) -> None:
+        self.loads = 0
+        self.translations: List[FakeArgosTranslation] = []
+
+    def get_translation(self, from_code: str, to_code: str) -> FakeArgosTranslation:
+        time.sleep(self.load_delay)
+        self.loads += 1
+        translation = FakeArgosTranslation(to_code)
+        self.translations.append(translation)
+        return translation
+
+    @property
+    def characters(self) -> int:
+        return sum(translation.characters for translation in self.translations)
@@ -0,0 +1,115 @@
+"""Deterministic HTML/RSS fixtures for offline ingest benchmarks."""
+
+from __future__ import annotations
+
+import email.utils
+import random
+from typing import List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+TOPICS = [
+    ("climate", "Carbon markets", "Regulators weigh stricter disclosure for green bonds and transition loans."),
+    ("economy", "Central banks", "Rate setters debate how quickly inflation will return to target."),
+    ("health", "Public health", "Hospitals prepare for longer heat waves and shifting disease patterns."),
+    ("technology", "Chip supply", "Foundries race to add capacity for data centre and AI accelerators."),
+    ("culture", "Language revival", "Communities document endangered languages with open archives."),
+    ("world", "Trade diplomacy", "Negotiators revisit tariffs as regional alliances shift."),
+]
+
+FILLER = [
+    "Analysts said the decision would ripple through supply chains over the coming quarters.",
+    "Officials declined to give a timeline but promised further consultation with industry groups.",
+    "Independent researchers cautioned that the available data remains incomplete and uneven.",
+    "Local organisers described a mix of optimism and fatigue after years of incremental change.",
+    "Several investors noted that financing costs remain the main obstacle for smaller projects.",
+    "Critics argued the plan favours incumbents and leaves rural communities behind.",
+    "The report draws on interviews with more than forty practitioners across three continents.",
+    "Budget documents show spending rising steadily since the policy was first announced.",
+]
+
+
+def article_parts(index: int, paragraphs: int = 6) -> Tuple[str, str, List[str]]:
+    rng = random.Random(index)
+    tag, title, lede = TOPICS[index % len(TOPICS)]
+    body = [lede] + [" ".join(rng.sample(FILLER, 3)) for _ in range(paragraphs - 1)]
+    return tag, f"{title} update #{index}", body
+
+
+BOILERPLATE = [
+    "Sign up for our newsletter to get the morning briefing.",
+    "Share this story.",
+    "Advertisement",
+    "Read more: our full coverage of the week's top stories.",
+    "This article was updated with additional reporting.",
+]
+
+
+def long_article(index: int, paragraphs: int = 40) -> Tuple[str, str, str]:
+    """A long article body with boilerplate lines scattered between paragraphs."""
+    tag, title, body = article_parts(index, paragraphs)
+    rng = random.Random(index * 7919)
+    blocks: List[str] = []
+    for paragraph in body:
+        blocks.append(paragraph)
+        if rng.random() < 0.3:
+            blocks.append(rng.choice(BOILERPLATE))
+    return tag, title, "\n\n".join(blocks)
+
+
+def article_html(index: int, paragraphs: int = 6) -> str:
+    tag, title, body = article_parts(index, paragraphs)
+    paras = "\n".join(f"      <p>{escape(text)}</p>" for text in body)
+    return f"""<!doctype html>
+<html lang="en">
+  <head><meta charset="utf-8"><title>{escape(title)}</title></head>
+  <body>
+    <header><nav><a href="/">Home</a> | <a href="/{tag}">{tag.title()}</a> | <a href="/about">About</a></nav></header>
+    <main>
+      <article>
+      <h1>{escape(title)}</h1>
+      <p class="byline">By Staff Reporter</p>
+{paras}
+      </article>
+    </main>
+    <aside><h2>Most read</h2><ul><li><a href="/a">Story A</a></li><li><a href="/b">Story B</a></li></ul></aside>
+    <footer><p>Copyright Example News. All rights reserved.</p></footer>
+  </body>
+</html>
+"""
+
+
+def rss_feed(
+    links: Sequence[str],
+    title: str = "Stub feed",
+    language: str = "en",
+    published: Optional[Sequence[float]] = None,
+) -> str:
+    """RSS 2.0 with one item per link; `published` gives each item's Unix publish time."""
+    items = []
+    for index, link in enumerate(links):
+        if published is not None:
+            pub_date = email.utils.formatdate(published[index], usegmt=True)
+        else:
+            pub_date = f"Mon, {1 + index % 28:02d} Sep 2026 08:00:00 GMT"
+        tag, headline, body = article_parts(index)
+        items.append(
+            f"""    <item>
+      <title>{escape(headline)}</title>
+      <link>{escape(link)}</link>
+      <guid>{escape(link)}</guid>
+      <description>{escape(body[0])}</description>
+      <category>{tag}</category>
+      <pubDate>{pub_date}</pubDate>
+    </item>"""
+        )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>{escape(title)}</title>
+    <link>http://example.test/</link>
+    <description>Offline benchmark feed</description>
+    <language>{language}</language>
+{chr(10).join(items)}
+  </channel>
+</rss>
+"""
@@ -0,0 +1,110 @@
+"""Local HTTP stub used by the ingest benchmarks."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+@dataclass
+class Route:
+    body: bytes
+    content_type: str = "text/html; charset=utf-8"
+    delay: float = 0.0
+    status: int = 200
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class _QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address) -> None:
+        # Clients that stop reading early (size caps, skipped content types) reset the connection.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+    """Threaded server with canned routes, per-route latency, and conditional GET.
+
+    It binds every interface so `127.0.0.2`, `127.0.0.3`, ... resolve to the same
+    server while counting as distinct hosts for per-host limits.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, Route] = {}
+        self.hits: Counter = Counter()
+        self.not_modified: Counter = Counter()
+        # (host, path, started, finished) per request, for checking per-host concurrency and spacing.
+        self.log: List[Tuple[str, str, float, float]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, path: str, body, **options) -> str:
+        self.routes[path] = Route(body=body.encode("utf-8") if isinstance(body, str) else body, **options)
+        return path
+
+    def url(self, path: str, host: str = "127.0.0.1") -> str:
+        assert self._server is not None, "server not started"
+        return f"http://{host}:{self._server.server_address[1]}{path}"
+
+    def __enter__(self) -> "StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                path = urlsplit(self.path).path
+                started = time.perf_counter()
+                try:
+                    self._serve(path)
+                finally:
+                    stub.log.append((self.headers.get("Host", ""), path, started, time.perf_counter()))
+
+            def _serve(self, path: str) -> None:
+                route = stub.routes.get(path)
+                stub.hits[path] += 1
+                if route is None:
+                    self._reply(404, b"not found", "text/plain")
+                    return
+                if route.delay:
+                    time.sleep(route.delay)
+                if (route.etag and self.headers.get("If-None-Match") == route.etag) or (
+                    route.last_modified and self.headers.get("If-Modified-Since") == route.last_modified
+                ):
+                    stub.not_modified[path] += 1
+                    self._reply(304, b"", route.content_type, route)
+                    return
+                self._reply(route.status, route.body, route.content_type, route)
+
+            def _reply(self, status: int, body: bytes, content_type: str, route: Optional[Route] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if route and route.etag:
+                    self.send_header("ETag", route.etag)
+                if route and route.last_modified:
+                    self.send_header("Last-Modified", route.last_modified)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, *_args) -> None:
+                return
+
+        self._server = _QuietServer(("0.0.0.0", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
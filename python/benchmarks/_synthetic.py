@@ -0,0 +1,38 @@
+"""Synthetic taxonomy generator for scaling benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import Dict, List
+
+GROUPS = ["global", "economy", "science", "technology", "culture", "society", "environment"]
+WORDS = [
+    "policy", "markets", "energy", "health", "climate", "trade", "security", "education", "media",
+    "transport", "housing", "water", "food", "labour", "privacy", "space", "ocean", "urban", "rural",
+    "finance", "biotech", "language", "music", "sport", "design", "law", "migration", "data",
+]
+
+
+def synthetic_taxonomy(size: int, seed: int = 7, fanout: int = 8) -> List[Dict]:
+    """Return `size` category dicts in `categories.json` shape.
+
+    Roughly one in `fanout` entries is a root; the rest hang off an earlier
+    entry, so ancestor chains grow logarithmically with `size`.
+    """
+    rng = random.Random(seed)
+    entries: List[Dict] = []
+    for index in range(size):
+        group = GROUPS[index % len(GROUPS)]
+        parents = [] if index < fanout or rng.random() < 1 / fanout else [entries[rng.randrange(index)]["slug"]]
+        tags = sorted({rng.choice(WORDS) for _ in range(3)} | {f"t{rng.randrange(size * 2)}"})
+        entries.append(
+            {
+                "slug": f"subject-{index}",
+                "label": f"Subject {index} {rng.choice(WORDS).title()}",
+                "group": group,
+                "parents": parents,
+                "tags": tags,
+                "professional": rng.random() < 0.2,
+            }
+        )
+    return entries
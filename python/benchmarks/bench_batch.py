@@ -0,0 +1,49 @@
+"""Batch study-suggest / professional-brief throughput (articles/sec) at 1, 4 and N workers.
+
+Usage: python benchmarks/bench_batch.py [--records 400] [--workers 1 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from _common import emit
+from _fixtures import article_parts
+
+from openyourbubble.batch import run_batch
+
+
+def records(count: int, salt: str):
+    for index in range(count):
+        tag, title, body = article_parts(index, paragraphs=8)
+        # a unique line per record and run keeps the keyword cache from hiding YAKE cost
+        text = "\n".join(body) + f"\nRef {salt}-{index}."
+        yield {"id": index, "topic": title, "category": tag, "text": text}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 4, os.cpu_count() or 1}))
+    options = parser.parse_args()
+    results = {}
+    for kind in ("study-suggest", "professional-brief"):
+        per_kind = {}
+        for workers in options.workers:
+            started = time.perf_counter()
+            outputs = list(run_batch(kind, records(options.records, f"{kind}-{workers}"), workers=workers))
+            elapsed = time.perf_counter() - started
+            assert [output["id"] for output in outputs] == list(range(options.records)), "batch reordered output"
+            assert not any("error" in output for output in outputs), "batch produced errors"
+            per_kind[f"workers_{workers}"] = {
+                "seconds": round(elapsed, 3),
+                "articles_per_s": round(options.records / elapsed, 1),
+            }
+        results[kind] = per_kind
+    emit("batch", {"cpu_count": os.cpu_count(), **results})
+
+
+if __name__ == "__main__":
+    main()
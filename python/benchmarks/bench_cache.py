@@ -0,0 +1,85 @@
+"""Conditional-GET cache behaviour against a local stub that answers 304s.
+
+Runs the same ingest three times: a cold pass, a warm pass where every feed
+and article revalidates with a 304, and a pass against hosts that send no
+validators so unchanged bodies are caught by content hash. Exits non-zero if
+the warm passes re-extract anything.
+
+Usage: python benchmarks/bench_cache.py [--items 12]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from _common import emit
+from _fixtures import article_html, rss_feed
+from _stub import StubServer
+
+from openyourbubble.cache import HttpCache
+from openyourbubble.ingest import Ingestor
+
+
+class CountingIngestor(Ingestor):
+    extractions = 0
+
+    def _extract_text(self, html: bytes, content_type: Optional[str] = None) -> str:
+        type(self).extractions += 1
+        return super()._extract_text(html, content_type)
+
+
+def build(stub: StubServer, items: int, validators: bool, prefix: str) -> str:
+    links = []
+    for index in range(items):
+        options = {"etag": f'"{prefix}-{index}"', "last_modified": "Mon, 01 Sep 2026 08:00:00 GMT"} if validators else {}
+        path = stub.add(f"/{prefix}/article/{index}", article_html(index), delay=0.02, **options)
+        links.append(stub.url(path))
+    feed_options = {"etag": f'"{prefix}-feed"'} if validators else {}
+    stub.add(f"/{prefix}/feed.xml", rss_feed(links), content_type="application/rss+xml", **feed_options)
+    return stub.url(f"/{prefix}/feed.xml")
+
+
+def run(feed_url: str, cache: HttpCache) -> dict:
+    CountingIngestor.extractions = 0
+    ingestor = CountingIngestor(cache=cache, concurrency=4)
+    started = time.perf_counter()
+    items = ingestor.ingest_feed(feed_url)
+    return {
+        "seconds": round(time.perf_counter() - started, 3),
+        "items": len(items),
+        "extractions": CountingIngestor.extractions,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=12)
+    options = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp, StubServer() as stub:
+        cache = HttpCache(Path(tmp) / "cache.sqlite")
+        etag_feed = build(stub, options.items, validators=True, prefix="etag")
+        plain_feed = build(stub, options.items, validators=False, prefix="plain")
+        results = {
+            "cold": run(etag_feed, cache),
+            "revalidated_304": run(etag_feed, cache),
+            "plain_cold": run(plain_feed, cache),
+            "plain_hash_match": run(plain_feed, cache),
+            "stub_304_responses": sum(stub.not_modified.values()),
+            "cache": cache.stats(),
+        }
+        cache.close()
+    emit("http_cache", results)
+    warm_extractions = results["revalidated_304"]["extractions"] + results["plain_hash_match"]["extractions"]
+    if warm_extractions or results["stub_304_responses"] != options.items + 1:
+        print("FAIL warm passes re-extracted content or skipped conditional requests", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
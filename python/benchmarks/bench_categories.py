@@ -0,0 +1,54 @@
+"""Category resolution throughput: indexed `CategoryGraph.resolve` vs the old full scan.
+
+Usage: python benchmarks/bench_categories.py [--sizes 40 1000 10000] [--entries 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Iterable, List
+
+from _common import emit
+from _synthetic import synthetic_taxonomy
+
+from openyourbubble.categories import CategoryGraph, load_graph
+
+
+def scan_resolve(graph: CategoryGraph, tags: Iterable[str]) -> List[str]:
+    resolved = []
+    normalized = {tag.strip().lower() for tag in tags if tag}
+    for category in graph.all():
+        if normalized.intersection({category.slug, category.label.lower(), *category.tags}):
+            resolved.append(category.slug)
+    return resolved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 1000, 10000])
+    parser.add_argument("--entries", type=int, default=500)
+    options = parser.parse_args()
+    results = {}
+    for size in options.sizes:
+        graph = load_graph() if size == 40 else CategoryGraph(synthetic_taxonomy(size))
+        vocabulary = [tag for cat in graph.all() for tag in cat.tags] + ["unmatched", "noise"]
+        rng = random.Random(size)
+        batches = [rng.sample(vocabulary, 3) for _ in range(options.entries)]
+        started = time.perf_counter()
+        expected = [scan_resolve(graph, tags) for tags in batches]
+        scan = time.perf_counter() - started
+        started = time.perf_counter()
+        actual = [graph.resolve(tags) for tags in batches]
+        indexed = time.perf_counter() - started
+        assert actual == expected, "indexed resolution diverged from the scan"
+        results[str(size)] = {
+            "scan_entries_per_s": round(options.entries / scan),
+            "indexed_entries_per_s": round(options.entries / indexed),
+        }
+    emit("categories_resolve", results)
+
+
+if __name__ == "__main__":
+    main()
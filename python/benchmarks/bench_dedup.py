@@ -0,0 +1,148 @@
+"""Near-duplicate detection: MinHash accuracy on syndicated copies and index cost at scale.
+
+Accuracy: distinct synthetic articles plus "syndicated" copies of some of
+them, each with a different byline and footer and one sentence reworded.
+Scale: an on-disk `DedupIndex` filled with random signatures, reporting load
+rate, lookup p50/p99 (half the probes share at least 48 of 64 values with a
+stored signature), on-disk bytes and resident memory per stored signature.
+
+Usage: python benchmarks/bench_dedup.py [--articles 400] [--sizes 10000,100000,300000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from _common import emit, summarize_ms
+
+from openyourbubble.dedup import PERMUTATIONS, DedupIndex, minhash
+
+STEMS = (
+    "market", "council", "energy", "report", "budget", "court", "school", "health", "harbour", "rail",
+    "farm", "bank", "union", "river", "storm", "trade", "vote", "price", "water", "tower",
+)
+VOCABULARY = [stem + suffix for stem in STEMS for suffix in ("", "s", "ing", "ed", "er", "al", "ity", "ment")]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+
+def _article(rng: random.Random, sentences: int = 14) -> List[str]:
+    return [_sentence(rng, rng.randint(12, 22)) for _ in range(sentences)]
+
+
+def _syndicate(sentences: List[str], rng: random.Random, outlet: int) -> str:
+    copy = list(sentences)
+    copy[rng.randrange(len(copy))] = _sentence(rng, 15)
+    body = "\n\n".join(copy)
+    return f"By Outlet {outlet} staff.\n\n{body}\n\nCopyright Outlet {outlet}. All rights reserved."
+
+
+def accuracy(count: int) -> Dict[str, float]:
+    rng = random.Random(11)
+    originals = [_article(rng) for _ in range(count)]
+    index = DedupIndex()
+    started = time.perf_counter()
+    for number, sentences in enumerate(originals):
+        index.check(f"https://origin.example/{number}", "\n\n".join(sentences))
+    false_positives = index.stats()["duplicates"]
+    caught = 0
+    copies = count // 2
+    for number in range(copies):
+        match = index.check(f"https://outlet.example/{number}", _syndicate(originals[number], rng, number % 7))
+        caught += bool(match and match.url == f"https://origin.example/{number}")
+    elapsed = time.perf_counter() - started
+    return {
+        "originals": count,
+        "false_positives": false_positives,
+        "syndicated_copies": copies,
+        "recall": round(caught / copies, 4) if copies else 0.0,
+        "us_per_check": round(elapsed / (count + copies) * 1e6, 1),
+    }
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * 4096
+
+
+def _random_signature(rng: random.Random) -> np.ndarray:
+    return np.array([rng.getrandbits(32) for _ in range(PERMUTATIONS)], dtype=np.uint32)
+
+
+def _near(signature: np.ndarray, rng: random.Random, changed: int) -> np.ndarray:
+    copy = signature.copy()
+    for position in rng.sample(range(PERMUTATIONS), changed):
+        copy[position] = rng.getrandbits(32)
+    return copy
+
+
+def scale(size: int, probes: int = 1000) -> Dict[str, float]:
+    rng = random.Random(size)
+    signatures = [_random_signature(rng) for _ in range(size)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dedup.sqlite"
+        rss_before = _rss_bytes()
+        index = DedupIndex(path)
+        started = time.perf_counter()
+        for start in range(0, size, 10_000):
+            batch = signatures[start : start + 10_000]
+            index.add_many([(f"https://example.test/{start + offset}", value) for offset, value in enumerate(batch)])
+        load = time.perf_counter() - started
+        queries: List[Tuple[np.ndarray, bool]] = []
+        for number in range(probes):
+            if number % 2:
+                queries.append((_near(rng.choice(signatures), rng, rng.randint(0, 16)), True))
+            else:
+                queries.append((_random_signature(rng), False))
+        samples, found = [], 0
+        for signature, expected in queries:
+            started = time.perf_counter()
+            match = index.nearest(signature)
+            samples.append(time.perf_counter() - started)
+            found += bool(match) == expected
+        rss_after = _rss_bytes()
+        index.close()
+        disk = sum(file.stat().st_size for file in Path(tmp).iterdir())
+    return {
+        "signatures": size,
+        "load_per_s": round(size / load),
+        "lookup": summarize_ms(samples),
+        "correct_lookups": round(found / probes, 4),
+        "disk_bytes_per_signature": round(disk / size, 1),
+        "rss_bytes_per_signature": round(max(0, rss_after - rss_before) / size, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=400)
+    parser.add_argument("--sizes", default="10000,100000,300000")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    text = "\n\n".join(_article(rng, 40))
+    started = time.perf_counter()
+    for _ in range(200):
+        minhash(text)
+    minhash_us = (time.perf_counter() - started) / 200 * 1e6
+
+    emit(
+        "dedup",
+        {
+            "minhash_us_per_article": round(minhash_us, 1),
+            "accuracy": accuracy(args.articles),
+            "scale": [scale(int(size)) for size in args.sizes.split(",") if size],
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Article extraction CPU time: one shared lxml parse vs the previous three-parse path.
+
+The previous path handed the decoded page to trafilatura, re-parsed it with
+readability when trafilatura found nothing, and parsed readability's HTML
+summary once more with BeautifulSoup. The current `extract_text` parses once
+and shares the tree. Both run over the saved pages in `fixtures/html`, timed
+with `time.process_time` (median of alternating runs); the report groups
+pages by the extractor that produced their text and checks both paths agree.
+
+Non-article responses (a PDF, an image, a JSON error body, a tiny stub page)
+are timed too, since the pre-check now turns them away before parsing. A
+final pass fetches an oversized page from the local stub with and without the
+`Ingestor` size cap.
+
+Usage: python benchmarks/bench_extract.py [--repeat 21] [--oversized-mb 24]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, Optional, Union
+
+from _common import FIXTURES, emit
+from _fixtures import article_html
+from _stub import StubServer
+
+import trafilatura
+from bs4 import BeautifulSoup
+from readability import Document
+
+from openyourbubble.extract import extract_text
+from openyourbubble.ingest import Ingestor
+
+CONTENT_TYPES = {"feature-latin1.html": "text/html"}
+
+NON_ARTICLES = {
+    "pdf": (b"%PDF-1.7\n" + bytes(range(256)) * 400, "application/pdf"),
+    "png": (b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 200, "image/png"),
+    "json_error": (b'{"error": "not found", "detail": "' + b"x" * 2000 + b'"}', "application/json"),
+    "tiny_stub": (b"<html><body>Moved</body></html>", "text/html"),
+    # Served as text/html but binary: only the byte sniffing catches it.
+    "mislabelled_zip": (b"PK\x03\x04" + bytes(range(256)) * 300, "text/html"),
+}
+
+
+def legacy_extract(body: bytes, content_type: Optional[str] = None) -> str:
+    html = body.decode("iso-8859-1" if content_type == "text/html" else "utf-8", errors="replace")
+    extracted = trafilatura.extract(html, include_comments=False, include_tables=False)
+    if extracted:
+        return extracted
+    readable = Document(html)
+    return BeautifulSoup(readable.summary(html_partial=True), "lxml").get_text("\n")
+
+
+def _cpu(functions: Dict[str, Callable[[], str]], repeat: int) -> Dict[str, Dict[str, Union[float, str]]]:
+    """Median CPU time per function, alternating between them so drift hits both alike."""
+    samples: Dict[str, list] = {name: [] for name in functions}
+    texts: Dict[str, str] = {}
+    for _ in range(repeat):
+        for name, function in functions.items():
+            started = time.process_time()
+            texts[name] = function()
+            samples[name].append(time.process_time() - started)
+    return {
+        name: {"cpu_ms": round(statistics.median(samples[name]) * 1000, 2), "text": texts[name]}
+        for name in functions
+    }
+
+
+def _words(text: str) -> set:
+    return set(text.split())
+
+
+def corpus(repeat: int) -> Dict[str, object]:
+    pages: Dict[str, object] = {}
+    totals: Dict[str, Dict[str, float]] = {}
+    for path in sorted((FIXTURES / "html").glob("*.html")):
+        body = path.read_bytes()
+        content_type = CONTENT_TYPES.get(path.name, "text/html; charset=utf-8")
+        timed = _cpu(
+            {
+                "legacy": lambda: legacy_extract(body, content_type),
+                "shared": lambda: extract_text(body, content_type),
+            },
+            repeat,
+        )
+        legacy, shared = timed["legacy"], timed["shared"]
+        direct = trafilatura.extract(body, include_comments=False, include_tables=False)
+        extractor = "trafilatura" if direct else "readability"
+        old_words, new_words = _words(str(legacy["text"])), _words(str(shared["text"]))
+        group = totals.setdefault(extractor, {"pages": 0, "legacy_cpu_ms": 0.0, "shared_parse_cpu_ms": 0.0})
+        group["pages"] += 1
+        group["legacy_cpu_ms"] += float(legacy["cpu_ms"])
+        group["shared_parse_cpu_ms"] += float(shared["cpu_ms"])
+        pages[path.name] = {
+            "bytes": len(body),
+            "extractor": extractor,
+            "legacy_cpu_ms": legacy["cpu_ms"],
+            "shared_parse_cpu_ms": shared["cpu_ms"],
+            "chars": len(str(shared["text"])),
+            "word_overlap": round(len(old_words & new_words) / max(1, len(old_words | new_words)), 4),
+        }
+    for group in totals.values():
+        group["legacy_cpu_ms"] = round(group["legacy_cpu_ms"], 2)
+        group["shared_parse_cpu_ms"] = round(group["shared_parse_cpu_ms"], 2)
+        group["saved_pct"] = round(100 * (1 - group["shared_parse_cpu_ms"] / max(group["legacy_cpu_ms"], 1e-9)), 1)
+    return {"pages": pages, "by_extractor": totals}
+
+
+def non_articles(repeat: int) -> Dict[str, object]:
+    results = {}
+    for name, (body, content_type) in NON_ARTICLES.items():
+        timed = _cpu(
+            {"legacy": lambda: legacy_extract(body), "shared": lambda: extract_text(body, content_type)}, repeat
+        )
+        results[name] = {
+            "legacy_cpu_ms": timed["legacy"]["cpu_ms"],
+            "precheck_cpu_ms": timed["shared"]["cpu_ms"],
+            "skipped": not timed["shared"]["text"],
+        }
+    return results
+
+
+def oversized(megabytes: int) -> Dict[str, object]:
+    page = article_html(1).replace("</body>", f"<script>var blob = '{'x' * (megabytes << 20)}';</script></body>")
+    results = {}
+    with StubServer() as stub:
+        url = stub.url(stub.add("/huge.html", page))
+        for label, limit in (("uncapped", None), ("capped_1mb", 1 << 20)):
+            ingestor = Ingestor(max_html_bytes=limit)
+            started_cpu, started = time.process_time(), time.perf_counter()
+            text = ingestor._extract_html(url)
+            results[label] = {
+                "seconds": round(time.perf_counter() - started, 3),
+                "cpu_ms": round((time.process_time() - started_cpu) * 1000, 1),
+                "chars": len(text),
+            }
+    return {"page_mb": megabytes, **results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=21)
+    parser.add_argument("--oversized-mb", type=int, default=24)
+    args = parser.parse_args()
+    emit(
+        "extract",
+        {
+            "corpus": corpus(args.repeat),
+            "non_articles": non_articles(args.repeat),
+            "oversized": oversized(args.oversized_mb),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
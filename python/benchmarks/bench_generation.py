@@ -0,0 +1,113 @@
+"""Tokens/sec and queue latency for concurrent generations through `GenerationScheduler`.
+
+Compares the previous behaviour (one `create_completion` at a time, full prompt
+evaluated on every call) with the scheduler's prefix reuse, and with batched
+decoding on a backend that supports it. Uses the fake llama.cpp backends.
+
+Usage: python benchmarks/bench_generation.py [--requests 32] [--clients 8] [--max-delay-ms 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from _common import SAMPLE_ARTICLE, emit, summarize_ms
+from _fakes import BatchedFakeLlama, FakeLlama
+
+from openyourbubble.generation import GenerationScheduler
+from openyourbubble.llm import MaybeModel
+
+PROMPTS = MaybeModel()
+
+
+def _parts(index: int) -> List[str]:
+    prefix = PROMPTS._prompt_prefix("quen-3.4b")
+    suffix = PROMPTS._prompt_suffix(
+        topic=f"climate {index}", keywords=["carbon", "bonds"], article_text=SAMPLE_ARTICLE
+    )
+    return [prefix, suffix]
+
+
+def _drive(requests: int, clients: int, call: Callable[[int], Any]) -> Dict[str, Any]:
+    latencies: List[float] = []
+
+    def one(index: int) -> None:
+        started = time.perf_counter()
+        call(index)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(requests)))
+    return {"elapsed": time.perf_counter() - started, "latency": summarize_ms(latencies)}
+
+
+def _sequential(backend: FakeLlama, requests: int, clients: int) -> Dict[str, Any]:
+    lock = threading.Lock()
+    tokens = [0]
+
+    def call(index: int) -> None:
+        with lock:
+            backend.reset()
+            response = backend.create_completion(prompt="".join(_parts(index)), max_tokens=512)
+            tokens[0] += response["usage"]["completion_tokens"]
+
+    run = _drive(requests, clients, call)
+    return {
+        "tokens_per_s": round(tokens[0] / run["elapsed"], 1),
+        "request_latency": run["latency"],
+        "prompt_tokens_evaluated": backend.prompt_tokens_evaluated,
+    }
+
+
+def _scheduled(backend: FakeLlama, requests: int, clients: int, max_batch: int, max_delay: float) -> Dict[str, Any]:
+    scheduler = GenerationScheduler(backend, max_batch=max_batch, max_queue_delay=max_delay)
+    try:
+        run = _drive(requests, clients, lambda index: scheduler.generate(*_parts(index), max_tokens=512))
+        stats = scheduler.stats()
+    finally:
+        scheduler.close()
+    return {
+        "tokens_per_s": round(stats["completion_tokens"] / run["elapsed"], 1),
+        "request_latency": run["latency"],
+        "mean_queue_wait_ms": stats["mean_queue_wait_ms"],
+        "batches": stats["batches"],
+        "prefix_hits": stats["prefix_hits"],
+        "prefix_misses": stats["prefix_misses"],
+        "prompt_tokens_evaluated": backend.prompt_tokens_evaluated,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--max-batch", type=int, default=4)
+    parser.add_argument("--max-delay-ms", type=float, default=5.0)
+    parser.add_argument("--prompt-delay", type=float, default=0.002, help="seconds per evaluated prompt token")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="seconds per generated token")
+    options = parser.parse_args()
+    for backend_cls in (FakeLlama, BatchedFakeLlama):
+        backend_cls.load_delay = 0.0
+        backend_cls.prompt_delay = options.prompt_delay
+        backend_cls.token_delay = options.token_delay
+    path = "/models/quen-3.4b.gguf"
+    delay = options.max_delay_ms / 1000
+    emit(
+        "generation",
+        {
+            "sequential": _sequential(FakeLlama(path), options.requests, options.clients),
+            "scheduler": _scheduled(FakeLlama(path), options.requests, options.clients, options.max_batch, delay),
+            "scheduler_batched": _scheduled(
+                BatchedFakeLlama(path), options.requests, options.clients, options.max_batch, delay
+            ),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Sequential vs concurrent `Ingestor.ingest_feed` against a local stub with slow hosts.
+
+Usage: python benchmarks/bench_ingest.py [--items 24] [--slow-delay 0.4] [--concurrency 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from _common import emit
+from _fixtures import article_html, rss_feed
+from _stub import StubServer
+
+from openyourbubble.ingest import Ingestor
+
+HOSTS = ["127.0.0.1", "127.0.0.2", "127.0.0.3", "127.0.0.4"]
+
+
+def build_feed(stub: StubServer, items: int, slow_delay: float, fast_delay: float) -> str:
+    links = []
+    for index in range(items):
+        host = HOSTS[index % len(HOSTS)]
+        # the last host plays the slow syndication partner
+        delay = slow_delay if host == HOSTS[-1] else fast_delay
+        path = stub.add(f"/article/{index}", article_html(index), delay=delay)
+        links.append(stub.url(path, host=host))
+    stub.add("/feed.xml", rss_feed(links), content_type="application/rss+xml")
+    return stub.url("/feed.xml")
+
+
+def run(feed_url: str, concurrency: int, per_host: int) -> dict:
+    ingestor = Ingestor(concurrency=concurrency, per_host=per_host)
+    started = time.perf_counter()
+    items = ingestor.ingest_feed(feed_url)
+    elapsed = time.perf_counter() - started
+    return {"seconds": round(elapsed, 3), "items": len(items), "urls": [item.url for item in items]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=24)
+    parser.add_argument("--slow-delay", type=float, default=0.4)
+    parser.add_argument("--fast-delay", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--per-host", type=int, default=2)
+    options = parser.parse_args()
+    with StubServer() as stub:
+        feed_url = build_feed(stub, options.items, options.slow_delay, options.fast_delay)
+        sequential = run(feed_url, 1, options.per_host)
+        concurrent = run(feed_url, options.concurrency, options.per_host)
+    assert sequential.pop("urls") == concurrent.pop("urls"), "concurrent ingest changed item order"
+    concurrent["speedup"] = round(sequential["seconds"] / max(concurrent["seconds"], 1e-9), 2)
+    emit("ingest", {"sequential": sequential, f"concurrency_{options.concurrency}": concurrent})
+
+
+if __name__ == "__main__":
+    main()
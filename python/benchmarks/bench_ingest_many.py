@@ -0,0 +1,145 @@
+"""Many feeds at once: a sequential `oyb ingest` loop vs `MultiFeedIngestor`.
+
+`--feeds` feeds of `--items` articles each are spread over four stub hosts,
+the last of which is slow. The baseline ingests them one feed after another
+with the same per-feed concurrency `oyb ingest` uses; the multi-feed run
+fetches every feed on one event loop under the global and per-host caps with
+no rate limit. A third run adds a per-host rate limit and a robots.txt that
+disallows one article per feed, and the stub's request log is checked for the
+per-host concurrency and request spacing actually observed.
+
+Usage: python benchmarks/bench_ingest_many.py [--feeds 24] [--items 6] [--slow-delay 0.3] [--rate 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from _common import emit
+from _fixtures import article_html, rss_feed
+from _stub import StubServer
+
+from openyourbubble.ingest import Ingestor
+from openyourbubble.multifeed import FeedSource, MultiFeedIngestor
+
+HOSTS = ["127.0.0.1", "127.0.0.2", "127.0.0.3", "127.0.0.4"]
+
+
+def build_feeds(stub: StubServer, feeds: int, items: int, slow_delay: float, fast_delay: float) -> List[FeedSource]:
+    sources = []
+    for feed in range(feeds):
+        host = HOSTS[feed % len(HOSTS)]
+        # the last host plays the slow syndication partner
+        delay = slow_delay if host == HOSTS[-1] else fast_delay
+        links = [
+            stub.url(stub.add(f"/{feed}/article/{index}", article_html(feed * items + index), delay=delay), host=host)
+            for index in range(items)
+        ]
+        links.append(stub.url(stub.add(f"/{feed}/private/0", article_html(feed)), host=host))
+        path = stub.add(f"/{feed}/feed.xml", rss_feed(links), content_type="application/rss+xml")
+        sources.append(FeedSource(url=stub.url(path, host=host), title=f"feed {feed}"))
+    return sources
+
+
+def observed(log: List[tuple]) -> Dict[str, float]:
+    """Peak in-flight requests and start spacing per host, from the stub's request log.
+
+    Spacing is enforced when a request takes its slot, so thread scheduling on
+    the way to the wire can bring two starts closer than the configured interval.
+    """
+    by_host: Dict[str, List[tuple]] = defaultdict(list)
+    for host, _path, started, finished in log:
+        by_host[host].append((started, finished))
+    peak = 0
+    gaps: List[float] = []
+    for requests in by_host.values():
+        events = sorted([(started, 1) for started, _ in requests] + [(finished, -1) for _, finished in requests])
+        in_flight = 0
+        for _, change in events:
+            in_flight += change
+            peak = max(peak, in_flight)
+        starts = sorted(started for started, _ in requests)
+        gaps.extend(later - earlier for earlier, later in zip(starts, starts[1:]))
+    return {
+        "peak_per_host": peak,
+        "min_spacing_ms": round(min(gaps, default=0.0) * 1000, 1),
+        "median_spacing_ms": round(statistics.median(gaps) * 1000, 1) if gaps else 0.0,
+    }
+
+
+def sequential(sources: List[FeedSource], items: int) -> Dict[str, object]:
+    ingestor = Ingestor(concurrency=4, per_host=2)
+    started = time.perf_counter()
+    count = sum(len(ingestor.ingest_feed(source.url, limit=items + 1)) for source in sources)
+    return {"seconds": round(time.perf_counter() - started, 3), "items": count}
+
+
+def concurrent(sources: List[FeedSource], items: int, rate: float, robots: bool, concurrency: int) -> Dict[str, object]:
+    ingestor = MultiFeedIngestor(
+        Ingestor(concurrency=concurrency, per_host=2),
+        concurrency=concurrency,
+        per_host=2,
+        rate=rate,
+        robots=robots,
+        limit=items + 1,
+    )
+    started = time.perf_counter()
+    lines = list(ingestor.iter_ingest(sources))
+    elapsed = time.perf_counter() - started
+    stats = ingestor.stats()
+    return {
+        "seconds": round(elapsed, 3),
+        "items": sum("error" not in line for line in lines),
+        "errors": sum("error" in line for line in lines),
+        "robots_blocked": stats["robots_blocked"],
+        "robots": stats.get("robots"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--feeds", type=int, default=24)
+    parser.add_argument("--items", type=int, default=6)
+    parser.add_argument("--slow-delay", type=float, default=0.3)
+    parser.add_argument("--fast-delay", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=20.0)
+    args = parser.parse_args()
+    slow_articles = len(range(len(HOSTS) - 1, args.feeds, len(HOSTS))) * args.items
+    results: Dict[str, object] = {
+        "feeds": args.feeds,
+        "items_per_feed": args.items,
+        # Nothing can beat the slow host's articles at two requests at a time.
+        "slow_host_floor_seconds": round(slow_articles * args.slow_delay / 2, 3),
+    }
+    with StubServer() as stub:
+        sources = build_feeds(stub, args.feeds, args.items, args.slow_delay, args.fast_delay)
+        results["sequential"] = sequential(sources, args.items)
+        stub.log.clear()
+        results["ingest_many"] = {
+            **concurrent(sources, args.items, 0.0, False, args.concurrency),
+            **observed(stub.log),
+        }
+        stub.add("/robots.txt", _robots(args.feeds), content_type="text/plain")
+        stub.log.clear()
+        results["ingest_many_polite"] = {
+            **concurrent(sources, args.items, args.rate, True, args.concurrency),
+            **observed(stub.log),
+            "private_hits": sum(path.endswith("/private/0") for _, path, _, _ in stub.log),
+        }
+    results["speedup"] = round(
+        results["sequential"]["seconds"] / results["ingest_many"]["seconds"], 1  # type: ignore[index]
+    )
+    emit("ingest_many", results)
+
+
+def _robots(feeds: int) -> str:
+    return "User-agent: *\n" + "".join(f"Disallow: /{feed}/private/\n" for feed in range(feeds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Keyword cache hit rates and savings for the suggest + brief + repeat-view pattern.
+
+The same views are also run with the ``tfidf`` engine, whose lookups must not
+change the corpus statistics (or every repeat view would miss).
+
+Usage: python benchmarks/bench_keyword_cache.py [--articles 40] [--views 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from _common import emit
+from _fixtures import article_parts
+
+from openyourbubble.keywords import KeywordCache, configure_keyword_cache, extract_keywords, keyword_cache_stats
+from openyourbubble.professional import ProfessionalBriefing
+from openyourbubble.study import StudySuggester
+
+
+class NoCache(KeywordCache):
+    def get(self, digest):
+        return None
+
+
+def articles(count: int):
+    for index in range(count):
+        _, title, body = article_parts(index, paragraphs=8)
+        yield title, "\n".join(body)
+
+
+def run(count: int, views: int, engine: Optional[str] = None) -> float:
+    suggester, briefing = StudySuggester(keyword_engine=engine), ProfessionalBriefing(keyword_engine=engine)
+    started = time.perf_counter()
+    for _ in range(views):
+        for title, text in articles(count):
+            suggester.suggest(topic=title, category="economy", article_text=text)
+            briefing.brief(topic=title, category="economy", article_text=text)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=40)
+    parser.add_argument("--views", type=int, default=3)
+    options = parser.parse_args()
+
+    configure_keyword_cache(NoCache())
+    uncached = run(options.articles, options.views)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "keywords.sqlite"
+        configure_keyword_cache(KeywordCache(path=path))
+        started = time.perf_counter()
+        for _, text in articles(options.articles):
+            extract_keywords(text)  # ingest-time precompute
+        ingest_seconds = time.perf_counter() - started
+        cached = run(options.articles, options.views)
+        warm_stats = keyword_cache_stats()
+
+        configure_keyword_cache(KeywordCache(path=path))  # fresh process memory, same disk tier
+        disk = run(options.articles, 1)
+        disk_stats = keyword_cache_stats()
+
+    configure_keyword_cache(KeywordCache())
+    tfidf = run(options.articles, options.views, engine="tfidf")
+    tfidf_stats = keyword_cache_stats()
+
+    emit(
+        "keyword_cache",
+        {
+            "uncached_seconds": round(uncached, 3),
+            "ingest_precompute_seconds": round(ingest_seconds, 3),
+            "cached_seconds": round(cached, 3),
+            "cached_stats": warm_stats,
+            "disk_tier_seconds": round(disk, 3),
+            "disk_tier_stats": disk_stats,
+            "tfidf_seconds": round(tfidf, 3),
+            "tfidf_stats": tfidf_stats,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Keyword extraction throughput: per-document YAKE vs the corpus TF-IDF engine.
+
+The bundled corpus is the synthetic long articles (each topic lede buried in
+shared filler paragraphs and boilerplate lines) plus the text extracted from
+the saved pages in `fixtures/html`. Both engines run with the settings
+`openyourbubble.keywords` uses (up to 3-grams, 12 phrases) and no keyword
+cache, so every document is extracted. The corpus engine sees the corpus in
+batches of `--batch` documents, as `extract_keywords_many` would hand it an
+ingest cycle.
+
+Besides docs/sec, the report counts how many top-5 phrases come from the
+boilerplate lines or the filler sentences every synthetic article shares,
+and how many documents have a phrase from their own topic lede in the top 5.
+
+Usage: python benchmarks/bench_keywords.py [--documents 200] [--batch 100] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List, Sequence
+
+from _common import FIXTURES, emit
+from _fixtures import BOILERPLATE, FILLER, TOPICS, long_article
+
+import yake
+
+from openyourbubble.corpus_keywords import CorpusKeywordExtractor
+from openyourbubble.extract import extract_text
+
+
+def build_corpus(documents: int) -> List[Dict[str, str]]:
+    corpus = []
+    for index in range(documents):
+        _, title, text = long_article(index)
+        corpus.append({"lede": TOPICS[index % len(TOPICS)][2], "text": f"{title}\n\n{text}"})
+    for path in sorted((FIXTURES / "html").glob("*.html")):
+        text = extract_text(path.read_bytes(), "text/html")
+        if text:
+            corpus.append({"lede": "", "text": text})
+    return corpus
+
+
+def run_yake(texts: Sequence[str]) -> List[List[str]]:
+    engine = yake.KeywordExtractor(n=3, top=12)
+    return [[phrase for phrase, _ in engine.extract_keywords(text)] for text in texts]
+
+
+def run_corpus(texts: Sequence[str], batch: int) -> List[List[str]]:
+    extractor = CorpusKeywordExtractor()
+    keywords: List[List[str]] = []
+    for start in range(0, len(texts), batch):
+        keywords.extend(extractor.extract_many(texts[start : start + batch]))
+    return keywords
+
+
+def quality(corpus: Sequence[Dict[str, str]], keywords: Sequence[List[str]]) -> Dict[str, float]:
+    shared = [line.lower() for line in BOILERPLATE + FILLER]
+    top = [[phrase.lower() for phrase in found[:5]] for found in keywords]
+    phrases = [phrase for found in top for phrase in found]
+    generic = sum(any(phrase in line for line in shared) for phrase in phrases)
+    on_topic = [
+        any(phrase in document["lede"].lower() for phrase in found)
+        for document, found in zip(corpus, top)
+        if document["lede"]
+    ]
+    return {
+        "top5_generic_share": round(generic / max(1, len(phrases)), 4),
+        "top5_with_lede_phrase": round(sum(on_topic) / max(1, len(on_topic)), 4),
+    }
+
+
+def _timed(function: Callable[[], List[List[str]]], documents: int, repeat: int) -> Dict[str, object]:
+    samples = []
+    keywords: List[List[str]] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        keywords = function()
+        samples.append(time.perf_counter() - started)
+    elapsed = statistics.median(samples)
+    return {"docs_per_s": round(documents / elapsed, 1), "seconds": round(elapsed, 3), "keywords": keywords}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    corpus = build_corpus(args.documents)
+    texts = [document["text"] for document in corpus]
+    results: Dict[str, object] = {"documents": len(texts), "words": sum(len(text.split()) for text in texts)}
+    for name, function in (
+        ("yake", lambda: run_yake(texts)),
+        ("tfidf", lambda: run_corpus(texts, args.batch)),
+    ):
+        timed = _timed(function, len(texts), args.repeat)
+        keywords = timed.pop("keywords")
+        results[name] = {**timed, **quality(corpus, keywords), "sample": keywords[0][:5]}  # type: ignore[index]
+    results["speedup"] = round(results["tfidf"]["docs_per_s"] / results["yake"]["docs_per_s"], 1)  # type: ignore[index]
+    emit("keywords", results)
+
+
+if __name__ == "__main__":
+    main()
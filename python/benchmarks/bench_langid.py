@@ -0,0 +1,71 @@
+"""Language identification accuracy and throughput on the bundled multilingual fixture.
+
+`fixtures/langid.json` holds hand-written news sentences and headlines in 27
+languages. Accuracy is reported overall and for headlines (the shortest
+texts); throughput compares one `detect` call per article with batched
+`detect_many`, on articles built by repeating each fixture text to ~1000 characters.
+
+Usage: python benchmarks/bench_langid.py [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import Counter
+
+from _common import FIXTURES, emit
+
+from openyourbubble.langid import LanguageIdentifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    records = json.loads((FIXTURES / "langid.json").read_text(encoding="utf-8"))
+    started = time.perf_counter()
+    identifier = LanguageIdentifier()
+    load_ms = (time.perf_counter() - started) * 1000
+
+    detections = identifier.detect_many([record["text"] for record in records])
+    correct = [record["language"] == detection.language for record, detection in zip(records, detections)]
+    headlines = [ok for record, ok in zip(records, correct) if len(record["text"]) < 80]
+    confusions = Counter(
+        f"{record['language']}->{detection.language}"
+        for record, detection, ok in zip(records, detections, correct)
+        if not ok
+    )
+
+    articles = [" ".join([record["text"]] * (1000 // len(record["text"]) + 1)) for record in records]
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for article in articles:
+            identifier.detect(article)
+    single = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        identifier.detect_many(articles)
+    batched = time.perf_counter() - started
+    total = args.rounds * len(articles)
+
+    emit(
+        "langid",
+        {
+            "languages": len(identifier.languages),
+            "fixture": {"texts": len(records), "languages": len({record["language"] for record in records})},
+            "model_load_ms": round(load_ms, 2),
+            "accuracy": round(sum(correct) / len(correct), 4),
+            "headline_accuracy": round(sum(headlines) / len(headlines), 4) if headlines else None,
+            "confusions": dict(confusions),
+            "single_us_per_article": round(single / total * 1e6, 1),
+            "batched_us_per_article": round(batched / total * 1e6, 1),
+            "batch_speedup": round(single / batched, 2) if batched else None,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
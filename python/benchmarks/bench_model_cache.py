@@ -0,0 +1,57 @@
+"""Time-to-first-token for repeated generations with and without the model registry.
+
+Uses `FakeLlama` with a configurable load delay standing in for GGUF mmap/init.
+
+Usage: python benchmarks/bench_model_cache.py [--calls 5] [--load-delay 0.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from _common import SAMPLE_ARTICLE, emit, summarize_ms
+from _fakes import FakeLlama
+
+from openyourbubble import llm
+
+
+def _ttft(model: llm.MaybeModel) -> float:
+    started = time.perf_counter()
+    backend = model._make()
+    prompt = model._prompt(topic="climate", keywords=["carbon"], article_text=SAMPLE_ARTICLE, mode="quen-3.4b")
+    next(iter(backend.create_completion(prompt=prompt, max_tokens=512, stream=True)))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--load-delay", type=float, default=0.5)
+    options = parser.parse_args()
+    FakeLlama.load_delay = options.load_delay
+    llm.Llama = FakeLlama
+    model = llm.MaybeModel(model_path=Path("/models/quen-3.4b.gguf"))
+
+    uncached = []
+    for _ in range(options.calls):
+        model.unload()  # previous behaviour: every generation rebuilt the model
+        uncached.append(_ttft(model))
+
+    model.unload()
+    first = _ttft(model)
+    cached = [_ttft(model) for _ in range(options.calls)]
+    emit(
+        "model_cache",
+        {
+            "reload_per_call": summarize_ms(uncached),
+            "registry_first_call": summarize_ms([first]),
+            "registry_subsequent": summarize_ms(cached),
+            "loaded": [list(key) for key in llm.registry.loaded()],
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
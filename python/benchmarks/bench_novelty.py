@@ -0,0 +1,101 @@
+"""Novelty scoring: throughput per ingest cycle and separation of in-topic from off-topic items.
+
+Synthetic categories each draw most words from their own vocabulary plus a
+shared pool. After a warm-up cycle, every cycle mixes in-topic items with
+"off-topic" ones whose words come from another category; a useful score puts
+the off-topic items well above the in-topic ones. Throughput is measured for
+whole cycles of `--cycles` sizes, including the SQLite flush.
+
+Usage: python benchmarks/bench_novelty.py [--categories 20] [--cycles 1000,5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from _common import emit
+
+from openyourbubble.novelty import NoveltyScorer
+
+SYLLABLES = ("ka", "lo", "mer", "tin", "sa", "vel", "dor", "qua", "ri", "pen", "zu", "fal", "ost", "bre", "nim")
+
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    return ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+
+
+def _article(rng: random.Random, own: Sequence[str], shared: Sequence[str], words: int = 300) -> str:
+    return " ".join(rng.choice(own) if rng.random() < 0.6 else rng.choice(shared) for _ in range(words))
+
+
+def _cycle(
+    rng: random.Random, vocabularies: List[List[str]], shared: List[str], size: int, off_topic: float
+) -> Tuple[List[Tuple[str, List[str]]], List[bool]]:
+    items, flags = [], []
+    for _ in range(size):
+        category = rng.randrange(len(vocabularies))
+        source = category
+        outlier = rng.random() < off_topic
+        if outlier:
+            source = (category + 1 + rng.randrange(len(vocabularies) - 1)) % len(vocabularies)
+        items.append((_article(rng, vocabularies[source], shared), [f"category-{category}"]))
+        flags.append(outlier)
+    return items, flags
+
+
+def run(categories: int, cycles: Sequence[int]) -> Dict[str, object]:
+    rng = random.Random(5)
+    shared = _vocabulary(rng, 2000)
+    vocabularies = [_vocabulary(rng, 400) for _ in range(categories)]
+    results: Dict[str, object] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer = NoveltyScorer(Path(tmp) / "novelty.sqlite")
+        warmup, _ = _cycle(rng, vocabularies, shared, categories * 20, 0.0)
+        scorer.score_many(warmup)
+        scorer.flush()
+        for size in cycles:
+            items, flags = _cycle(rng, vocabularies, shared, size, 0.05)
+            started = time.perf_counter()
+            scored = scorer.score_many(items)
+            scorer.flush()
+            elapsed = time.perf_counter() - started
+            in_topic = [result.score for result, outlier in zip(scored, flags) if not outlier]
+            off_topic = [result.score for result, outlier in zip(scored, flags) if outlier]
+            results[str(size)] = {
+                "items_per_s": round(size / elapsed),
+                "ms_per_cycle": round(elapsed * 1000, 1),
+                "mean_novelty_in_topic": round(statistics.mean(in_topic), 4),
+                "mean_novelty_off_topic": round(statistics.mean(off_topic), 4) if off_topic else None,
+                "off_topic_above_in_topic_p95": round(
+                    sum(score > sorted(in_topic)[int(len(in_topic) * 0.95)] for score in off_topic)
+                    / max(1, len(off_topic)),
+                    4,
+                ),
+            }
+        scorer.close()
+        results["store_bytes"] = sum(file.stat().st_size for file in Path(tmp).iterdir())
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--cycles", default="1000,5000")
+    args = parser.parse_args()
+    emit(
+        "novelty",
+        {
+            "categories": args.categories,
+            "cycles": run(args.categories, [int(size) for size in args.cycles.split(",") if size]),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
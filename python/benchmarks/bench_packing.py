@@ -0,0 +1,75 @@
+"""Prompt size, prompt-eval time and keyword coverage for packed vs full articles.
+
+Runs a fixed set of long fixture articles through `MaybeModel.generate_study`
+with `FakeLlama` charging `--prompt-delay` per evaluated prompt token, at the
+full article and at several article token budgets. Coverage is the share of
+the full article's YAKE keywords that still appear in the packed text.
+
+Usage: python benchmarks/bench_packing.py [--articles 12] [--budgets 1024,512,256]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from _common import emit
+from _fakes import FakeLlama
+from _fixtures import long_article
+
+from openyourbubble import llm
+from openyourbubble.keywords import extract_keyword_scores, extract_keywords
+from openyourbubble.packing import TokenCounter, pack_article
+from openyourbubble.response_cache import ResponseCache, configure_response_cache
+
+
+def _run(articles: List[tuple], budget: Optional[int]) -> Dict[str, Any]:
+    model = llm.MaybeModel(model_path=Path("/models/quen-3.4b.gguf"), n_ctx=1 << 20, article_budget=budget)
+    backend = model._make()
+    count = TokenCounter(lambda data: backend.tokenize(data, add_bos=False))
+    timings: List[float] = []
+    tokens: List[int] = []
+    coverage: List[float] = []
+    for tag, title, text in articles:
+        keywords = extract_keywords(text)
+        backend.reset()  # measure a cold prompt, not the scheduler's prefix reuse
+        before = backend.prompt_tokens_evaluated
+        started = time.perf_counter()
+        model.generate_study(topic=title, keywords=keywords, article_text=text, mode="quen-3.4b")
+        timings.append(time.perf_counter() - started)
+        tokens.append(backend.prompt_tokens_evaluated - before)
+        packed = text if budget is None else pack_article(text, extract_keyword_scores(text), budget, count).text
+        lowered = packed.lower()
+        coverage.append(sum(1 for phrase in keywords if phrase.lower() in lowered) / max(len(keywords), 1))
+    return {
+        "mean_prompt_tokens": round(statistics.fmean(tokens), 1),
+        "mean_generate_ms": round(statistics.fmean(timings) * 1000, 1),
+        "keyword_coverage": round(statistics.fmean(coverage), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=12)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--budgets", default="1024,512,256")
+    parser.add_argument("--prompt-delay", type=float, default=0.0005, help="seconds per evaluated prompt token")
+    options = parser.parse_args()
+    FakeLlama.load_delay = 0.0
+    FakeLlama.token_delay = 0.0
+    FakeLlama.prompt_delay = options.prompt_delay
+    llm.Llama = FakeLlama
+    configure_response_cache(ResponseCache(capacity=0))
+    articles = [long_article(index, options.paragraphs) for index in range(options.articles)]
+    results: Dict[str, Any] = {}
+    for budget in [None] + [int(value) for value in options.budgets.split(",") if value]:
+        results["full" if budget is None else f"budget_{budget}"] = _run(articles, budget)
+        llm.registry.unload()
+    emit("packing", results)
+
+
+if __name__ == "__main__":
+    main()
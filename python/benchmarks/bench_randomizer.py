@@ -0,0 +1,54 @@
+"""Random Mode sampling throughput: cached pools vs rebuilding the filtered list per call.
+
+Usage: python benchmarks/bench_randomizer.py [--sizes 40 10000] [--calls 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from _common import emit
+from _synthetic import synthetic_taxonomy
+
+from openyourbubble.categories import CategoryGraph, load_graph
+from openyourbubble.randomizer import Randomizer
+
+
+def rebuild_pick(graph: CategoryGraph, professional: bool) -> dict:
+    pool = [cat for cat in graph.all() if cat.professional is professional]
+    choice = random.choice(pool)
+    lineage = [graph.get(slug).label for slug in choice.parents if graph.get(slug)]
+    return {"slug": choice.slug, "path": lineage}
+
+
+def rate(calls: int, fn) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return round(calls / (time.perf_counter() - started))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 10000])
+    parser.add_argument("--calls", type=int, default=2000)
+    options = parser.parse_args()
+    results = {}
+    for size in options.sizes:
+        graph = load_graph() if size == 40 else CategoryGraph(synthetic_taxonomy(size))
+        randomizer = Randomizer(graph)
+        recent = [cat.slug for cat in graph.all()[:20]]
+        results[str(size)] = {
+            "rebuild_picks_per_s": rate(options.calls, lambda: rebuild_pick(graph, True)),
+            "pooled_picks_per_s": rate(options.calls, lambda: randomizer.pick_subject(professional=True)),
+            "batch20_pages_per_s": rate(
+                options.calls // 10, lambda: randomizer.pick_subjects(20, professional=True, recent=recent)
+            ),
+        }
+    emit("randomizer", results)
+
+
+if __name__ == "__main__":
+    main()
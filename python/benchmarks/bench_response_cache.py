@@ -0,0 +1,71 @@
+"""Model calls and latency for repeated study suggestions with the response cache.
+
+Simulates a deck where each article is opened several times (and once more
+after a restart, served by the SQLite tier) using `FakeLlama`. Reports the
+process counters from `openyourbubble.llm.model_stats`.
+
+Usage: python benchmarks/bench_response_cache.py [--articles 10] [--views 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from _common import SAMPLE_ARTICLE, emit, summarize_ms
+from _fakes import FakeLlama
+
+from openyourbubble import llm
+from openyourbubble.grammar import study_gbnf
+from openyourbubble.response_cache import ResponseCache, configure_response_cache
+from openyourbubble.study import StudySuggester
+
+
+def _views(suggester: StudySuggester, articles: int, views: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    before = FakeLlama.completions
+    for _ in range(views):
+        for index in range(articles):
+            started = time.perf_counter()
+            suggester.suggest(topic=f"climate {index}", category="climate", article_text=SAMPLE_ARTICLE)
+            timings.append(time.perf_counter() - started)
+    return {"requests": len(timings), "model_calls": FakeLlama.completions - before, "latency": summarize_ms(timings)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=10)
+    parser.add_argument("--views", type=int, default=3)
+    parser.add_argument("--token-delay", type=float, default=0.002)
+    options = parser.parse_args()
+    FakeLlama.load_delay = 0.0
+    FakeLlama.token_delay = options.token_delay
+    llm.Llama = FakeLlama
+    suggester = StudySuggester(model=llm.MaybeModel(model_path=Path("/models/quen-3.4b.gguf")))
+
+    configure_response_cache(ResponseCache(capacity=0))
+    uncached = _views(suggester, options.articles, options.views)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "responses.sqlite"
+        configure_response_cache(ResponseCache(path=path))
+        cached = _views(suggester, options.articles, options.views)
+        configure_response_cache(ResponseCache(path=path))  # a fresh process reuses the SQLite tier
+        restarted = _views(suggester, options.articles, 1)
+        stats = llm.model_stats()
+    emit(
+        "response_cache",
+        {
+            "no_cache": uncached,
+            "cache": cached,
+            "after_restart": restarted,
+            "counters": stats,
+            "grammar_bytes": len(study_gbnf()),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare spawn-per-call CLI latency against the persistent `oyb serve` worker.
+
+Usage: python benchmarks/bench_serve.py [--requests 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from _common import PACKAGE_ROOT, SAMPLE_ARTICLE, emit, summarize_ms
+
+CALLS = [
+    ("random-subject", [], None, {}),
+    (
+        "study-suggest",
+        ["--topic", "climate", "--category", "economy-climate"],
+        SAMPLE_ARTICLE,
+        {"topic": "climate", "category": "economy-climate", "text": SAMPLE_ARTICLE},
+    ),
+    (
+        "professional-brief",
+        ["--topic", "climate", "--category", "economy-climate", "--persona", "investor"],
+        SAMPLE_ARTICLE,
+        {"topic": "climate", "category": "economy-climate", "text": SAMPLE_ARTICLE, "persona": "investor"},
+    ),
+]
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def bench_spawn(requests: int) -> dict:
+    results = {}
+    for tool, args, stdin, _ in CALLS:
+        samples = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "-m", "openyourbubble", tool, *args],
+                input=stdin or "",
+                capture_output=True,
+                text=True,
+                check=True,
+                env=_env(),
+            )
+            samples.append(time.perf_counter() - started)
+        results[tool] = summarize_ms(samples)
+    return results
+
+
+def bench_serve(requests: int) -> dict:
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "openyourbubble", "serve"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        env=_env(),
+    )
+    assert worker.stdin and worker.stdout
+    request_id = 0
+
+    def call(method: str, params: dict) -> dict:
+        nonlocal request_id
+        request_id += 1
+        worker.stdin.write(json.dumps({"id": request_id, "method": method, "params": params}) + "\n")
+        worker.stdin.flush()
+        return json.loads(worker.stdout.readline())
+
+    started = time.perf_counter()
+    call("ping", {})
+    results = {"startup": summarize_ms([time.perf_counter() - started])}
+    for tool, _, _, params in CALLS:
+        samples = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = call(tool, params)
+            samples.append(time.perf_counter() - started)
+            if "error" in response:
+                raise RuntimeError(response["error"])
+        results[tool] = summarize_ms(samples)
+    call("shutdown", {})
+    worker.wait(timeout=10)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=30)
+    options = parser.parse_args()
+    emit("serve", {"spawn": bench_spawn(options.requests), "serve": bench_serve(options.requests)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Time to first field and to final result for streamed vs blocking study suggestions.
+
+Runs three fake model outputs through `StudySuggester`: well-formed JSON, JSON
+followed by chatter (which `json.loads` rejects after the full generation), and
+prose that never becomes JSON. Streaming stops at the closing brace or aborts
+on the first characters, so the fallback starts early.
+
+Usage: python benchmarks/bench_streaming.py [--token-delay 0.01]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from _common import SAMPLE_ARTICLE, emit
+from _fakes import FAKE_RESPONSE, FakeLlama
+
+from openyourbubble import llm
+from openyourbubble.response_cache import ResponseCache, configure_response_cache
+from openyourbubble.study import StudySuggester
+
+OUTPUTS = {
+    "valid": FAKE_RESPONSE,
+    "trailing_chatter": FAKE_RESPONSE + "\n\nLet me know if you want more questions about carbon pricing. " * 8,
+    "prose": "I'm sorry, but I can only summarise the article in plain text. The article discusses " * 8,
+}
+
+
+def _blocking(suggester: StudySuggester) -> Dict[str, object]:
+    started = time.perf_counter()
+    result = suggester.suggest(topic="climate", category="climate", article_text=SAMPLE_ARTICLE)
+    return {"result_ms": round((time.perf_counter() - started) * 1000, 1), "method": result.method}
+
+
+def _streaming(suggester: StudySuggester) -> Dict[str, object]:
+    started = time.perf_counter()
+    first: Optional[float] = None
+    fields = 0
+    method = ""
+    for event in suggester.suggest_stream(topic="climate", category="climate", article_text=SAMPLE_ARTICLE):
+        if event["event"] == "field":
+            fields += 1
+            first = first if first is not None else time.perf_counter() - started
+        elif event["event"] == "result":
+            method = event["result"].method
+    return {
+        "first_field_ms": round(first * 1000, 1) if first is not None else None,
+        "result_ms": round((time.perf_counter() - started) * 1000, 1),
+        "fields": fields,
+        "method": method,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds per generated token")
+    options = parser.parse_args()
+    FakeLlama.load_delay = 0.0
+    FakeLlama.token_delay = options.token_delay
+    llm.Llama = FakeLlama
+    configure_response_cache(ResponseCache(capacity=0))  # every run must reach the model
+    suggester = StudySuggester(model=llm.MaybeModel(model_path=Path("/models/quen-3.4b.gguf")))
+    results = {}
+    for name, output in OUTPUTS.items():
+        FakeLlama.response = output
+        results[name] = {"blocking": _blocking(suggester), "streaming": _streaming(suggester)}
+    emit("streaming", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Load time and RSS for JSON vs compiled (mmap) taxonomies at 1k/10k/100k categories.
+
+Each measurement runs in a fresh interpreter so RSS reflects only that load.
+
+Usage: python benchmarks/bench_taxonomy.py [--sizes 1000 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import PACKAGE_ROOT, emit
+from _synthetic import synthetic_taxonomy
+
+from openyourbubble.taxonomy import compile_taxonomy
+
+PROBE = """
+import json, resource, sys, time
+from openyourbubble.categories import load_graph
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+before = rss_kb()
+started = time.perf_counter()
+graph = load_graph(sys.argv[1])
+loaded = time.perf_counter() - started
+graph.get("subject-7")
+graph.resolve(["policy", "t3"])
+first_query = time.perf_counter() - started
+after = rss_kb()
+print(json.dumps({"load_ms": loaded * 1000, "first_query_ms": first_query * 1000, "rss_kb": after - before}))
+"""
+
+
+def probe(path: Path, repeats: int) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get("PYTHONPATH")]))
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE, str(path)], capture_output=True, text=True, check=True, env=env
+        ).stdout
+        runs.append(json.loads(output))
+    best = min(runs, key=lambda run: run["load_ms"])
+    return {key: round(value, 2) for key, value in best.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=3)
+    options = parser.parse_args()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in options.sizes:
+            entries = synthetic_taxonomy(size)
+            json_path = Path(tmp) / f"taxonomy-{size}.json"
+            json_path.write_text(json.dumps(entries))
+            compiled_path = Path(tmp) / f"taxonomy-{size}.oybt"
+            stats = compile_taxonomy(entries, compiled_path)
+            results[str(size)] = {
+                "json": {**probe(json_path, options.repeats), "bytes": json_path.stat().st_size},
+                "compiled": {**probe(compiled_path, options.repeats), "bytes": stats["bytes"]},
+            }
+    emit("taxonomy_load", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Cost of the timing spans, and what they report for an ingest run.
+
+First the per-call overhead of `timing.span` and a `timing.timed` function
+with recording off and on, against a bare call. Then the same feed
+(keywords on, articles from the local stub) is ingested with recording off
+and on, and the recorded per-stage breakdown is reported with the
+wall-clock difference between the two runs.
+
+Usage: python benchmarks/bench_timing.py [--calls 1000000] [--items 16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict
+
+from _common import emit
+from _fixtures import article_html, rss_feed
+from _stub import StubServer
+
+from openyourbubble import timing
+from openyourbubble.ingest import Ingestor
+
+
+def _ns_per_call(function: Callable[[], None], calls: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(calls):
+        function()
+    return round((time.perf_counter_ns() - started) / calls, 1)
+
+
+def overhead(calls: int) -> Dict[str, float]:
+    def bare() -> None:
+        pass
+
+    def with_span() -> None:
+        with timing.span("bench.span"):
+            pass
+
+    decorated = timing.timed("bench.timed")(bare)
+    results = {"bare_ns": _ns_per_call(bare, calls)}
+    timing.disable()
+    results["span_off_ns"] = _ns_per_call(with_span, calls)
+    results["timed_off_ns"] = _ns_per_call(decorated, calls)
+    timing.enable()
+    results["span_on_ns"] = _ns_per_call(with_span, calls)
+    results["timed_on_ns"] = _ns_per_call(decorated, calls)
+    timing.disable()
+    return results
+
+
+def _feed(stub: StubServer, name: str, first: int, items: int) -> str:
+    links = [
+        stub.url(stub.add(f"/{name}/article/{index}", article_html(index, 12), delay=0.01))
+        for index in range(first, first + items)
+    ]
+    return stub.url(stub.add(f"/{name}/feed.xml", rss_feed(links), content_type="application/rss+xml"))
+
+
+def ingest(items: int) -> Dict[str, object]:
+    results: Dict[str, object] = {}
+    with StubServer() as stub:
+        # Warm imports and the keyword engine so neither run pays for them.
+        Ingestor(keywords=True).ingest_feed(_feed(stub, "warmup", 0, 1))
+        # Each run gets its own articles, so neither hits the keyword cache.
+        for label, enabled, first in (("off", False, 1000), ("on", True, 2000)):
+            feed_url = _feed(stub, label, first, items)
+            if enabled:
+                timing.enable()
+            started = time.perf_counter()
+            Ingestor(concurrency=4, keywords=True).ingest_feed(feed_url)
+            results[f"seconds_{label}"] = round(time.perf_counter() - started, 3)
+        results["timings"] = timing.timings()
+        timing.disable()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--items", type=int, default=16)
+    args = parser.parse_args()
+    emit("timing", {"overhead": overhead(args.calls), "ingest": ingest(args.items)})
+
+
+if __name__ == "__main__":
+    main()
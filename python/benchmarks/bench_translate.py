@@ -0,0 +1,87 @@
+"""Translation cost per feed cycle: per-article pair loads vs the cached, deduplicated batch path.
+
+Uses a fake Argos backend with a per-pair load delay and a per-character cost.
+Articles share bylines and newsletter boilerplate, as feed items do. The
+baseline reloads the pair and translates each article as one blob (the old
+per-process behaviour); the batch path keeps the pair loaded, deduplicates
+sentences across the cycle and reuses the translation memory on the next cycle.
+
+Usage: python benchmarks/bench_translate.py [--articles 50] [--load-delay 0.4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from _common import emit
+from _fakes import FakeArgosTranslate
+from _fixtures import long_article
+
+from openyourbubble import translate
+from openyourbubble.translate import (
+    TranslationMemory,
+    Translator,
+    clear_translation_pairs,
+    configure_translation_memory,
+)
+
+BYLINE = "Von unserer Redaktion."
+
+
+def _articles(count: int) -> List[str]:
+    texts = []
+    for index in range(count):
+        # One article-specific sentence per paragraph next to the shared filler and boilerplate.
+        paragraphs = long_article(index, paragraphs=8)[2].split("\n\n")
+        body = "\n\n".join(
+            f"Bericht {index}.{number} nennt neue Zahlen zu Kosten, Fristen und Zielen. {paragraph}"
+            for number, paragraph in enumerate(paragraphs)
+        )
+        texts.append(f"{BYLINE}\n\n{body}")
+    return texts
+
+
+def _install(fake: FakeArgosTranslate) -> None:
+    translate._argos_checked = True
+    translate.argos_package = object()
+    translate.argos_translate = fake
+    clear_translation_pairs()
+
+
+def _baseline(texts: List[str]) -> Dict[str, Any]:
+    fake = FakeArgosTranslate()
+    started = time.perf_counter()
+    for text in texts:
+        fake.get_translation("de", "en").translate(text)
+    return {"seconds": round(time.perf_counter() - started, 3), "pair_loads": fake.loads, "characters": fake.characters}
+
+
+def _batched(texts: List[str], cycles: int) -> Dict[str, Any]:
+    fake = FakeArgosTranslate()
+    _install(fake)
+    configure_translation_memory(TranslationMemory())
+    translator = Translator(to_lang="en")
+    runs = []
+    for _ in range(cycles):
+        before = fake.characters
+        started = time.perf_counter()
+        translator.translate_many(texts, source_lang="de")
+        runs.append({"seconds": round(time.perf_counter() - started, 3), "characters": fake.characters - before})
+    return {"cycles": runs, "pair_loads": fake.loads, "memory": translate.translation_memory().stats()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--load-delay", type=float, default=0.4)
+    options = parser.parse_args()
+    FakeArgosTranslate.load_delay = options.load_delay
+    texts = _articles(options.articles)
+    emit("translate", {"per_article_reload": _baseline(texts), "batched": _batched(texts, options.cycles)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Startup-time regression check built on `python -X importtime`.
+
+Runs each `oyb` command once in a fresh interpreter, sums the cumulative
+import time of top-level modules, and fails when a command exceeds its budget
+or imports a module it has no business loading.
+
+Usage: python benchmarks/check_importtime.py [--scale 1.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from _common import PACKAGE_ROOT, SAMPLE_ARTICLE, emit
+
+# command -> (argv, stdin, import budget in ms, modules that must stay unloaded)
+COMMANDS: Dict[str, Tuple[List[str], str, float, List[str]]] = {
+    "random-subject": (
+        ["random-subject"],
+        "",
+        250.0,
+        ["feedparser", "trafilatura", "readability", "bs4", "yake", "llama_cpp", "requests"],
+    ),
+    "translate": (
+        ["translate", "--text", "hola"],
+        "",
+        # no --source-lang: the language identifier loads numpy
+        400.0,
+        ["feedparser", "trafilatura", "readability", "bs4", "yake", "llama_cpp"],
+    ),
+    "study-suggest": (
+        ["study-suggest", "--topic", "climate", "--category", "economy-climate"],
+        SAMPLE_ARTICLE,
+        600.0,
+        ["feedparser", "trafilatura", "readability", "bs4", "llama_cpp"],
+    ),
+    "professional-brief": (
+        ["professional-brief", "--topic", "climate", "--category", "economy-climate"],
+        SAMPLE_ARTICLE,
+        600.0,
+        ["feedparser", "trafilatura", "readability", "bs4", "llama_cpp"],
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[float, set]:
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        stripped = name.strip()
+        modules.add(stripped)
+        if name.startswith(" ") and not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI hosts)")
+    options = parser.parse_args()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get("PYTHONPATH")]))
+    results = {}
+    failures = []
+    for command, (argv, stdin, budget_ms, forbidden) in COMMANDS.items():
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "openyourbubble", *argv],
+            input=stdin,
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if completed.returncode != 0:
+            failures.append(f"{command}: exited {completed.returncode}")
+            continue
+        total_ms, modules = parse_importtime(completed.stderr)
+        leaked = sorted(name for name in forbidden if name in modules)
+        budget = budget_ms * options.scale
+        results[command] = {"import_ms": round(total_ms, 1), "budget_ms": budget, "leaked": leaked}
+        if total_ms > budget:
+            failures.append(f"{command}: imports took {total_ms:.1f} ms (budget {budget:.0f} ms)")
+        if leaked:
+            failures.append(f"{command}: unexpectedly imported {', '.join(leaked)}")
+    emit("importtime", results)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+"""Offline benchmark suite for every `oyb` command and hot path, with a regression gate.
+
+Each case is timed for `repeat` samples of `number` calls after one warm-up
+call, and reported as median/min/p90 milliseconds per call. Everything runs
+offline:
+
+- Articles come from the saved pages in `fixtures/html`, served with an RSS
+  feed by the local stub.
+- Taxonomies come from the synthetic generator, at 1k, 10k and 100k
+  categories.
+- Model-backed cases use `FakeLlama`, with load, prompt and token latency
+  set by `--load-delay`, `--prompt-delay` and `--token-delay`.
+- Translation uses the fake Argos backend.
+- Per-article caches (keywords, model responses, translation memory) are
+  reset before every sample, so each sample pays the full path.
+
+Results are printed as JSON and written to `--output`. With a baseline
+(`benchmarks/baseline.json` by default), a case fails when its fastest
+sample is more than its threshold slower than the baseline's. The fastest
+sample is the one least disturbed by other load on the host, and a case
+that looks regressed is measured once more before it counts. The threshold is
+the case's entry in the baseline's ``thresholds``, else the file's
+``threshold``, else `--threshold`. Slowdowns that add less than
+`--min-delta-ms` to a sample are ignored as noise. The script exits 1 when
+any case regresses. Baselines depend on the machine: record one with
+`--save-baseline` on the host that runs the comparison.
+
+Usage: python benchmarks/run_suite.py [--filter keywords] [--quick] [--output results.json]
+                                      [--baseline benchmarks/baseline.json] [--save-baseline]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from _common import FIXTURES, PACKAGE_ROOT, SAMPLE_ARTICLE, emit, percentile
+from _fakes import FakeArgosTranslate, FakeLlama
+from _fixtures import long_article, rss_feed
+from _stub import StubServer
+from _synthetic import synthetic_taxonomy
+
+BASELINE = Path(__file__).resolve().with_name("baseline.json")
+TAXONOMY_SIZES = (1_000, 10_000, 100_000)
+MODEL_PATH = Path("/models/quen-3.4b.gguf")
+
+
+@dataclass
+class Case:
+    """One benchmark: `setup` builds state once and returns the call to time."""
+
+    name: str
+    setup: Callable[["Suite"], Callable[[], Any]]
+    repeat: int = 15
+    number: int = 1
+    # Untimed, before every sample (e.g. to empty a cache).
+    before: Optional[Callable[[], None]] = None
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, *, repeat: int = 15, number: int = 1, before: Optional[Callable[[], None]] = None) -> Callable:
+    def register(setup: Callable[["Suite"], Callable[[], Any]]) -> Callable[["Suite"], Callable[[], Any]]:
+        CASES.append(Case(name, setup, repeat, number, before))
+        return setup
+
+    return register
+
+
+class Suite:
+    """Shared state for the cases: the stub server, synthetic graphs and fake backends."""
+
+    def __init__(self, stack: ExitStack, options: argparse.Namespace) -> None:
+        self.stack = stack
+        self.options = options
+        self._stub: Optional[StubServer] = None
+        self._graphs: Dict[int, Any] = {}
+        self._fake_llama = False
+
+    @property
+    def stub(self) -> StubServer:
+        if self._stub is None:
+            self._stub = self.stack.enter_context(StubServer())
+        return self._stub
+
+    def graph(self, size: int) -> Any:
+        from openyourbubble.categories import CategoryGraph
+
+        if size not in self._graphs:
+            self._graphs[size] = CategoryGraph(synthetic_taxonomy(size))
+        return self._graphs[size]
+
+    def fake_llama(self) -> None:
+        from openyourbubble import llm
+
+        if not self._fake_llama:
+            FakeLlama.load_delay = self.options.load_delay
+            FakeLlama.prompt_delay = self.options.prompt_delay
+            FakeLlama.token_delay = self.options.token_delay
+            llm.Llama = FakeLlama
+            self._fake_llama = True
+
+
+def _fresh_keywords() -> None:
+    from openyourbubble.keywords import KeywordCache, configure_keyword_cache
+
+    configure_keyword_cache(KeywordCache())
+
+
+def _fresh_article() -> None:
+    from openyourbubble.response_cache import ResponseCache, configure_response_cache
+
+    _fresh_keywords()
+    configure_response_cache(ResponseCache(capacity=0))
+
+
+def _fresh_translation() -> None:
+    from openyourbubble.translate import TranslationMemory, configure_translation_memory
+
+    configure_translation_memory(TranslationMemory())
+
+
+ARTICLE = long_article(3, paragraphs=12)[2]
+
+
+# ingest ---------------------------------------------------------------------
+
+
+@case("ingest.ingest_feed", repeat=7)
+def _ingest_feed(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble.ingest import Ingestor
+
+    stub = suite.stub
+    links = [
+        stub.url(stub.add(f"/suite/{path.name}", path.read_bytes()))
+        for path in sorted((FIXTURES / "html").glob("*.html"))
+    ]
+    feed_url = stub.url(stub.add("/suite/feed.xml", rss_feed(links), content_type="application/rss+xml"))
+    ingestor = Ingestor(concurrency=4)
+    return lambda: ingestor.ingest_feed(feed_url)
+
+
+def _resolve_case(size: int) -> None:
+    @case(f"categories.resolve.{size // 1000}k", number=2000)
+    def setup(suite: Suite) -> Callable[[], Any]:
+        from openyourbubble.ingest import Ingestor
+
+        graph = suite.graph(size)
+        rng = random.Random(size)
+        entries = graph.all()
+        terms = [rng.choice(entries).slug, rng.choice(entries).label, f"t{rng.randrange(size)}", "unknown-tag"]
+        ingestor = Ingestor(graph=graph)
+        return lambda: ingestor._resolve_categories(terms)
+
+
+def _randomizer_case(size: int) -> None:
+    @case(f"randomizer.pick_subject.{size // 1000}k", number=2000)
+    def setup(suite: Suite) -> Callable[[], Any]:
+        from openyourbubble.randomizer import Randomizer
+
+        randomizer = Randomizer(suite.graph(size))
+        return lambda: randomizer.pick_subject(group="science")
+
+
+for _size in TAXONOMY_SIZES:
+    _resolve_case(_size)
+for _size in TAXONOMY_SIZES:
+    _randomizer_case(_size)
+
+
+# keywords, suggestions, briefs -----------------------------------------------
+
+
+@case("keywords.extract_keywords.yake", before=_fresh_keywords)
+def _keywords_yake(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble.keywords import extract_keywords
+
+    return lambda: extract_keywords(ARTICLE, engine="yake")
+
+
+@case("keywords.extract_keywords_many.tfidf", repeat=10, before=_fresh_keywords)
+def _keywords_tfidf(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble.keywords import extract_keywords_many
+
+    texts = [long_article(index, paragraphs=12)[2] for index in range(50)]
+    return lambda: extract_keywords_many(texts, engine="tfidf")
+
+
+@case("study.suggest.heuristic", before=_fresh_article)
+def _suggest(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble.study import StudySuggester
+
+    suggester = StudySuggester()
+    return lambda: suggester.suggest(topic="climate", category="economy-climate", article_text=ARTICLE)
+
+
+@case("study.suggest.model", before=_fresh_article)
+def _suggest_model(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble.llm import MaybeModel
+    from openyourbubble.study import StudySuggester
+
+    suite.fake_llama()
+    suggester = StudySuggester(model=MaybeModel(model_path=MODEL_PATH))
+    return lambda: suggester.suggest(topic="climate", category="economy-climate", article_text=ARTICLE)
+
+
+@case("professional.brief.heuristic", before=_fresh_article)
+def _brief(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble.professional import ProfessionalBriefing
+
+    briefing = ProfessionalBriefing()
+    return lambda: briefing.brief(topic="climate", category="economy-climate", article_text=ARTICLE)
+
+
+@case("professional.brief.model", before=_fresh_article)
+def _brief_model(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble.llm import MaybeModel
+    from openyourbubble.professional import ProfessionalBriefing
+
+    suite.fake_llama()
+    briefing = ProfessionalBriefing(model=MaybeModel(model_path=MODEL_PATH))
+    return lambda: briefing.brief(topic="climate", category="economy-climate", article_text=ARTICLE)
+
+
+# translation --------------------------------------------------------------------
+
+
+@case("translate.translate.auto", before=_fresh_translation)
+def _translate(suite: Suite) -> Callable[[], Any]:
+    from openyourbubble import translate
+
+    fake = FakeArgosTranslate()
+    fake.load_delay = 0.0
+    translate._argos_checked = True
+    translate.argos_package = object()
+    translate.argos_translate = fake
+    translate.clear_translation_pairs()
+    translator = translate.Translator(to_lang="en")
+    text = (
+        "Die Zentralbanken beraten über die Zinsen. Die Regulierungsbehörden verlangen strengere Offenlegung "
+        "für grüne Anleihen. Analysten erwarten, dass sich die Lieferketten in den kommenden Quartalen ändern. "
+    ) * 8
+    return lambda: translator.translate(text)
+
+
+# CLI cold start -------------------------------------------------------------------
+
+
+def _cli_case(name: str, argv: List[str], stdin: str = "") -> None:
+    @case(f"cli.{name}", repeat=5)
+    def setup(suite: Suite) -> Callable[[], Any]:
+        env = dict(os.environ, PYTHONPATH=str(PACKAGE_ROOT))
+        command = [sys.executable, "-m", "openyourbubble", *argv]
+
+        def run() -> None:
+            subprocess.run(command, input=stdin, capture_output=True, text=True, env=env, check=True)
+
+        return run
+
+
+_cli_case("random-subject", ["random-subject"])
+_cli_case("study-suggest", ["study-suggest", "--topic", "climate", "--category", "economy-climate"], SAMPLE_ARTICLE)
+_cli_case(
+    "professional-brief", ["professional-brief", "--topic", "climate", "--category", "economy-climate"], SAMPLE_ARTICLE
+)
+_cli_case("translate", ["translate", "--text", "hola", "--source-lang", "es"])
+
+
+# runner ---------------------------------------------------------------------------
+
+
+def measure(suite: Suite, entry: Case, scale: float) -> Dict[str, float]:
+    function = entry.setup(suite)
+    if entry.before is not None:
+        entry.before()
+    function()  # warm-up: imports, lazy engines, connection pools
+    samples = []
+    for _ in range(max(3, int(entry.repeat * scale))):
+        if entry.before is not None:
+            entry.before()
+        # As in timeit: a collection landing in one sample says nothing about the code under test.
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(entry.number):
+                function()
+            samples.append((time.perf_counter() - started) / entry.number)
+        finally:
+            gc.enable()
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 6),
+        "min_ms": round(min(samples) * 1000, 6),
+        "p90_ms": round(percentile(samples, 90) * 1000, 6),
+        "samples": len(samples),
+        "calls_per_sample": entry.number,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float, min_delta_ms: float
+) -> Dict[str, Dict[str, Any]]:
+    thresholds = baseline.get("thresholds", {})
+    default = float(baseline.get("threshold", threshold))
+    report = {}
+    for name, result in results.items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None:
+            report[name] = {"status": "new"}
+            continue
+        allowed = float(thresholds.get(name, default))
+        before, after = float(previous["min_ms"]), result["min_ms"]
+        change = (after - before) / before if before else 0.0
+        # The noise floor applies to a whole sample, so sub-microsecond calls batched by `number` still count.
+        regressed = change > allowed and (after - before) * result["calls_per_sample"] > min_delta_ms
+        report[name] = {
+            "status": "regressed" if regressed else "ok",
+            "baseline_ms": before,
+            "change": round(change, 4),
+            "threshold": allowed,
+        }
+    return report
+
+
+def machine() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", action="append", default=[], help="Run cases whose name contains this")
+    parser.add_argument("--list", action="store_true", help="List case names and exit")
+    parser.add_argument("--quick", action="store_true", help="A third of the samples, for smoke runs")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here as well")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore slowdowns smaller than this per sample")
+    parser.add_argument("--load-delay", type=float, default=0.2, help="FakeLlama seconds per model load")
+    parser.add_argument("--prompt-delay", type=float, default=0.00002, help="FakeLlama seconds per prompt token")
+    parser.add_argument("--token-delay", type=float, default=0.0005, help="FakeLlama seconds per generated token")
+    options = parser.parse_args()
+
+    selected = [entry for entry in CASES if not options.filter or any(part in entry.name for part in options.filter)]
+    if options.list:
+        print("\n".join(entry.name for entry in selected))
+        return 0
+    results: Dict[str, Dict[str, float]] = {}
+    with ExitStack() as stack:
+        suite = Suite(stack, options)
+        for entry in selected:
+            results[entry.name] = measure(suite, entry, 1 / 3 if options.quick else 1.0)
+            print(f"{entry.name}: {results[entry.name]['median_ms']} ms", file=sys.stderr)
+
+    report: Dict[str, Any] = {"machine": machine(), "cases": results}
+    if options.save_baseline:
+        stored: Dict[str, Any] = {}
+        if options.baseline.exists():
+            stored = json.loads(options.baseline.read_text())
+        stored.setdefault("threshold", options.threshold)
+        stored.setdefault("thresholds", {})
+        stored["machine"] = report["machine"]
+        measured = {
+            name: {"min_ms": result["min_ms"], "median_ms": result["median_ms"]} for name, result in results.items()
+        }
+        stored["cases"] = {**stored.get("cases", {}), **measured}
+        options.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+    elif options.baseline.exists():
+        baseline = json.loads(options.baseline.read_text())
+        report["comparison"] = compare(results, baseline, options.threshold, options.min_delta_ms)
+        suspects = [entry for entry in selected if report["comparison"][entry.name]["status"] == "regressed"]
+        if suspects:
+            with ExitStack() as stack:
+                suite = Suite(stack, options)
+                for entry in suspects:
+                    retry = measure(suite, entry, 1 / 3 if options.quick else 1.0)
+                    if retry["min_ms"] < results[entry.name]["min_ms"]:
+                        results[entry.name] = retry
+            report["comparison"] = compare(results, baseline, options.threshold, options.min_delta_ms)
+    regressions = sorted(name for name, row in report.get("comparison", {}).items() if row["status"] == "regressed")
+    report["regressions"] = regressions
+    emit("suite", report)
+    if options.output:
+        options.output.write_text(json.dumps({"benchmark": "suite", "results": report}, indent=2) + "\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,26 @@
 """OpenYourBubble Python toolkit."""
 
-from .categories import CategoryGraph
-from .randomizer import Randomizer
-from .study import StudySuggester
-from .professional import ProfessionalBriefing
-from .ingest import Ingestor
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - import-time only for type checkers
+    from .categories import CategoryGraph
+    from .ingest import Ingestor
+    from .professional import ProfessionalBriefing
+    from .randomizer import Randomizer
+    from .study import StudySuggester
+
+# Public names resolve lazily so `oyb random-subject` does not pay for the
+# scraping (feedparser, trafilatura, lxml) and NLP (yake) stacks.
+_LAZY = {
+    "CategoryGraph": ".categories",
+    "Randomizer": ".randomizer",
+    "StudySuggester": ".study",
+    "ProfessionalBriefing": ".professional",
+    "Ingestor": ".ingest",
+}
 
 __all__ = [
     "CategoryGraph",
@@ -13,3 +29,16 @@ __all__ = [
     "ProfessionalBriefing",
     "Ingestor",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
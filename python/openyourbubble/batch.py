@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .keywords import extract_keywords_many, keyword_engine
+from .llm import registry
+from .service import Toolkit, novelty_categories
+
+KINDS = ("study-suggest", "professional-brief")
+
+# Records keyworded together with the tfidf engine; fixed so output never depends on the worker count.
+KEYWORD_CHUNK = 256
+
+_worker_toolkit: Optional[Toolkit] = None
+
+
+def _toolkit() -> Toolkit:
+    global _worker_toolkit
+    if _worker_toolkit is None:
+        _worker_toolkit = Toolkit()
+    return _worker_toolkit
+
+
+def run_record(kind: str, record: Dict[str, Any], model_path: Optional[str] = None) -> Dict[str, Any]:
+    """Run one NDJSON record, returning ``{"id", "result"}`` or ``{"id", "error"}``."""
+    record_id = record.get("id")
+    try:
+        text = str(record.get("text") or "").strip()
+        if not record.get("topic") or not record.get("category") or not text:
+            raise ValueError("records need topic, category and text")
+        path = record.get("model_path") or model_path
+        common = {
+            "topic": record["topic"],
+            "category": record["category"],
+            "text": text,
+            "mode": record.get("mode") or "quen-3.4b",
+            "model_path": Path(path) if path else None,
+            "keyword_engine": record.get("keyword_engine") or None,
+            "keywords": record.get("_keywords"),
+        }
+        if kind == "study-suggest":
+            result = _toolkit().study_suggest(**common)
+        else:
+            result = _toolkit().professional_brief(persona=record.get("persona") or "strategist", **common)
+    except Exception as exc:  # one bad record must not sink the batch
+        return {"id": record_id, "error": {"message": str(exc), "type": type(exc).__name__}}
+    return {"id": record_id, "result": result}
+
+
+def _uses_model(record: Dict[str, Any], model_path: Optional[str]) -> bool:
+    path = record.get("model_path") or model_path
+    if not path:
+        return False
+    return _toolkit().model(Path(path)).available(record.get("mode") or "quen-3.4b")
+
+
+def _wants_corpus_keywords(record: Dict[str, Any]) -> bool:
+    if "_error" in record or not record.get("topic") or not record.get("category"):
+        return False
+    if not str(record.get("text") or "").strip():
+        return False
+    try:
+        return keyword_engine(record.get("keyword_engine") or None) == "tfidf"
+    except ValueError:
+        return False  # run_record reports the unknown engine
+
+
+def _with_corpus_keywords(records: Iterable[Dict[str, Any]], chunk: int) -> Iterator[Dict[str, Any]]:
+    """Attach ``_keywords`` to tfidf records, computed in this process `chunk` records at a time.
+
+    The corpus statistics live in the process that scores against them, so
+    leaving tfidf to pool workers would give each worker its own corpus and
+    make the keywords depend on how records were spread across them.
+    """
+    pending: List[Dict[str, Any]] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        positions = [position for position, record in enumerate(pending) if _wants_corpus_keywords(record)]
+        if positions:
+            texts = [str(pending[position].get("text") or "").strip() for position in positions]
+            for position, keywords in zip(positions, extract_keywords_many(texts, engine="tfidf", update=True)):
+                pending[position] = {**pending[position], "_keywords": keywords}
+        yield from pending
+        pending.clear()
+
+    for record in records:
+        pending.append(record)
+        if len(pending) >= chunk:
+            yield from flush()
+    yield from flush()
+
+
+def read_ndjson(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    for index, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            record = {"_error": f"invalid JSON on line {index + 1}: {exc}"}
+        if isinstance(record, dict):
+            record.setdefault("id", index)
+        else:
+            record = {"id": index, "_error": "each line must be a JSON object"}
+        yield record
+
+
+def run_batch(
+    kind: str,
+    records: Iterable[Dict[str, Any]],
+    *,
+    workers: Optional[int] = None,
+    model_path: Optional[str] = None,
+    window: Optional[int] = None,
+    keyword_chunk: int = KEYWORD_CHUNK,
+) -> Iterator[Dict[str, Any]]:
+    """Process `records` and yield results in input order.
+
+    Heuristic records (keyword extraction plus templates) fan out across a process pool of
+    `workers` processes. Records that will hit the local model stay in this
+    process, so the GGUF model is loaded once; up to the generation
+    scheduler's batch size are submitted at a time so it can batch them. At most `window`
+    records are in flight, which keeps memory flat on very large inputs.
+
+    With the ``tfidf`` keyword engine, keywords are extracted here rather than
+    in the workers, `keyword_chunk` records per `extract_keywords_many` pass,
+    so results are the same for any number of workers.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown batch kind: {kind}")
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 8
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    model_queue = ThreadPoolExecutor(max_workers=registry.max_batch)
+    pending: Deque[Future] = deque()
+    try:
+        for record in _with_corpus_keywords(records, max(1, keyword_chunk)):
+            if "_error" in record:
+                done: Future = Future()
+                done.set_result({"id": record.get("id"), "error": {"message": record["_error"]}})
+                pending.append(done)
+            elif _uses_model(record, model_path):
+                pending.append(model_queue.submit(run_record, kind, record, model_path))
+            elif pool is not None:
+                pending.append(pool.submit(run_record, kind, record, model_path))
+            else:
+                done = Future()
+                done.set_result(run_record(kind, record, model_path))
+                pending.append(done)
+            while len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        model_queue.shutdown(wait=True)
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_translate_batch(
+    records: Iterable[Dict[str, Any]],
+    *,
+    source_lang: Optional[str] = None,
+    target_lang: str = "en",
+    chunk: int = 256,
+) -> Iterator[Dict[str, Any]]:
+    """Translate NDJSON records (``text`` plus optional ``source_lang``/``target_lang``) in input order.
+
+    Records are taken `chunk` at a time and grouped by language pair, so each
+    pair is translated in one deduplicated pass over all of its sentences.
+    """
+    pending: List[Dict[str, Any]] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        results: Dict[int, Dict[str, Any]] = {}
+        groups: Dict[Tuple[Optional[str], str], List[int]] = {}
+        for position, record in enumerate(pending):
+            if "_error" in record:
+                results[position] = {"id": record.get("id"), "error": {"message": record["_error"]}}
+                continue
+            pair = (record.get("source_lang") or source_lang, record.get("target_lang") or target_lang)
+            groups.setdefault(pair, []).append(position)
+        for (source, target), positions in groups.items():
+            texts = [str(pending[position].get("text") or "") for position in positions]
+            try:
+                translated = _toolkit().translate_many(texts=texts, source_lang=source, target_lang=target)
+            except Exception as exc:  # one failing pair must not sink the batch
+                error = {"message": str(exc), "type": type(exc).__name__}
+                for position in positions:
+                    results[position] = {"id": pending[position].get("id"), "error": error}
+                continue
+            for position, result in zip(positions, translated):
+                results[position] = {"id": pending[position].get("id"), "result": result}
+        for position in range(len(pending)):
+            yield results[position]
+        pending.clear()
+
+    for record in records:
+        pending.append(record)
+        if len(pending) >= chunk:
+            yield from flush()
+    yield from flush()
+
+
+def run_novelty_batch(
+    records: Iterable[Dict[str, Any]],
+    *,
+    store_path: Optional[Path] = None,
+    update: bool = True,
+    chunk: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    """Score NDJSON records (``text`` plus ``categories`` or ``category``) for novelty in input order.
+
+    Records are vectorised and scored `chunk` at a time, each chunk against
+    the category centroids as they stood before it. A record with malformed
+    categories gets an error line and the rest of its chunk is still scored.
+    """
+    pending: List[Dict[str, Any]] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        errors: Dict[int, Dict[str, Any]] = {}
+        for position, record in enumerate(pending):
+            if "_error" in record:
+                errors[position] = {"message": record["_error"]}
+                continue
+            try:
+                novelty_categories(record)
+            except ValueError as exc:
+                errors[position] = {"message": str(exc), "type": type(exc).__name__}
+        valid = [record for position, record in enumerate(pending) if position not in errors]
+        scored = iter(_toolkit().novelty_score(items=valid, store_path=store_path, update=update))
+        for position, record in enumerate(pending):
+            if position in errors:
+                yield {"id": record.get("id"), "error": errors[position]}
+            else:
+                yield {"id": record.get("id"), **next(scored)}
+        pending.clear()
+
+    for record in records:
+        pending.append(record)
+        if len(pending) >= chunk:
+            yield from flush()
+    if pending:
+        yield from flush()
+
+
+__all__ = ["read_ndjson", "run_batch", "run_novelty_batch", "run_record", "run_translate_batch"]
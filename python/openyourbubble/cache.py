@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (kind, url)
+);
+CREATE INDEX IF NOT EXISTS http_cache_accessed ON http_cache (accessed_at);
+"""
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    kind: str
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+    payload: bytes
+    stored_at: float
+
+    def validators(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @property
+    def text(self) -> str:
+        return self.payload.decode("utf-8")
+
+
+class HttpCache:
+    """On-disk conditional-GET cache for feeds and extracted articles.
+
+    Rows are keyed by ``(kind, url)`` and keep the HTTP validators alongside the
+    payload: the raw body for feeds, the extracted text for articles. Entries
+    expire after ``ttl`` seconds, and the least recently used rows are evicted
+    once ``max_entries`` or ``max_bytes`` is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 20_000,
+        max_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "unchanged": 0, "stored": 0, "evicted": 0}
+        self.prune()
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        self._stats[key] += amount
+
+    def lookup(self, kind: str, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash, payload, stored_at FROM http_cache"
+                " WHERE kind = ? AND url = ?",
+                (kind, url),
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl and time.time() - row[4] > self.ttl:
+                self._conn.execute("DELETE FROM http_cache WHERE kind = ? AND url = ?", (kind, url))
+                self._count("evicted")
+                return None
+            return CacheEntry(kind, url, row[0], row[1], row[2], bytes(row[3]), row[4])
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: ``hits`` plus ``not_modified``/``unchanged``, or ``misses``."""
+        with self._lock:
+            if outcome in ("not_modified", "unchanged"):
+                self._count("hits")
+            self._count(outcome)
+
+    def touch(self, entry: CacheEntry, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Refresh an entry after a successful revalidation."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified),"
+                " stored_at = ?, accessed_at = ? WHERE kind = ? AND url = ?",
+                (etag, last_modified, now, now, entry.kind, entry.url),
+            )
+
+    def store(
+        self,
+        kind: str,
+        url: str,
+        payload: Union[str, bytes],
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        data = payload.encode("utf-8") if isinstance(payload, str) else payload
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache"
+                " (kind, url, etag, last_modified, content_hash, payload, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, url, etag, last_modified, content_hash, data, len(data), now, now),
+            )
+            self._count("stored")
+            self._evict()
+
+    def _evict(self) -> None:
+        entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache").fetchone()
+        if entries <= self.max_entries and total <= self.max_bytes:
+            return
+        removed = 0
+        for kind, url, size in self._conn.execute(
+            "SELECT kind, url, size FROM http_cache ORDER BY accessed_at ASC"
+        ).fetchall():
+            if entries <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM http_cache WHERE kind = ? AND url = ?", (kind, url))
+            entries -= 1
+            total -= size
+            removed += 1
+        self._count("evicted", removed)
+
+    def prune(self) -> int:
+        """Drop expired rows and enforce the size limits."""
+        with self._lock:
+            removed = 0
+            if self.ttl:
+                cursor = self._conn.execute(
+                    "DELETE FROM http_cache WHERE stored_at < ?", (time.time() - self.ttl,)
+                )
+                removed = cursor.rowcount
+                self._count("evicted", removed)
+            self._evict()
+            return removed
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache"
+            ).fetchone()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["entries"] = entries
+        stats["bytes"] = total
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["CacheEntry", "HttpCache", "content_hash"]
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 import orjson
 
+from .timing import timed
 
-@dataclass(frozen=True)
+# Large taxonomies keep one Category per subject, so drop the per-instance __dict__ where supported.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Category:
     slug: str
     label: str
@@ -25,6 +32,9 @@ class CategoryGraph:
             categories = self._load_default()
         self._by_slug: Dict[str, Category] = {}
         self._by_group: Dict[str, List[Category]] = {}
+        self._order: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._ancestors: Dict[str, Tuple[str, ...]] = {}
         for entry in categories:
             cat = Category(
                 slug=entry["slug"],
@@ -36,6 +46,10 @@ class CategoryGraph:
             )
             self._by_slug[cat.slug] = cat
             self._by_group.setdefault(cat.group, []).append(cat)
+        for index, cat in enumerate(self._by_slug.values()):
+            self._order[cat.slug] = index
+            for term in {cat.slug.lower(), cat.label.lower(), *(tag.lower() for tag in cat.tags)}:
+                self._terms.setdefault(term, []).append(cat.slug)
 
     def _load_default(self) -> List[Dict]:
         default_path = Path(__file__).with_name("categories.json")
@@ -66,9 +80,58 @@ class CategoryGraph:
     def professional_categories(self) -> List[Category]:
         return [cat for cat in self._by_slug.values() if cat.professional]
 
-
-def load_graph() -> CategoryGraph:
-    return CategoryGraph()
+    def ancestors(self, slug: str) -> Tuple[str, ...]:
+        """Slugs reachable through `parents`, nearest first, without repeats."""
+        cached = self._ancestors.get(slug)
+        if cached is not None:
+            return cached
+        seen: List[str] = []
+        frontier = list(self._by_slug[slug].parents) if slug in self._by_slug else []
+        while frontier:
+            parent = frontier.pop(0)
+            if parent in seen or parent == slug or parent not in self._by_slug:
+                continue
+            seen.append(parent)
+            frontier.extend(self._by_slug[parent].parents)
+        result = tuple(seen)
+        self._ancestors[slug] = result
+        return result
+
+    def resolve(self, terms: Iterable[Optional[str]], *, include_ancestors: bool = False) -> List[str]:
+        """Map free-form terms (feed tags, labels, slugs) to category slugs.
+
+        Matching is case-insensitive against each category's slug, label and
+        tags through a precomputed index, so the cost scales with the number of
+        terms rather than the size of the taxonomy. Slugs come back in taxonomy
+        order; `include_ancestors` adds every matched category's parents.
+        """
+        matched = set()
+        for term in terms:
+            if not term:
+                continue
+            slugs = self._terms.get(term.strip().lower())
+            if slugs:
+                matched.update(slugs)
+        if include_ancestors:
+            for slug in list(matched):
+                matched.update(self.ancestors(slug))
+        return sorted(matched, key=self._order.__getitem__)
+
+
+@timed("categories.load")
+def load_graph(path: Optional[Union[str, Path]] = None) -> CategoryGraph:
+    """Load the taxonomy from `path`, `$OYB_TAXONOMY`, or the bundled JSON.
+
+    Files produced by `oyb taxonomy compile` are memory-mapped instead of parsed.
+    """
+    source = path or os.environ.get("OYB_TAXONOMY")
+    if not source:
+        return CategoryGraph()
+    from .taxonomy import CompiledCategoryGraph, is_compiled
+
+    if is_compiled(source):
+        return CompiledCategoryGraph(source)
+    return CategoryGraph(orjson.loads(Path(source).read_bytes()))
 
 
 __all__ = ["Category", "CategoryGraph", "load_graph"]
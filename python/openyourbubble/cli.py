@@ -3,25 +3,61 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 import typer
 
-from .categories import load_graph
-from .ingest import Ingestor
-from .llm import MaybeModel
-from .professional import ProfessionalBriefing
-from .randomizer import Randomizer
-from .study import StudySuggester
-from .translate import Translator
+from . import timing
+from .service import IngestOptions, Toolkit
 
 app = typer.Typer(help="OpenYourBubble local toolkit")
+taxonomy_app = typer.Typer(help="Build and inspect category taxonomies")
+app.add_typer(taxonomy_app, name="taxonomy")
 
+_timings_reported = False
 
-def _model_from_options(model: Optional[str], model_path: Optional[Path]) -> MaybeModel:
-    if model_path:
-        return MaybeModel(model_path=model_path)
-    return MaybeModel()
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        envvar="OYB_PROFILE",
+        help="Record per-stage timings and add them to the JSON output as `timings` (stderr for lists and NDJSON)",
+    ),
+    cprofile: Optional[Path] = typer.Option(None, "--cprofile", help="Write a cProfile pstats dump of the command"),
+) -> None:
+    if profile:
+        timing.enable()
+        ctx.call_on_close(_report_timings)
+    if cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def dump() -> None:
+            profiler.disable()
+            profiler.dump_stats(str(cprofile))
+
+        ctx.call_on_close(dump)
+
+
+def _report_timings() -> None:
+    report = timing.timings()
+    if report is not None and not _timings_reported:
+        typer.echo(json.dumps({"timings": report}), err=True)
+
+
+def _echo_json(payload: Any) -> None:
+    """Print a command's JSON result, with the recorded `timings` attached when profiling."""
+    global _timings_reported
+    report = timing.timings()
+    if report is not None and isinstance(payload, dict):
+        payload = {**payload, "timings": report}
+        _timings_reported = True
+    typer.echo(json.dumps(payload, ensure_ascii=False))
 
 
 def _stdin_payload() -> Optional[str]:
@@ -35,22 +71,73 @@ def _stdin_payload() -> Optional[str]:
 def random_subject(
     group: Optional[str] = typer.Option(None, help="Filter by category group"),
     professional: bool = typer.Option(False, help="Restrict to professional categories"),
+    count: int = typer.Option(1, min=1, help="Number of subjects; values above 1 emit a JSON list"),
+    seed: Optional[int] = typer.Option(None, help="Seed for reproducible batches"),
+    recent: Optional[str] = typer.Option(None, help="Comma-separated slugs to down-weight"),
+    allow_repeats: bool = typer.Option(False, help="Allow the same subject more than once in a batch"),
 ) -> None:
-    graph = load_graph()
-    randomizer = Randomizer(graph)
-    subject = randomizer.pick_subject(group=group, professional=professional or None)
-    typer.echo(json.dumps(subject, ensure_ascii=False))
+    toolkit = Toolkit()
+    if count == 1 and seed is None and not recent:
+        subject = toolkit.random_subject(group=group, professional=professional)
+    else:
+        subject = toolkit.random_subjects(
+            count=count,
+            group=group,
+            professional=professional,
+            unique=not allow_repeats,
+            seed=seed,
+            recent=[slug.strip() for slug in (recent or "").split(",") if slug.strip()],
+        )
+        if count == 1:
+            subject = subject[0]
+    _echo_json(subject)
+
+
+def _run_batch(kind: str, workers: Optional[int], model_path: Optional[Path], **defaults: str) -> None:
+    from .batch import read_ndjson, run_batch
+
+    def records():
+        for record in read_ndjson(sys.stdin):
+            for key, value in defaults.items():
+                record.setdefault(key, value)
+            yield record
+
+    for response in run_batch(kind, records(), workers=workers, model_path=str(model_path) if model_path else None):
+        sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+def _echo_events(events: Iterator[dict]) -> None:
+    for event in events:
+        sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
 
 
 @app.command()
 def study_suggest(
-    topic: str = typer.Option(..., help="Primary topic or intent"),
-    category: str = typer.Option(..., help="Category slug"),
+    topic: Optional[str] = typer.Option(None, help="Primary topic or intent (required unless --batch)"),
+    category: Optional[str] = typer.Option(None, help="Category slug (required unless --batch)"),
     article_path: Optional[Path] = typer.Option(None, help="Path to article text"),
     text: Optional[str] = typer.Option(None, help="Inline article text"),
     mode: str = typer.Option("quen-3.4b", help="Model mode (quen-3.4b, quen-3.4b-thinking, quen-2.5, quen-2.5-thinking)"),
     model_path: Optional[Path] = typer.Option(None, help="Path to GGUF model for llama.cpp"),
+    batch: bool = typer.Option(
+        False,
+        help="Read NDJSON records (topic, category, text, mode) from stdin and stream NDJSON results",
+    ),
+    workers: Optional[int] = typer.Option(None, help="Processes for --batch heuristics (default: CPU count)"),
+    stream: bool = typer.Option(False, help="Emit NDJSON events as model fields complete, then the result"),
+    keyword_engine: Optional[str] = typer.Option(
+        None,
+        envvar="OYB_KEYWORD_ENGINE",
+        help="Keyword extractor: yake (per document) or tfidf (corpus-weighted, vectorised)",
+    ),
 ) -> None:
+    if batch:
+        _run_batch("study-suggest", workers, model_path, mode=mode, keyword_engine=keyword_engine or "")
+        return
+    if not topic or not category:
+        raise typer.BadParameter("--topic and --category are required")
     payload = text
     if article_path:
         payload = article_path.read_text(encoding="utf-8")
@@ -58,24 +145,52 @@ def study_suggest(
         payload = _stdin_payload()
     if not payload:
         raise typer.BadParameter("Article text required via --article-path or --text")
-    graph = load_graph()
-    model = _model_from_options(mode, model_path)
-    suggester = StudySuggester(graph=graph, model=model)
-    suggestion = suggester.suggest(topic=topic, category=category, article_text=payload, mode=mode)
-    suggestion.category = graph.get(category).label if graph.get(category) else category
-    typer.echo(json.dumps(suggestion.to_dict(), ensure_ascii=False))
+    if stream:
+        _echo_events(
+            Toolkit().study_suggest_stream(
+                topic=topic,
+                category=category,
+                text=payload,
+                mode=mode,
+                model_path=model_path,
+                keyword_engine=keyword_engine,
+            )
+        )
+        return
+    suggestion = Toolkit().study_suggest(
+        topic=topic, category=category, text=payload, mode=mode, model_path=model_path, keyword_engine=keyword_engine
+    )
+    _echo_json(suggestion)
 
 
 @app.command()
 def professional_brief(
-    topic: str = typer.Option(...),
-    category: str = typer.Option(...),
+    topic: Optional[str] = typer.Option(None, help="Required unless --batch"),
+    category: Optional[str] = typer.Option(None, help="Required unless --batch"),
     persona: str = typer.Option("strategist", help="strategist|designer|investor"),
     article_path: Optional[Path] = typer.Option(None),
     text: Optional[str] = typer.Option(None),
     mode: str = typer.Option("quen-3.4b", help="Model mode"),
     model_path: Optional[Path] = typer.Option(None, help="Path to GGUF model"),
+    batch: bool = typer.Option(
+        False,
+        help="Read NDJSON records (topic, category, text, persona, mode) from stdin and stream NDJSON results",
+    ),
+    workers: Optional[int] = typer.Option(None, help="Processes for --batch heuristics (default: CPU count)"),
+    stream: bool = typer.Option(False, help="Emit NDJSON events as model fields complete, then the result"),
+    keyword_engine: Optional[str] = typer.Option(
+        None,
+        envvar="OYB_KEYWORD_ENGINE",
+        help="Keyword extractor: yake (per document) or tfidf (corpus-weighted, vectorised)",
+    ),
 ) -> None:
+    if batch:
+        _run_batch(
+            "professional-brief", workers, model_path, mode=mode, persona=persona, keyword_engine=keyword_engine or ""
+        )
+        return
+    if not topic or not category:
+        raise typer.BadParameter("--topic and --category are required")
     payload = text
     if article_path:
         payload = article_path.read_text(encoding="utf-8")
@@ -83,23 +198,209 @@ def professional_brief(
         payload = _stdin_payload()
     if not payload:
         raise typer.BadParameter("Article text required")
-    graph = load_graph()
-    model = _model_from_options(mode, model_path)
-    briefing = ProfessionalBriefing(graph=graph, model=model)
-    brief = briefing.brief(topic=topic, category=category, article_text=payload, persona=persona, mode=mode)
-    brief.category = graph.get(category).label if graph.get(category) else category
-    typer.echo(json.dumps(brief.to_dict(), ensure_ascii=False))
+    if stream:
+        _echo_events(
+            Toolkit().professional_brief_stream(
+                topic=topic,
+                category=category,
+                text=payload,
+                persona=persona,
+                mode=mode,
+                model_path=model_path,
+                keyword_engine=keyword_engine,
+            )
+        )
+        return
+    brief = Toolkit().professional_brief(
+        topic=topic,
+        category=category,
+        text=payload,
+        persona=persona,
+        mode=mode,
+        model_path=model_path,
+        keyword_engine=keyword_engine,
+    )
+    _echo_json(brief)
+
+
+# Ingestor options shared by `ingest`, `ingest-many` and `ingest-daemon`; see `_ingest_options`.
+_CACHE_OPTION = typer.Option(
+    None,
+    envvar="OYB_INGEST_CACHE",
+    help="SQLite file for conditional-GET feed/article caching",
+)
+_KEYWORDS_OPTION = typer.Option(
+    False,
+    help="Extract keywords at ingest time (stored in OYB_KEYWORD_CACHE for later suggestions)",
+)
+_DETECT_LANGUAGE_OPTION = typer.Option(
+    False,
+    help="Identify each article's language locally instead of trusting the feed's declared language",
+)
+_DEDUP_OPTION = typer.Option(
+    None,
+    envvar="OYB_DEDUP_INDEX",
+    help="SQLite MinHash index; near-duplicates of stored articles are tagged with duplicate_of",
+)
+_SKIP_DUPLICATES_OPTION = typer.Option(False, help="Drop near-duplicates instead of tagging them (needs --dedup)")
+_NOVELTY_OPTION = typer.Option(
+    None,
+    envvar="OYB_NOVELTY_STORE",
+    help="SQLite novelty store; each article gets a novelty score against its categories",
+)
+
+
+def _ingest_options(
+    cache: Optional[Path],
+    keywords: bool,
+    detect_language: bool,
+    dedup: Optional[Path],
+    skip_duplicates: bool,
+    novelty: Optional[Path],
+) -> IngestOptions:
+    return IngestOptions(
+        cache_path=cache,
+        keywords=keywords,
+        detect_language=detect_language,
+        dedup_path=dedup,
+        skip_duplicates=skip_duplicates,
+        novelty_path=novelty,
+    )
+
+
+def _echo_ingest_stats(toolkit: Toolkit, options: IngestOptions) -> None:
+    if not options.cache_path and not options.dedup_path:
+        return
+    stats = toolkit.cache_stats()
+    if options.cache_path:
+        typer.echo(json.dumps({"cache": stats["http"][str(options.cache_path)]}), err=True)
+    if options.dedup_path:
+        typer.echo(json.dumps({"dedup": stats["dedup"][str(options.dedup_path)]}), err=True)
 
 
 @app.command()
 def ingest(
     feed_url: str = typer.Option(..., help="RSS/Atom URL"),
     limit: int = typer.Option(20, help="Limit number of items"),
+    concurrency: int = typer.Option(4, help="Articles fetched and extracted in parallel"),
+    per_host: int = typer.Option(2, help="Maximum concurrent requests per host"),
+    ndjson: bool = typer.Option(False, help="Stream one JSON item per line as each is extracted"),
+    cache: Optional[Path] = _CACHE_OPTION,
+    keywords: bool = _KEYWORDS_OPTION,
+    detect_language: bool = _DETECT_LANGUAGE_OPTION,
+    dedup: Optional[Path] = _DEDUP_OPTION,
+    skip_duplicates: bool = _SKIP_DUPLICATES_OPTION,
+    novelty: Optional[Path] = _NOVELTY_OPTION,
 ) -> None:
-    graph = load_graph()
-    ingestor = Ingestor(graph)
-    items = ingestor.ingest_feed(feed_url)[:limit]
-    typer.echo(json.dumps([item.to_dict() for item in items], ensure_ascii=False))
+    toolkit = Toolkit()
+    options = _ingest_options(cache, keywords, detect_language, dedup, skip_duplicates, novelty)
+    items = toolkit.iter_ingest(
+        feed_url=feed_url, limit=limit, concurrency=concurrency, per_host=per_host, options=options
+    )
+    if ndjson:
+        for item in items:
+            sys.stdout.write(json.dumps(item, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    else:
+        _echo_json(list(items))
+    _echo_ingest_stats(toolkit, options)
+
+
+@app.command()
+def ingest_many(
+    feed_list: Optional[Path] = typer.Argument(None, help="OPML or NDJSON feed list (read from stdin when omitted)"),
+    format: Optional[str] = typer.Option(None, help="opml or ndjson; detected from the content by default"),
+    limit: int = typer.Option(20, help="Limit number of items per feed"),
+    concurrency: int = typer.Option(16, help="Maximum requests in flight across all hosts"),
+    per_host: int = typer.Option(2, help="Maximum concurrent requests per host"),
+    rate: float = typer.Option(1.0, help="Request starts per second per host (0 for no limit)"),
+    robots: bool = typer.Option(True, help="Honour robots.txt rules and Crawl-delay"),
+    cache: Optional[Path] = _CACHE_OPTION,
+    keywords: bool = _KEYWORDS_OPTION,
+    detect_language: bool = _DETECT_LANGUAGE_OPTION,
+    dedup: Optional[Path] = _DEDUP_OPTION,
+    skip_duplicates: bool = _SKIP_DUPLICATES_OPTION,
+    novelty: Optional[Path] = _NOVELTY_OPTION,
+) -> None:
+    """Ingest many feeds concurrently, streaming NDJSON items tagged with their feed as they complete."""
+    from .multifeed import read_feed_list
+
+    text = feed_list.read_text(encoding="utf-8") if feed_list else _stdin_payload()
+    if not text:
+        raise typer.BadParameter("Provide a feed list file or pipe one on stdin")
+    try:
+        feeds = read_feed_list(text, format)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    toolkit = Toolkit()
+    options = _ingest_options(cache, keywords, detect_language, dedup, skip_duplicates, novelty)
+    ingestor = toolkit.multi_ingestor(
+        limit=limit, concurrency=concurrency, per_host=per_host, rate=rate, robots=robots, options=options
+    )
+    _echo_events(ingestor.iter_ingest(feeds))
+    typer.echo(json.dumps({"ingest_many": ingestor.stats()}), err=True)
+    _echo_ingest_stats(toolkit, options)
+
+
+@app.command()
+def ingest_daemon(
+    feed_list: Optional[Path] = typer.Argument(
+        None, help="OPML or NDJSON feed list to poll (stdin when piped); without one, every feed in --state"
+    ),
+    state: Optional[Path] = typer.Option(
+        None,
+        envvar="OYB_DAEMON_STATE",
+        help="SQLite file keeping each feed's schedule, seen entries and backoff counters across runs",
+    ),
+    once: bool = typer.Option(False, help="Poll the feeds that are due now, then exit (for cron)"),
+    format: Optional[str] = typer.Option(None, help="opml or ndjson; detected from the content by default"),
+    min_interval: float = typer.Option(300, help="Shortest delay between polls of one feed, in seconds"),
+    max_interval: float = typer.Option(86400, help="Longest delay between polls of a healthy feed, in seconds"),
+    max_backoff: float = typer.Option(86400, help="Longest delay before retrying a failing feed or host, in seconds"),
+    limit: int = typer.Option(20, help="Limit number of new items per feed per poll"),
+    concurrency: int = typer.Option(16, help="Maximum requests in flight across all hosts"),
+    per_host: int = typer.Option(2, help="Maximum concurrent requests per host"),
+    rate: float = typer.Option(1.0, help="Request starts per second per host (0 for no limit)"),
+    robots: bool = typer.Option(True, help="Honour robots.txt rules and Crawl-delay"),
+    cache: Optional[Path] = _CACHE_OPTION,
+    keywords: bool = _KEYWORDS_OPTION,
+    detect_language: bool = _DETECT_LANGUAGE_OPTION,
+    dedup: Optional[Path] = _DEDUP_OPTION,
+    skip_duplicates: bool = _SKIP_DUPLICATES_OPTION,
+    novelty: Optional[Path] = _NOVELTY_OPTION,
+) -> None:
+    """Poll feeds as they fall due, scheduled by how often each one publishes, streaming new items as NDJSON."""
+    from .multifeed import read_feed_list
+
+    text = feed_list.read_text(encoding="utf-8") if feed_list else _stdin_payload()
+    try:
+        feeds = read_feed_list(text, format) if text else []
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    daemon = Toolkit().ingest_daemon(
+        state_path=state,
+        limit=limit,
+        concurrency=concurrency,
+        per_host=per_host,
+        rate=rate,
+        robots=robots,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        max_backoff=max_backoff,
+        options=_ingest_options(cache, keywords, detect_language, dedup, skip_duplicates, novelty),
+    )
+    if feeds:
+        daemon.add_feeds(feeds)
+    else:
+        daemon.load()
+    if daemon.next_due() is None:
+        raise typer.BadParameter("Provide a feed list, or a --state file that already has feeds")
+    try:
+        _echo_events(daemon.run(once=once))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        typer.echo(json.dumps({"ingest_daemon": daemon.stats()}), err=True)
 
 
 @app.command()
@@ -107,13 +408,78 @@ def translate(
     text: Optional[str] = typer.Option(None, help="Text to translate"),
     source_lang: Optional[str] = typer.Option(None, help="Source language code"),
     target_lang: str = typer.Option("en", help="Target language code"),
+    batch: bool = typer.Option(
+        False,
+        help="Read NDJSON records (text, source_lang, target_lang) from stdin and stream NDJSON results",
+    ),
 ) -> None:
+    if batch:
+        from .batch import read_ndjson, run_translate_batch
+
+        for response in run_translate_batch(
+            read_ndjson(sys.stdin), source_lang=source_lang, target_lang=target_lang
+        ):
+            sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+        return
     payload = text or _stdin_payload()
     if not payload:
         raise typer.BadParameter("Translation text required via --text or stdin")
-    translator = Translator(to_lang=target_lang)
-    result = translator.translate(payload, source_lang)
-    typer.echo(json.dumps(result, ensure_ascii=False))
+    result = Toolkit().translate(text=payload, source_lang=source_lang, target_lang=target_lang)
+    _echo_json(result)
+
+
+@app.command()
+def novelty_score(
+    store: Optional[Path] = typer.Option(
+        None,
+        envvar="OYB_NOVELTY_STORE",
+        help="SQLite file keeping per-category term statistics between runs (in memory if omitted)",
+    ),
+    update: bool = typer.Option(True, help="Fold scored items into the category statistics"),
+    chunk: int = typer.Option(1000, help="Records vectorised and scored together"),
+) -> None:
+    """Score NDJSON records (text, categories or category, id) from stdin for novelty.
+
+    Each output line carries ``novelty`` (0 = typical for its categories,
+    1 = unlike anything recent) and the per-category scores; a category with
+    too few items so far scores null.
+    """
+    from .batch import read_ndjson, run_novelty_batch
+
+    for response in run_novelty_batch(read_ndjson(sys.stdin), store_path=store, update=update, chunk=max(1, chunk)):
+        sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+@taxonomy_app.command("compile")
+def taxonomy_compile(
+    output: Path = typer.Argument(..., help="Destination for the compiled taxonomy"),
+    source: Optional[Path] = typer.Option(None, help="Taxonomy JSON (defaults to the bundled categories.json)"),
+) -> None:
+    """Compile a taxonomy JSON file into the memory-mappable binary format.
+
+    Point `OYB_TAXONOMY` at the output to load it in every command.
+    """
+    import orjson
+
+    from .taxonomy import compile_taxonomy
+
+    source = source or Path(__file__).with_name("categories.json")
+    stats = compile_taxonomy(orjson.loads(source.read_bytes()), output)
+    _echo_json(stats)
+
+
+@app.command()
+def serve() -> None:
+    """Run a long-lived NDJSON JSON-RPC worker on stdin/stdout.
+
+    Keeps the category graph, models, and translators warm across requests so
+    callers avoid paying interpreter and import startup per call.
+    """
+    from .server import ToolServer
+
+    ToolServer().serve()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+ScoredKeywords = List[Tuple[str, float]]
+
+# Clause boundaries: candidates never span sentence or clause punctuation.
+_CLAUSES = re.compile(r"[.!?;:,()\[\]{}\"“”‘’«»|•·–—]+|\n")
+_WORDS = re.compile(r"\w+(?:['’-]\w+)*")
+
+# Function words a candidate may contain but not start or end with (as in YAKE).
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further had has have having
+    he her here hers herself him himself his how i if in into is it its itself just may me might more most must
+    my myself no nor not now of off on once only or other our ours ourselves out over own said same says she
+    should so some such than that the their theirs them themselves then there these they this those through to
+    too under until up upon us very was we were what when where which while who whom why will with within
+    without would yet you your yours yourself yourselves one two new like many much well even still across
+    among around amid per via since toward towards behind beside beyond near onto whether though although
+    """.split()
+)
+
+_MIX = 0x9E3779B97F4A7C15
+
+
+class CorpusKeywordExtractor:
+    """Keyword extraction for many documents at once, weighted by corpus statistics.
+
+    Every text in a batch is split into clauses and words, and all 1- to
+    `max_ngram`-word candidates that neither start nor end with a stopword are
+    enumerated with array operations over the concatenated token stream. The
+    candidates form a sparse document-term matrix of term counts; document
+    frequencies come from its columns plus the counts of earlier batches (kept
+    in a fixed-size hashed table), so a phrase that turns up across an ingest
+    cycle drops down every article's list. Each entry is scored as
+
+        (1 + log tf) * idf * position * casing * length
+
+    where position favours phrases first seen early in the text, casing
+    favours phrases written capitalised away from the start of a sentence,
+    and length gives multi-word phrases a mild lift as YAKE does. The top
+    `top` phrases per document come back in their written form, best first,
+    skipping phrases contained in one already chosen.
+
+    `state` fingerprints the corpus statistics: it changes with every batch
+    folded into them, so results cached under it are never served against
+    document frequencies they were not scored with.
+    """
+
+    def __init__(self, max_ngram: int = 3, top: int = 12, df_buckets: int = 1 << 20) -> None:
+        self.max_ngram = max(1, max_ngram)
+        self.top = max(1, top)
+        self.df_buckets = df_buckets
+        self._df: Any = None
+        self._documents = 0
+        self._counted: Set[bytes] = set()
+        self._state = b""
+        self._lock = threading.Lock()
+
+    @property
+    def documents(self) -> int:
+        return self._documents
+
+    @property
+    def state(self) -> str:
+        return self._state.hex() or "empty"
+
+    def _advance(self, *parts: bytes) -> None:
+        # Chained so the fingerprint covers every batch in order; callers hold the lock.
+        self._state = hashlib.blake2b(self._state + b"".join(parts), digest_size=8).digest()
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).digest()
+
+    def counted(self, texts: Sequence[str]) -> List[bool]:
+        """Per text, whether it is already part of the corpus statistics."""
+        digests = [self._digest(text) for text in texts]
+        with self._lock:
+            return [digest in self._counted for digest in digests]
+
+    def _fresh(self, digests: Sequence[bytes]) -> List[bool]:
+        """Per text, whether it is neither in the corpus nor earlier in this batch; callers hold the lock."""
+        seen: Set[bytes] = set()
+        fresh = []
+        for digest in digests:
+            fresh.append(digest not in self._counted and digest not in seen)
+            seen.add(digest)
+        return fresh
+
+    def _tokenize(self, texts: Sequence[str]) -> Tuple[List[str], Any, Any, Any]:
+        """Words of all texts plus, per word, its document, clause and position within the clause."""
+        import numpy as np
+
+        words: List[str] = []
+        documents: List[int] = []
+        clauses: List[int] = []
+        offsets: List[int] = []
+        clause = 0
+        for document, text in enumerate(texts):
+            for part in _CLAUSES.split(text or ""):
+                found = _WORDS.findall(part)
+                if not found:
+                    continue
+                words.extend(found)
+                documents.extend([document] * len(found))
+                clauses.extend([clause] * len(found))
+                offsets.extend(range(len(found)))
+                clause += 1
+        return (
+            words,
+            np.array(documents, dtype=np.int64),
+            np.array(clauses, dtype=np.int64),
+            np.array(offsets, dtype=np.int64),
+        )
+
+    def extract_scored_many(self, texts: Sequence[str], *, update: bool = True) -> List[ScoredKeywords]:
+        """``(phrase, score)`` lists per text, highest score first.
+
+        Texts not yet in the corpus count towards the document frequencies
+        they are scored with; with `update` they are also added to the corpus
+        statistics for later calls. A text already counted (same content) is
+        never counted again, so scoring an article twice gives the same
+        keywords.
+        """
+        import numpy as np
+        from scipy import sparse
+
+        results: List[ScoredKeywords] = [[] for _ in texts]
+        digests = [self._digest(text) for text in texts]
+        words, doc_of, clause_of, offset_of = self._tokenize(texts)
+        if not words:
+            if update:
+                with self._lock:
+                    fresh = [digest for digest, new in zip(digests, self._fresh(digests)) if new]
+                    if fresh:
+                        self._counted.update(fresh)
+                        self._documents += len(fresh)
+                        self._advance(len(fresh).to_bytes(8, "little"))
+            return results
+
+        surface = np.array(words)
+        lowered = np.char.lower(surface)
+        vocabulary, ids = np.unique(lowered, return_inverse=True)
+        ids = ids.astype(np.uint64)
+        blocked = np.fromiter(
+            (word in STOPWORDS or len(word) < 2 or word.isdigit() for word in vocabulary.tolist()),
+            dtype=bool,
+            count=len(vocabulary),
+        )[ids.astype(np.int64)]
+        # Capitalised where capitals are a choice rather than sentence case.
+        cased = (surface != lowered) & (offset_of > 0)
+
+        starts, keys, lengths, casing = [], [], [], []
+        count = len(words)
+        with np.errstate(over="ignore"):
+            key = np.zeros(count, dtype=np.uint64)
+            for n in range(1, self.max_ngram + 1):
+                span = count - n + 1
+                if span <= 0:
+                    break
+                key = key[:span] * np.uint64(_MIX) + ids[n - 1 : n - 1 + span] + np.uint64(n)
+                first = np.arange(span)
+                last = first + n - 1
+                valid = (clause_of[first] == clause_of[last]) & ~blocked[first] & ~blocked[last]
+                picked = first[valid]
+                starts.append(picked)
+                keys.append(key[valid])
+                lengths.append(np.full(len(picked), n, dtype=np.int64))
+                share = np.zeros(len(picked))
+                for step in range(n):
+                    share += cased[picked + step]
+                casing.append(share / n)
+        start = np.concatenate(starts)
+        key = np.concatenate(keys)
+        length = np.concatenate(lengths)
+        case_share = np.concatenate(casing)
+        document = doc_of[start]
+
+        # Group occurrences into (document, phrase) entries; the first
+        # occurrence of each entry gives its position and written form.
+        order = np.lexsort((start, key, document))
+        document, key, start, length, case_share = (
+            document[order], key[order], start[order], length[order], case_share[order]
+        )
+        head = np.ones(len(key), dtype=bool)
+        head[1:] = (key[1:] != key[:-1]) | (document[1:] != document[:-1])
+        heads = np.flatnonzero(head)
+        tf = np.diff(np.append(heads, len(key)))
+        entry_doc, entry_key, entry_start, entry_length = document[heads], key[heads], start[heads], length[heads]
+        entry_case = np.add.reduceat(case_share, heads) / tf
+
+        columns, entry_col = np.unique(entry_key, return_inverse=True)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(entry_doc, minlength=len(texts)))))
+        matrix = sparse.csr_matrix((tf.astype(np.float64), entry_col, indptr), shape=(len(texts), len(columns)))
+        buckets = (columns % np.uint64(self.df_buckets)).astype(np.int64)
+        with self._lock:
+            if self._df is None:
+                self._df = np.zeros(self.df_buckets, dtype=np.uint32)
+            fresh = np.array(self._fresh(digests), dtype=bool)
+            added = int(fresh.sum())
+            fresh_df = np.bincount(matrix[fresh].indices, minlength=len(columns))
+            if update and added:
+                np.add.at(self._df, buckets, fresh_df.astype(np.uint32))
+                self._counted.update(digest for digest, new in zip(digests, fresh) if new)
+                self._documents += added
+                self._advance(added.to_bytes(8, "little"), buckets.tobytes(), fresh_df.tobytes())
+            if update:
+                df, documents = self._df[buckets].astype(np.float64), float(self._documents)
+            else:
+                df = self._df[buckets].astype(np.float64) + fresh_df
+                documents = float(self._documents + added)
+
+        # Phrases in nearly every document score close to zero; on a lone
+        # document every phrase shares the same weight and tf/position decide.
+        idf = np.log((1.0 + documents) / (0.5 + df))
+        first_clause = clause_of[entry_start] - clause_of[np.searchsorted(doc_of, entry_doc)]
+        scores = (
+            (1.0 + np.log(matrix.data))
+            * idf[matrix.indices]
+            / np.log(3.0 + first_clause)
+            * (1.0 + 0.5 * entry_case)
+            * (1.0 + 0.25 * (entry_length - 1))
+        )
+
+        ranked = np.lexsort((-scores, entry_doc))
+        bounds = np.searchsorted(entry_doc[ranked], np.arange(len(texts) + 1))
+        for position in range(len(texts)):
+            chosen: ScoredKeywords = []
+            lowered_chosen: List[str] = []
+            for entry in ranked[bounds[position] : bounds[position + 1]]:
+                begin = entry_start[entry]
+                phrase = " ".join(words[begin : begin + entry_length[entry]])
+                folded = f" {phrase.lower()} "
+                if any(folded in f" {previous} " for previous in lowered_chosen):
+                    continue
+                chosen.append((phrase, round(float(scores[entry]), 4)))
+                lowered_chosen.append(folded.strip())
+                if len(chosen) >= self.top:
+                    break
+            results[position] = chosen
+        return results
+
+    def extract_many(self, texts: Sequence[str], *, update: bool = True) -> List[List[str]]:
+        return [[phrase for phrase, _ in scored] for scored in self.extract_scored_many(texts, update=update)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._df = None
+            self._documents = 0
+            self._counted.clear()
+            self._state = b""
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"documents": self._documents, "df_buckets": self.df_buckets, "state": self.state}
+
+
+_extractor: Optional[CorpusKeywordExtractor] = None
+
+
+def corpus_keyword_extractor() -> CorpusKeywordExtractor:
+    """Process-wide extractor, so corpus statistics accumulate across calls."""
+    global _extractor
+    if _extractor is None:
+        _extractor = CorpusKeywordExtractor()
+    return _extractor
+
+
+def configure_corpus_keyword_extractor(extractor: Optional[CorpusKeywordExtractor]) -> None:
+    global _extractor
+    _extractor = extractor
+
+
+__all__ = [
+    "CorpusKeywordExtractor",
+    "STOPWORDS",
+    "configure_corpus_keyword_extractor",
+    "corpus_keyword_extractor",
+]
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+_WORDS = re.compile(r"\w+")
+
+# Articles shorter than this many words are not fingerprinted: a handful of
+# shingles gives a signature too noisy to call two stories the same.
+MIN_WORDS = 20
+SHINGLE = 3
+PERMUTATIONS = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    minhash BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    key INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (key, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_permutations: Optional[Tuple[Any, Any]] = None
+
+
+def _hash_family() -> Tuple[Any, Any]:
+    """Fixed multiply-shift hash parameters; signatures stored on disk depend on them."""
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+
+        seed = b"".join(
+            hashlib.blake2b(f"oyb-minhash-{index}".encode("ascii"), digest_size=16).digest()
+            for index in range(PERMUTATIONS)
+        )
+        values = np.frombuffer(seed, dtype="<u8").astype(np.uint64)
+        _permutations = (values[:PERMUTATIONS] | np.uint64(1), values[PERMUTATIONS:])
+    return _permutations
+
+
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(text: str) -> Optional[Any]:
+    """64-value MinHash (``uint32``) of the word 3-shingles, or `None` under `MIN_WORDS` words.
+
+    Each distinct word is hashed once with BLAKE2b and shingle hashes are mixed
+    from the word hashes; all 64 permutations are applied in one NumPy
+    broadcast and reduced with a column-wise minimum.
+    """
+    import numpy as np
+
+    words = _WORDS.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    vocabulary = {word: _word_hash(word) for word in set(words)}
+    ids = np.array([vocabulary[word] for word in words], dtype=np.uint64)
+    count = len(ids) - SHINGLE + 1
+    multipliers, offsets = _hash_family()
+    with np.errstate(over="ignore"):
+        shingles = ids[:count].copy()
+        for offset in range(1, SHINGLE):
+            shingles = (shingles * np.uint64(0x100000001B3)) ^ ids[offset : offset + count]
+        shingles = np.unique(shingles)
+        hashed = (shingles[:, None] * multipliers + offsets) >> np.uint64(32)
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def similarity(left: Any, right: Any) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two MinHashes."""
+    return float((left == right).mean())
+
+
+@dataclass
+class Duplicate:
+    url: str
+    similarity: float
+
+
+class DedupIndex:
+    """Near-duplicate lookup for article MinHashes, persisted in SQLite.
+
+    The 64 MinHash values are cut into `bands` bands; articles whose bands
+    agree anywhere become candidates (banded LSH), and a candidate is a
+    duplicate when the estimated Jaccard similarity of the full signatures
+    reaches `threshold`. With 16 bands of 4 values, pairs at 0.8 similarity
+    are candidates with probability above 0.99 and unrelated articles almost
+    never are. Each band is one indexed integer key, so a lookup is `bands`
+    B-tree probes plus a comparison per candidate. Without a `path` the index
+    lives in memory for the life of the process.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        *,
+        threshold: float = 0.7,
+        bands: int = 16,
+    ) -> None:
+        if PERMUTATIONS % bands:
+            raise ValueError(f"bands must divide {PERMUTATIONS}")
+        self.path = Path(path) if path else None
+        self.threshold = threshold
+        self.bands = bands
+        self._rows = PERMUTATIONS // bands
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path else ":memory:", check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "duplicates": 0, "stored": 0, "skipped": 0}
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'bands'").fetchone()
+        if row is None or int(row[0]) != bands:
+            self._rebuild_bands()
+
+    def _keys(self, signature: Any) -> List[int]:
+        # The band number in the top bits keeps equal values in different bands apart.
+        data = signature.astype("<u4").tobytes()
+        width = self._rows * 4
+        keys = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(data[band * width : (band + 1) * width], digest_size=7).digest()
+            keys.append((band << 56) | int.from_bytes(digest, "little"))
+        return keys
+
+    def _rebuild_bands(self) -> None:
+        import numpy as np
+
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM bands")
+            for identifier, blob in self._conn.execute("SELECT id, minhash FROM signatures").fetchall():
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO bands (key, id) VALUES (?, ?)",
+                    [(key, identifier) for key in self._keys(np.frombuffer(blob, dtype="<u4"))],
+                )
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('bands', ?)", (str(self.bands),))
+
+    def _candidates(self, signature: Any) -> List[Tuple[str, bytes]]:
+        # Callers hold `_lock`.
+        keys = self._keys(signature)
+        marks = ",".join("?" * len(keys))
+        return self._conn.execute(
+            "SELECT url, minhash FROM signatures WHERE id IN"
+            f" (SELECT DISTINCT id FROM bands WHERE key IN ({marks}))",
+            keys,
+        ).fetchall()
+
+    def _best(self, signature: Any, rows: Sequence[Tuple[str, bytes]]) -> Optional[Duplicate]:
+        import numpy as np
+
+        best: Optional[Duplicate] = None
+        for url, blob in rows:
+            score = similarity(signature, np.frombuffer(blob, dtype="<u4"))
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = Duplicate(url, round(score, 4))
+        return best
+
+    def _insert(self, entries: Sequence[Tuple[str, Any]], now: float) -> None:
+        # Callers hold `_lock` inside an open transaction.
+        for url, signature in entries:
+            cursor = self._conn.execute(
+                "INSERT INTO signatures (url, minhash, created_at) VALUES (?, ?, ?)",
+                (url, signature.astype("<u4").tobytes(), now),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO bands (key, id) VALUES (?, ?)",
+                [(key, cursor.lastrowid) for key in self._keys(signature)],
+            )
+        self._stats["stored"] += len(entries)
+
+    def nearest(self, signature: Any) -> Optional[Duplicate]:
+        """Most similar stored article at or above `threshold`, if any."""
+        with self._lock:
+            rows = self._candidates(signature)
+        return self._best(signature, rows)
+
+    def add(self, url: str, signature: Any) -> None:
+        self.add_many([(url, signature)])
+
+    def add_many(self, entries: Sequence[Tuple[str, Any]]) -> None:
+        """Store ``(url, signature)`` pairs in one transaction."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._insert(entries, time.time())
+
+    def check(self, url: str, text: str) -> Optional[Duplicate]:
+        """Return the stored article `text` duplicates, or record it as a new original.
+
+        A match on the same URL is a re-fetch of the same story rather than a
+        syndicated copy, so it is neither reported nor stored again. The
+        lookup and the insert run under the index lock in one ``BEGIN
+        IMMEDIATE`` transaction, so two copies of a story checked at the same
+        time (by ingest threads, or by processes sharing the file) cannot
+        both be stored as originals.
+        """
+        signature = minhash(text)
+        if signature is None:
+            with self._lock:
+                self._stats["skipped"] += 1
+            return None
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            match = self._best(signature, self._candidates(signature))
+            if match is None:
+                self._insert([(url, signature)], time.time())
+            duplicate = match if match is not None and match.url != url else None
+            self._stats["lookups"] += 1
+            self._stats["duplicates"] += duplicate is not None
+        return duplicate
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+        stats["duplicate_rate"] = round(stats["duplicates"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["DedupIndex", "Duplicate", "minhash", "similarity"]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import codecs
+import copy
+import os
+import re
+from typing import Any, Optional, Union
+
+from .timing import span
+
+# Article pages are rarely above a few hundred KB; anything past this is
+# inline data or a mislabelled download and is truncated before parsing.
+MAX_HTML_BYTES = int(os.environ.get("OYB_MAX_HTML_BYTES", str(5 * 1024 * 1024)))
+# Below this a response is an error stub, a redirect page or an empty shell.
+MIN_HTML_BYTES = 256
+
+_BINARY_MAGIC = (b"%PDF", b"PK\x03\x04", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"\x1f\x8b", b"RIFF", b"OggS")
+
+_META_CHARSET = re.compile(rb"""<meta[^>]{0,200}?charset\s*=\s*["']?([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+_document_class: Any = None
+
+
+def html_content_type(content_type: Optional[str]) -> bool:
+    """Whether a Content-Type may hold an article; a missing header gets the benefit of the doubt."""
+    if not content_type:
+        return True
+    media = content_type.split(";", 1)[0].strip().lower()
+    return not media or "html" in media or media in ("text/xml", "application/xml")
+
+
+def looks_like_html(body: Union[bytes, str], content_type: Optional[str] = None) -> bool:
+    """Cheap pre-check run before any parsing: rejects wrong types, tiny bodies and binary payloads."""
+    if not html_content_type(content_type):
+        return False
+    head = body[:1024]
+    if isinstance(head, str):
+        return len(body.strip()) >= MIN_HTML_BYTES and "\x00" not in head
+    return (
+        len(body.strip()) >= MIN_HTML_BYTES
+        and b"\x00" not in head
+        and not head.lstrip().startswith(_BINARY_MAGIC)
+    )
+
+
+def _lookup_charset(name: str) -> Optional[str]:
+    try:
+        return codecs.lookup(name.strip("\"' ")).name
+    except LookupError:
+        return None
+
+
+def _charset(body: Union[bytes, str], content_type: Optional[str]) -> Optional[str]:
+    """Charset from the Content-Type header, else from a ``<meta>`` near the top of the page."""
+    for parameter in (content_type or "").split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            return _lookup_charset(value)
+    if isinstance(body, bytes):
+        match = _META_CHARSET.search(body[:2048])
+        if match:
+            return _lookup_charset(match.group(1).decode("ascii"))
+    return None
+
+
+def parse_html(body: Union[bytes, str], content_type: Optional[str] = None) -> Any:
+    """Parse a page into an lxml tree once, decoding with the charset the response declares.
+
+    Without a declared charset, trafilatura's loader sniffs the encoding from
+    the bytes. Returns `None` when the body does not parse as HTML.
+    """
+    from trafilatura.utils import load_html
+
+    charset = _charset(body, content_type)
+    if charset and isinstance(body, bytes):
+        body = body.decode(charset, errors="replace")
+    return load_html(body[:MAX_HTML_BYTES])
+
+
+def _readability_document() -> Any:
+    """readability `Document` that reads a shared tree instead of parsing the page again.
+
+    Each pass starts from a copy of the tree, since readability prunes the
+    document it is given and retries from scratch when its first pass strips
+    too much; copying a parsed tree costs a fraction of parsing it again.
+    `summary` still returns HTML: its retry check measures that HTML against
+    `retry_length`, so the text is taken from the result afterwards.
+    """
+    global _document_class
+    if _document_class is None:
+        from readability import Document
+
+        class TreeDocument(Document):
+            def _parse(self, input: Any) -> Any:
+                return super()._parse(copy.deepcopy(input))
+
+        _document_class = TreeDocument
+    return _document_class
+
+
+def _html_text(html: str) -> str:
+    import lxml.html
+
+    if not html.strip():
+        return ""
+    return "\n".join(lxml.html.fromstring(html).itertext())
+
+
+def extract_text(body: Union[bytes, str], content_type: Optional[str] = None) -> str:
+    """Article text from a fetched page, or ``""`` for anything that is not an article.
+
+    The page is parsed into one lxml tree that trafilatura reads first and
+    the readability fallback reuses when trafilatura finds nothing.
+    """
+    import trafilatura
+
+    if not looks_like_html(body, content_type):
+        return ""
+    with span("extract.parse"):
+        tree = parse_html(body, content_type)
+    if tree is None:
+        return ""
+    with span("extract.trafilatura"):
+        extracted = trafilatura.extract(tree, include_comments=False, include_tables=False)
+    if extracted:
+        return extracted
+    with span("extract.readability"):
+        return _html_text(_readability_document()(tree).summary(html_partial=True))
+
+
+__all__ = ["MAX_HTML_BYTES", "MIN_HTML_BYTES", "extract_text", "html_content_type", "looks_like_html", "parse_html"]
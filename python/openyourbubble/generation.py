@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .timing import record, span
+
+
+@dataclass
+class GenerationRequest:
+    prefix: str
+    suffix: str
+    max_tokens: int
+    temperature: float
+    future: "Future[str]" = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    # Streaming requests get their text pieces pushed to `chunks` and stop once `stop` is set.
+    chunks: "Optional[queue.Queue[Optional[str]]]" = None
+    stop: threading.Event = field(default_factory=threading.Event)
+    grammar: Optional[Any] = None
+
+    @property
+    def group(self) -> Tuple[Any, ...]:
+        if self.chunks is not None:
+            return (id(self),)
+        return (self.prefix, self.max_tokens, self.temperature, id(self.grammar))
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"max_tokens": self.max_tokens, "temperature": self.temperature}
+        if self.grammar is not None:
+            options["grammar"] = self.grammar
+        return options
+
+
+_STOP = object()
+
+
+class GenerationScheduler:
+    """Serialises completions for one loaded model and reuses the shared prompt prefix.
+
+    Callers on any thread `submit` a prompt split into a `prefix` (instructions
+    and schema, identical across articles) and a per-article `suffix`. A single
+    worker owns the backend: it waits up to `max_queue_delay` seconds after the
+    first queued request to collect up to `max_batch` requests, evaluates each
+    distinct prefix once and keeps the llama.cpp state saved right after it, and
+    restores that state when the prefix changes so only the suffix is evaluated.
+
+    llama-cpp-python's `Llama` decodes a single sequence, so a batch runs
+    back-to-back on the warm prefix there. Backends that expose
+    `create_completion_batch(prompts, ...)` decode same-prefix requests together.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        *,
+        max_batch: int = 4,
+        max_queue_delay: float = 0.005,
+        max_prefixes: int = 4,
+    ) -> None:
+        self.backend = backend
+        self.max_batch = max(1, max_batch)
+        self.max_queue_delay = max(0.0, max_queue_delay)
+        self.max_prefixes = max(1, max_prefixes)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._states: "OrderedDict[str, Any]" = OrderedDict()
+        self._active: Optional[str] = None
+        self._stateful = all(
+            callable(getattr(backend, name, None)) for name in ("reset", "eval", "save_state", "load_state")
+        )
+        self._batched = callable(getattr(backend, "create_completion_batch", None))
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "requests": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "prefix_hits": 0,
+            "prefix_misses": 0,
+            "completion_tokens": 0,
+            "stopped_early": 0,
+            "queue_wait_ms": 0.0,
+            "busy_ms": 0.0,
+        }
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="oyb-generation", daemon=True)
+        self._worker.start()
+
+    def submit(
+        self,
+        prefix: str,
+        suffix: str,
+        *,
+        max_tokens: int = 512,
+        temperature: float = 0.6,
+        grammar: Optional[Any] = None,
+    ) -> "Future[str]":
+        if self._closed:
+            raise RuntimeError("generation scheduler is closed")
+        request = GenerationRequest(prefix, suffix, max_tokens, temperature, grammar=grammar)
+        self._queue.put(request)
+        return request.future
+
+    def generate(
+        self,
+        prefix: str,
+        suffix: str,
+        *,
+        max_tokens: int = 512,
+        temperature: float = 0.6,
+        grammar: Optional[Any] = None,
+    ) -> str:
+        return self.submit(
+            prefix, suffix, max_tokens=max_tokens, temperature=temperature, grammar=grammar
+        ).result()
+
+    def stream(
+        self,
+        prefix: str,
+        suffix: str,
+        *,
+        max_tokens: int = 512,
+        temperature: float = 0.6,
+        grammar: Optional[Any] = None,
+    ) -> Iterator[str]:
+        """Yield text pieces as they are decoded; closing the iterator stops generation."""
+        if self._closed:
+            raise RuntimeError("generation scheduler is closed")
+        request = GenerationRequest(
+            prefix, suffix, max_tokens, temperature, chunks=queue.Queue(), grammar=grammar
+        )
+        self._queue.put(request)
+        try:
+            while True:
+                piece = request.chunks.get()
+                if piece is None:
+                    break
+                yield piece
+            request.future.result()  # re-raise a backend failure
+        finally:
+            request.stop.set()
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        requests = stats["requests"]
+        stats["mean_queue_wait_ms"] = round(stats["queue_wait_ms"] / requests, 3) if requests else 0.0
+        busy = stats["busy_ms"] / 1000
+        stats["tokens_per_s"] = round(stats["completion_tokens"] / busy, 1) if busy else 0.0
+        stats["queue_wait_ms"] = round(stats["queue_wait_ms"], 3)
+        stats["busy_ms"] = round(stats["busy_ms"], 3)
+        return stats
+
+    def close(self) -> None:
+        """Finish queued requests, then stop the worker."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._worker.join()
+        self._states.clear()
+
+    # worker side -----------------------------------------------------------
+
+    def _count(self, **amounts: float) -> None:
+        with self._stats_lock:
+            for key, amount in amounts.items():
+                self._stats[key] += amount
+
+    def _collect(self, first: GenerationRequest) -> Tuple[List[GenerationRequest], bool]:
+        batch = [first]
+        deadline = first.enqueued_at + self.max_queue_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopping = self._collect(item)
+            groups: "OrderedDict[Tuple[Any, ...], List[GenerationRequest]]" = OrderedDict()
+            for request in batch:
+                groups.setdefault(request.group, []).append(request)
+            for requests in groups.values():
+                self._serve(requests)
+
+    def _use_prefix(self, prefix: str) -> None:
+        if not self._stateful:
+            return
+        if self._active == prefix:
+            # llama.cpp keeps the evaluated prefix and matches it against the next prompt.
+            self._count(prefix_hits=1)
+            return
+        state = self._states.get(prefix)
+        if state is not None:
+            self._states.move_to_end(prefix)
+            self.backend.load_state(state)
+            self._count(prefix_hits=1)
+        else:
+            with span("model.prompt_eval"):
+                self.backend.reset()
+                self.backend.eval(self.backend.tokenize(prefix.encode("utf-8")))
+                self._states[prefix] = self.backend.save_state()
+            while len(self._states) > self.max_prefixes:
+                self._states.popitem(last=False)
+            self._count(prefix_misses=1)
+        self._active = prefix
+
+    def _serve(self, requests: List[GenerationRequest]) -> None:
+        started = time.perf_counter()
+        live = [request for request in requests if request.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        for request in live:
+            record("model.queue_wait", started - request.enqueued_at)
+        head = live[0]
+        if head.chunks is not None:
+            self._serve_stream(head, started)
+            return
+        try:
+            self._use_prefix(head.prefix)
+            prompts = [request.prefix + request.suffix for request in live]
+            # Suffix evaluation and decoding happen inside one backend call.
+            with span("model.generate"):
+                if self._batched and len(live) > 1:
+                    responses = self.backend.create_completion_batch(prompts, **head.options())
+                else:
+                    responses = [
+                        self.backend.create_completion(prompt=prompt, **head.options()) for prompt in prompts
+                    ]
+        except Exception as exc:
+            # A failed decode leaves the context in an unknown state.
+            self._active = None
+            for request in live:
+                request.future.set_exception(exc)
+            return
+        finished = time.perf_counter()
+        tokens = 0
+        for request, response in zip(live, responses):
+            tokens += int((response.get("usage") or {}).get("completion_tokens", 0))
+            request.future.set_result(response["choices"][0]["text"])
+        self._count(
+            requests=len(live),
+            batches=1,
+            batched_requests=len(live) if len(live) > 1 else 0,
+            completion_tokens=tokens,
+            queue_wait_ms=sum(started - request.enqueued_at for request in live) * 1000,
+            busy_ms=(finished - started) * 1000,
+        )
+
+    def _serve_stream(self, request: GenerationRequest, started: float) -> None:
+        assert request.chunks is not None
+        pieces: List[str] = []
+        try:
+            self._use_prefix(request.prefix)
+            chunks = self.backend.create_completion(
+                prompt=request.prefix + request.suffix, stream=True, **request.options()
+            )
+            try:
+                with span("model.generate"):
+                    for chunk in chunks:
+                        if request.stop.is_set():
+                            break
+                        piece = chunk["choices"][0]["text"]
+                        if not pieces:
+                            record("model.first_piece", time.perf_counter() - started)
+                        pieces.append(piece)
+                        request.chunks.put(piece)
+            finally:
+                close = getattr(chunks, "close", None)
+                if callable(close):
+                    close()
+        except Exception as exc:
+            self._active = None
+            request.future.set_exception(exc)
+        else:
+            request.future.set_result("".join(pieces))
+        finally:
+            request.chunks.put(None)
+        self._count(
+            requests=1,
+            batches=1,
+            completion_tokens=len(pieces),
+            stopped_early=1 if request.stop.is_set() else 0,
+            queue_wait_ms=(started - request.enqueued_at) * 1000,
+            busy_ms=(time.perf_counter() - started) * 1000,
+        )
+
+
+__all__ = ["GenerationRequest", "GenerationScheduler"]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Dict, List, Optional, Tuple
+
+# Filled in by the caller rather than generated by the model.
+_CALLER_FIELDS = {"topic", "category", "method"}
+
+_RULES = r'''
+string ::= "\"" ( [^"\\\x7F\x00-\x1F] | "\\" ( ["\\/bfnrt] | "u" [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] ) )* "\""
+strings ::= "[" ws ( string ( ws "," ws string )* )? ws "]"
+'''
+
+# Whitespace between tokens is capped, as in llama.cpp's JSON grammar, so a model stuck
+# emitting blanks cannot burn MAX_TOKENS and still match. Spelled as nested optionals
+# because `{0,n}` repetition needs a newer llama.cpp than the `llm` extra allows.
+_MAX_WS = 20
+
+
+def _ws_rule(limit: int = _MAX_WS) -> str:
+    rule = ""
+    for _ in range(limit):
+        rule = f"( [ \\t\\n] {rule})?"
+    return f"ws ::= {rule}\n"
+
+_grammars: Dict[bool, Any] = {}
+
+
+def study_fields() -> List[Tuple[str, str]]:
+    """``(name, rule)`` for each generated `StudySuggestion` field, in declaration order."""
+    from .study import StudySuggestion
+
+    fields = []
+    for field in dataclasses.fields(StudySuggestion):
+        if field.name in _CALLER_FIELDS:
+            continue
+        annotation = field.type if isinstance(field.type, str) else getattr(field.type, "__name__", "")
+        if annotation == "str":
+            fields.append((field.name, "string"))
+        elif annotation in ("List[str]", "list[str]"):
+            fields.append((field.name, "strings"))
+        else:  # pragma: no cover - guards future field types
+            raise TypeError(f"no grammar rule for StudySuggestion.{field.name}: {annotation}")
+    return fields
+
+
+def study_gbnf(thinking: bool = False) -> str:
+    """GBNF grammar accepting exactly one `StudySuggestion` JSON object.
+
+    Thinking modes may write free text before the object, which the parser skips.
+    """
+    members = ' ws "," ws '.join(f'"\\"{name}\\"" ws ":" ws {rule}' for name, rule in study_fields())
+    root = f'root ::= {"reasoning " if thinking else ""}"{{" ws {members} ws "}}"\n'
+    reasoning = 'reasoning ::= [^{]*\n' if thinking else ""
+    return root + reasoning + _RULES.lstrip("\n") + _ws_rule()
+
+
+def study_grammar(thinking: bool = False) -> Optional[Any]:
+    """Compiled `LlamaGrammar` for `study_gbnf`, or `None` when llama.cpp cannot provide one."""
+    if thinking not in _grammars:
+        try:
+            from llama_cpp import LlamaGrammar  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            grammar = None
+        else:
+            grammar = LlamaGrammar.from_string(study_gbnf(thinking), verbose=False)
+        _grammars[thinking] = grammar
+    return _grammars[thinking]
+
+
+__all__ = ["study_fields", "study_gbnf", "study_grammar"]
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
 
 import feedparser
 import requests
-from readability import Document
-from bs4 import BeautifulSoup
-import trafilatura
+from requests.adapters import HTTPAdapter
 
+from .cache import HttpCache, content_hash
 from .categories import CategoryGraph, load_graph
+from .dedup import DedupIndex
+from .extract import MAX_HTML_BYTES, extract_text, html_content_type
+from .keywords import extract_keywords_many
+from .novelty import NoveltyScorer
+from .timing import span
 
 
 @dataclass
@@ -22,9 +30,13 @@ class IngestedItem:
     language: Optional[str]
     categories: List[str]
     text: str
+    keywords: Optional[List[str]] = None
+    language_confidence: Optional[float] = None
+    duplicate_of: Optional[str] = None
+    novelty: Optional[float] = None
 
     def to_dict(self) -> dict:
-        return {
+        payload = {
             "url": self.url,
             "title": self.title,
             "summary": self.summary,
@@ -33,61 +45,308 @@ class IngestedItem:
             "categories": self.categories,
             "text": self.text,
         }
+        if self.keywords is not None:
+            payload["keywords"] = self.keywords
+        if self.language_confidence is not None:
+            payload["language_confidence"] = self.language_confidence
+        if self.duplicate_of is not None:
+            payload["duplicate_of"] = self.duplicate_of
+        if self.novelty is not None:
+            payload["novelty"] = self.novelty
+        return payload
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """Keep-alive session whose connection pool fits the ingest worker count."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    user_agent = os.environ.get("INGEST_USER_AGENT")
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
 
 
 class Ingestor:
-    def __init__(self, graph: Optional[CategoryGraph] = None) -> None:
+    def __init__(
+        self,
+        graph: Optional[CategoryGraph] = None,
+        *,
+        concurrency: int = 1,
+        per_host: int = 2,
+        timeout: float = 15,
+        session: Optional[requests.Session] = None,
+        cache: Optional[HttpCache] = None,
+        include_ancestors: bool = False,
+        keywords: bool = False,
+        detect_language: bool = False,
+        language_threshold: float = 0.9,
+        dedup: Optional[DedupIndex] = None,
+        skip_duplicates: bool = False,
+        novelty: Optional[NoveltyScorer] = None,
+        max_html_bytes: Optional[int] = MAX_HTML_BYTES,
+    ) -> None:
         self.graph = graph or load_graph()
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.session = session or make_session(max(self.concurrency, self.per_host))
+        self.cache = cache
+        self.include_ancestors = include_ancestors
+        self.keywords = keywords
+        self.detect_language = detect_language
+        self.language_threshold = language_threshold
+        self.dedup = dedup
+        self.skip_duplicates = skip_duplicates
+        self.novelty = novelty
+        self.max_html_bytes = max_html_bytes
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
 
     def _pull_feed(self, url: str) -> feedparser.FeedParserDict:
-        return feedparser.parse(url)
+        if self.cache is None or urlsplit(url).scheme not in ("http", "https"):
+            # feedparser fetches and parses in one call here, so both count as the fetch.
+            with span("ingest.feed_fetch"):
+                return feedparser.parse(url)
+        body, headers = self._conditional_get("feed", url, lambda body, headers: body)
+        response_headers = {"content-location": url}
+        for key in ("content-type", "content-language"):
+            if key in headers:
+                response_headers[key] = headers[key]
+        with span("ingest.feed_parse"):
+            return feedparser.parse(body, response_headers=response_headers)
+
+    def _conditional_get(
+        self,
+        kind: str,
+        url: str,
+        transform: Callable[[bytes, Dict[str, str]], Union[str, bytes]],
+        limit: Optional[int] = None,
+    ) -> Tuple[Union[str, bytes], Dict[str, str]]:
+        """Fetch `url` through the cache, returning ``(payload, headers)``.
+
+        Unchanged resources (a 304, or a 200 whose body hashes to the cached
+        value) reuse the cached payload and skip `transform` entirely.
+        """
+        assert self.cache is not None
+        entry = self.cache.lookup(kind, url)
+        with span("ingest.feed_fetch" if kind == "feed" else "ingest.html_fetch"):
+            response = self.session.get(
+                url, timeout=self.timeout, headers=entry.validators() if entry else None, stream=True
+            )
+            headers = {key.lower(): value for key, value in response.headers.items()}
+            if entry is not None and response.status_code == 304:
+                response.close()
+                self.cache.record("not_modified")
+                self.cache.touch(entry, headers.get("etag"), headers.get("last-modified"))
+                return entry.payload, headers
+            response.raise_for_status()
+            body = self._read_body(response, limit, html_only=kind == "article")
+        digest = content_hash(body)
+        if entry is not None and entry.content_hash == digest:
+            self.cache.record("unchanged")
+            self.cache.touch(entry, headers.get("etag"), headers.get("last-modified"))
+            return entry.payload, headers
+        self.cache.record("misses")
+        payload = transform(body, headers)
+        self.cache.store(
+            kind,
+            url,
+            payload,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            content_hash=digest,
+        )
+        return payload, headers
+
+    def _read_body(self, response: requests.Response, limit: Optional[int], html_only: bool = False) -> bytes:
+        """Read a streamed response, stopping at `limit` bytes.
+
+        With `html_only`, a body whose Content-Type cannot be an article is
+        not downloaded at all. Stopping early drops the connection rather than
+        returning it to the pool, which is cheaper than draining a large body.
+        """
+        try:
+            if html_only and not html_content_type(response.headers.get("content-type")):
+                return b""
+            if limit is None:
+                return response.content
+            chunks: List[bytes] = []
+            size = 0
+            for chunk in response.iter_content(64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= limit:
+                    break
+            return b"".join(chunks)[:limit]
+        finally:
+            response.close()
 
     def _resolve_categories(self, tags: Iterable[str]) -> List[str]:
-        resolved = []
-        normalized = {tag.strip().lower() for tag in tags if tag}
-        for category in self.graph.all():
-            if normalized.intersection({category.slug, category.label.lower(), *category.tags}):
-                resolved.append(category.slug)
-        return resolved or ["world"]
+        return self.graph.resolve(tags, include_ancestors=self.include_ancestors) or ["world"]
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _fetch_text(self, url: str) -> str:
+        with self._host_slot(url):
+            return self._extract_html(url)
+
+    def _extract_many(self, links: Sequence[str]) -> Iterator[str]:
+        """Extract article text for `links`, yielding results in input order."""
+        if self.concurrency == 1 or len(links) < 2:
+            for link in links:
+                yield self._extract_html(link)
+            return
+        executor = ThreadPoolExecutor(max_workers=min(self.concurrency, len(links)))
+        try:
+            futures = [executor.submit(self._fetch_text, link) for link in links]
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _extract_html(self, url: str) -> str:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        html = response.text
-        extracted = trafilatura.extract(html, include_comments=False, include_tables=False)
-        if extracted:
-            return extracted
-        readable = Document(html)
-        return BeautifulSoup(readable.summary(html_partial=True), "lxml").get_text("\n")
-
-    def ingest_feed(self, url: str) -> List[IngestedItem]:
-        feed = self._pull_feed(url)
-        items: List[IngestedItem] = []
-        for entry in feed.entries:
-            link = entry.get("link")
-            if not link:
-                continue
-            categories = self._resolve_categories(
-                [term.get("term") for term in entry.get("tags", []) if isinstance(term, dict)]
-            )
-            text = self._extract_html(link)
-            published = entry.get("published_parsed")
-            iso = None
-            if published:
-                iso = dt.datetime(*published[:6], tzinfo=dt.timezone.utc).isoformat()
-            language = entry.get("language") or feed.feed.get("language")
-            items.append(
-                IngestedItem(
-                    url=link,
-                    title=entry.get("title", ""),
-                    summary=entry.get("summary", ""),
-                    published_at=iso,
-                    language=language,
-                    categories=categories,
-                    text=text,
-                )
+        if self.cache is not None:
+            payload, _ = self._conditional_get(
+                "article",
+                url,
+                lambda body, headers: self._extract_text(body, headers.get("content-type")),
+                limit=self.max_html_bytes,
             )
+            return payload.decode("utf-8") if isinstance(payload, bytes) else payload
+        with span("ingest.html_fetch"):
+            response = self.session.get(url, timeout=self.timeout, stream=True)
+            response.raise_for_status()
+            body = self._read_body(response, self.max_html_bytes, html_only=True)
+        return self._extract_text(body, response.headers.get("content-type"))
+
+    def _extract_text(self, html: Union[bytes, str], content_type: Optional[str] = None) -> str:
+        return extract_text(html, content_type)
+
+    def _build_item(
+        self,
+        feed: feedparser.FeedParserDict,
+        entry: dict,
+        text: str,
+        duplicate_of: Optional[str] = None,
+    ) -> IngestedItem:
+        categories = self._resolve_categories(
+            [term.get("term") for term in entry.get("tags", []) if isinstance(term, dict)]
+        )
+        published = entry.get("published_parsed")
+        iso = None
+        if published:
+            iso = dt.datetime(*published[:6], tzinfo=dt.timezone.utc).isoformat()
+        language = entry.get("language") or feed.feed.get("language")
+        confidence = None
+        if self.detect_language:
+            language, confidence = self._detect_language(text or entry.get("summary", ""), language)
+        return IngestedItem(
+            url=entry.get("link"),
+            title=entry.get("title", ""),
+            summary=entry.get("summary", ""),
+            published_at=iso,
+            language=language,
+            categories=categories,
+            text=text,
+            language_confidence=confidence,
+            duplicate_of=duplicate_of,
+        )
+
+    def _detect_language(self, text: str, hint: Optional[str]) -> Tuple[Optional[str], float]:
+        """Detected language of the article, or the feed's declared one when detection is unsure.
+
+        A hint that agrees with the detection is kept since it may carry a
+        region (``en-GB``, ``zh-TW``) the identifier does not distinguish.
+        """
+        from .langid import detect_language
+
+        with span("ingest.detect_language"):
+            detection = detect_language(text)
+        if detection.language is None or detection.confidence < self.language_threshold:
+            return hint, detection.confidence
+        if hint and hint.split("-")[0].lower() == detection.language:
+            return hint, detection.confidence
+        return detection.language, detection.confidence
+
+    def _feed_entries(self, feed: feedparser.FeedParserDict, limit: Optional[int] = None) -> List[dict]:
+        """Entries with a link, cut to `limit` before any article is fetched."""
+        entries = [entry for entry in feed.entries if entry.get("link")]
+        if limit is not None:
+            entries = entries[: max(0, limit)]
+        return entries
+
+    def _process_entry(self, feed: feedparser.FeedParserDict, entry: dict, text: str) -> Optional[IngestedItem]:
+        """Dedup-check and build one extracted entry; `None` for a skipped duplicate."""
+        duplicate = None
+        if self.dedup is not None:
+            with span("ingest.dedup"):
+                duplicate = self.dedup.check(entry.get("link"), text)
+        if duplicate is not None and self.skip_duplicates:
+            return None
+        return self._build_item(feed, entry, text, duplicate.url if duplicate else None)
+
+    @property
+    def _holds_items(self) -> bool:
+        """Whether items wait for the rest of their cycle before they are finished and yielded."""
+        return self.keywords or self.novelty is not None
+
+    def _finish_items(self, items: List[IngestedItem]) -> List[IngestedItem]:
+        """Keyword and novelty-score a cycle's originals, one batched call each.
+
+        A near-duplicate shares the original's keywords and would only pull
+        its categories towards a story they already hold, so it gets neither.
+        """
+        originals = [item for item in items if item.duplicate_of is None]
+        if self.keywords:
+            keyworded = [item for item in originals if item.text.strip()]
+            found = extract_keywords_many([item.text for item in keyworded], update=True)
+            for item, keywords in zip(keyworded, found):
+                item.keywords = keywords
+        if self.novelty is not None:
+            scored = [item for item in originals if item.categories]
+            with span("ingest.novelty"):
+                results = self.novelty.score_many([(item.text or item.summary, item.categories) for item in scored])
+            for item, result in zip(scored, results):
+                item.novelty = result.score
         return items
 
+    def iter_feed(self, url: str, limit: Optional[int] = None) -> Iterator[IngestedItem]:
+        """Yield items in feed order, as soon as each article is extracted where possible.
+
+        `limit` is applied to the feed entries before any article is fetched, so
+        entries past it cost neither bandwidth nor extraction time. With a
+        `dedup` index, near-duplicates of stored articles are tagged with
+        `duplicate_of` (or dropped with `skip_duplicates`) before keywording.
+        With `keywords` or a `novelty` scorer, the feed's items are held
+        until all are extracted and are then keyworded together (so the
+        ``tfidf`` engine scores the cycle as one batch) and novelty-scored
+        together against their categories as they stood before the cycle,
+        then folded into them; the store is flushed when the feed is done.
+        """
+        feed = self._pull_feed(url)
+        entries = self._feed_entries(feed, limit)
+        texts = self._extract_many([entry.get("link") for entry in entries])
+        try:
+            items = (self._process_entry(feed, entry, text) for entry, text in zip(entries, texts))
+            if self._holds_items:
+                yield from self._finish_items([item for item in items if item is not None])
+            else:
+                yield from (item for item in items if item is not None)
+        finally:
+            if self.novelty is not None:
+                self.novelty.flush()
+
+    def ingest_feed(self, url: str, limit: Optional[int] = None) -> List[IngestedItem]:
+        return list(self.iter_feed(url, limit=limit))
+
 
 __all__ = ["Ingestor", "IngestedItem"]
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .timing import span
+
+ScoredKeywords = List[Tuple[str, float]]
+
+# Bump when the extractor settings or the stored format change so stale persistent entries are ignored.
+ENGINE_KEY = "yake:n3:top12:scored"
+CORPUS_ENGINE_KEY = "tfidf:n3:top12:scored"
+
+KEYWORD_ENGINES = ("yake", "tfidf")
+
+_keyword_engine: Optional[Any] = None
+
+
+def _engine() -> Any:
+    # yake pulls in segtok/jellyfish/networkx, so build the extractor on first use.
+    global _keyword_engine
+    if _keyword_engine is None:
+        with span("keywords.load"):
+            import yake
+
+            _keyword_engine = yake.KeywordExtractor(n=3, top=12)
+    return _keyword_engine
+
+
+def text_digest(text: str, engine: str = ENGINE_KEY) -> str:
+    return hashlib.blake2b(f"{engine}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class KeywordCache:
+    """Content-addressed keyword cache: an in-process LRU over an optional SQLite tier.
+
+    Entries are keyed by a digest of the article text and the extractor
+    settings, so the same article opened for a study suggestion, a
+    professional brief, or at ingest time is only run through YAKE once.
+    Each entry keeps the YAKE scores (lower is more relevant) next to the
+    phrases, best first.
+    """
+
+    def __init__(self, capacity: int = 1024, path: Optional[Union[str, Path]] = None) -> None:
+        self.capacity = max(1, capacity)
+        self.path = Path(path) if path else None
+        self._memory: "OrderedDict[str, ScoredKeywords]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS keywords (digest TEXT PRIMARY KEY, keywords TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+
+    def _remember(self, digest: str, keywords: ScoredKeywords) -> None:
+        self._memory[digest] = keywords
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get(self, digest: str) -> Optional[ScoredKeywords]:
+        with self._lock:
+            keywords = self._memory.get(digest)
+            if keywords is not None:
+                self._memory.move_to_end(digest)
+                self._stats["memory_hits"] += 1
+                return list(keywords)
+            if self._conn is not None:
+                row = self._conn.execute("SELECT keywords FROM keywords WHERE digest = ?", (digest,)).fetchone()
+                if row is not None:
+                    keywords = [(phrase, score) for phrase, score in json.loads(row[0])]
+                    self._remember(digest, keywords)
+                    self._stats["disk_hits"] += 1
+                    return list(keywords)
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, digest: str, keywords: ScoredKeywords) -> None:
+        with self._lock:
+            self._remember(digest, list(keywords))
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO keywords (digest, keywords, created_at) VALUES (?, ?, ?)",
+                    (digest, json.dumps(keywords, ensure_ascii=False), time.time()),
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            if self._conn is not None:
+                stats["disk_entries"] = self._conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM keywords")
+
+
+_cache: Optional[KeywordCache] = None
+
+
+def keyword_cache() -> KeywordCache:
+    """Process-wide cache; `OYB_KEYWORD_CACHE` points the persistent tier at a SQLite file."""
+    global _cache
+    if _cache is None:
+        _cache = KeywordCache(
+            capacity=int(os.environ.get("OYB_KEYWORD_CACHE_SIZE", "1024")),
+            path=os.environ.get("OYB_KEYWORD_CACHE") or None,
+        )
+    return _cache
+
+
+def configure_keyword_cache(cache: Optional[KeywordCache]) -> None:
+    global _cache
+    _cache = cache
+
+
+def keyword_cache_stats() -> Dict[str, Any]:
+    return keyword_cache().stats()
+
+
+def extract_keyword_scores(text: str) -> ScoredKeywords:
+    """``(phrase, yake_score)`` pairs, most relevant (lowest score) first."""
+    cache = keyword_cache()
+    digest = text_digest(text)
+    cached = cache.get(digest)
+    if cached is not None:
+        return cached
+    engine = _engine()
+    with span("keywords.yake"):
+        scored = sorted(
+            ((phrase, float(score)) for phrase, score in engine.extract_keywords(text)), key=lambda item: item[1]
+        )
+    cache.put(digest, scored)
+    return list(scored)
+
+
+def keyword_engine(engine: Optional[str] = None) -> str:
+    """Resolve an engine name; `OYB_KEYWORD_ENGINE` sets the default (``yake``)."""
+    name = (engine or os.environ.get("OYB_KEYWORD_ENGINE") or "yake").lower()
+    if name not in KEYWORD_ENGINES:
+        raise ValueError(f"unknown keyword engine: {name} (expected one of {', '.join(KEYWORD_ENGINES)})")
+    return name
+
+
+def extract_keywords(text: str, engine: Optional[str] = None) -> List[str]:
+    if keyword_engine(engine) == "tfidf":
+        return extract_keywords_many([text], engine="tfidf")[0]
+    return [phrase for phrase, _ in extract_keyword_scores(text)]
+
+
+def extract_keywords_many(
+    texts: Sequence[str], engine: Optional[str] = None, *, update: bool = False
+) -> List[List[str]]:
+    """Keywords for each of `texts`, sharing the keyword cache with `extract_keywords`.
+
+    With the ``tfidf`` engine, every uncached text goes through
+    `CorpusKeywordExtractor` in one vectorised pass and is scored against the
+    corpus statistics gathered so far, so callers should hand over a whole
+    batch or ingest cycle at once. Only `update` callers (batch runs and
+    ingest cycles) fold their texts into those statistics; a lookup for a
+    suggestion or brief leaves them, and so its own cached entry, untouched.
+    Entries are cached with negated scores, keeping lower-is-better across
+    engines, under a key that includes the corpus state they were looked up
+    at: once more documents have been counted, the same text is scored again.
+    """
+    if keyword_engine(engine) == "yake":
+        return [extract_keywords(text, engine="yake") for text in texts]
+    from .corpus_keywords import corpus_keyword_extractor
+
+    cache = keyword_cache()
+    extractor = corpus_keyword_extractor()
+    engine_key = f"{CORPUS_ENGINE_KEY}@{extractor.state}"
+    digests = [text_digest(text, engine_key) for text in texts]
+    # A cache hit must not keep a text that was only ever looked up out of the corpus.
+    readable = extractor.counted(texts) if update else [True] * len(texts)
+    results: List[Optional[List[str]]] = []
+    missing: Dict[str, str] = {}
+    for text, digest, read in zip(texts, digests, readable):
+        cached = cache.get(digest) if read else None
+        results.append([phrase for phrase, _ in cached] if cached is not None else None)
+        if cached is None:
+            missing.setdefault(digest, text)
+    if missing:
+        with span("keywords.tfidf"):
+            scored = extractor.extract_scored_many(list(missing.values()), update=update)
+        fresh = {}
+        for digest, keywords in zip(missing, scored):
+            cache.put(digest, [(phrase, -score) for phrase, score in keywords])
+            fresh[digest] = [phrase for phrase, _ in keywords]
+        results = [found if found is not None else fresh[digest] for found, digest in zip(results, digests)]
+    return [list(found or []) for found in results]
+
+
+__all__ = [
+    "KEYWORD_ENGINES",
+    "KeywordCache",
+    "configure_keyword_cache",
+    "extract_keyword_scores",
+    "extract_keywords",
+    "extract_keywords_many",
+    "keyword_cache",
+    "keyword_cache_stats",
+    "keyword_engine",
+    "text_digest",
+]
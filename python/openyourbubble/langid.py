@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+import threading
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+MODEL_PATH = Path(__file__).with_name("langid.npz")
+
+# Only the opening of an article is scored; a few hundred letters already
+# separate the closest pairs and it keeps detection cost flat per article.
+MAX_CHARS = 500
+# Texts with fewer letters than this are reported as undetermined.
+MIN_LETTERS = 12
+
+_HASH_MIX = 0x9E3779B97F4A7C15
+_SPACE = 0x20
+
+# Script-wide folds applied before hashing, mirroring the langdetect profiles
+# the model is built from: kana, hangul and bopomofo collapse to one symbol
+# per block, Farsi yeh to Arabic yeh, Romanian comma-below to cedilla, and
+# Vietnamese tone-marked vowels to a single symbol.
+_FOLDS = (
+    (0x3040, 0x309F, 0x3042),
+    (0x30A0, 0x30FF, 0x30A2),
+    (0x3100, 0x312F, 0x3105),
+    (0x31A0, 0x31BF, 0x3105),
+    (0xAC00, 0xD7AF, 0xAC00),
+    (0x1EA0, 0x1EFF, 0x1EC3),
+    (0x06CC, 0x06CC, 0x064A),
+    (0x0219, 0x0219, 0x015F),
+    (0x021B, 0x021B, 0x0163),
+)
+
+
+@dataclass
+class Detection:
+    language: Optional[str]
+    confidence: float
+
+    def to_dict(self) -> dict:
+        return {"language": self.language, "confidence": self.confidence}
+
+
+def _normalizer(cjk_sources: Any, cjk_targets: Any) -> Any:
+    """Lookup table from each BMP code point (already lowercased) to the one that is hashed.
+
+    Letters and combining marks map to themselves or their fold; everything
+    else maps to a space. Code points outside the BMP are treated as spaces.
+    """
+    import numpy as np
+
+    table = np.arange(0x10000, dtype=np.uint32)
+    letters = np.fromiter(
+        (unicodedata.category(chr(code))[0] in "LM" for code in range(0x10000)), dtype=bool, count=0x10000
+    )
+    table[~letters] = _SPACE
+    for low, high, target in _FOLDS:
+        table[low : high + 1] = target
+    table[cjk_sources] = cjk_targets
+    return table
+
+
+def _valid_gram(codes: List[int]) -> bool:
+    if len(codes) == 1:
+        return codes[0] != _SPACE
+    if len(codes) == 2:
+        return codes != [_SPACE, _SPACE]
+    return len(codes) == 3 and codes[1] != _SPACE
+
+
+def _gram_key(*codes: Any) -> Any:
+    """Exact 64-bit key of a gram: its length, then up to three 16-bit code points."""
+    import numpy as np
+
+    key = np.uint64(len(codes) << 48)
+    for shift, code in zip((32, 16, 0)[3 - len(codes) :], codes):
+        key = key | (code << np.uint64(shift))
+    return key
+
+
+def _buckets(keys: Any, bits: int) -> Any:
+    import numpy as np
+
+    return (keys * np.uint64(_HASH_MIX)) >> np.uint64(64 - bits)
+
+
+class LanguageIdentifier:
+    """Character n-gram naive Bayes language identification over hashed features.
+
+    Every 1-3 character gram of the lowercased text is hashed into one of
+    ``2**bits`` buckets (grams of the BMP code points are packed into exact
+    64-bit keys first, so only the final bucketing can collide); the model holds one quantised log-probability row per
+    language. A batch is normalised through a single table lookup, hashed in
+    one pass and scored with a bincount and one matrix product. Confidence is
+    the posterior of the best language.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        import numpy as np
+
+        with np.load(str(path or MODEL_PATH)) as data:
+            self.languages: List[str] = [str(code) for code in data["languages"]]
+            self.bits = int(data["bits"])
+            scale, offset = float(data["scale"]), float(data["offset"])
+            # Dequantised once at load; float32 keeps the batch matmul cheap.
+            self._weights = (data["weights"].astype(np.float32) * np.float32(scale) + np.float32(offset)).T.copy()
+            self._table = _normalizer(data["cjk_from"], data["cjk_to"])
+
+    def detect(self, text: str) -> Detection:
+        return self.detect_many([text])[0]
+
+    def detect_many(self, texts: Sequence[str], chunk: int = 64) -> List[Detection]:
+        results: List[Detection] = []
+        for start in range(0, len(texts), chunk):
+            results.extend(self._detect_chunk(texts[start : start + chunk]))
+        return results
+
+    def _detect_chunk(self, texts: Sequence[str]) -> List[Detection]:
+        import numpy as np
+
+        # Each text is prefixed with a space and the batch padded with two, so
+        # a gram belongs to the text its first character is in. Valid grams
+        # never span a word break: a unigram is a letter, a bigram holds at
+        # least one letter and a trigram has a letter in the middle.
+        pieces = [" " + (text or "")[:MAX_CHARS].lower() for text in texts]
+        raw = np.frombuffer(("".join(pieces) + "  ").encode("utf-32-le"), dtype=np.uint32)
+        codes = self._table[np.minimum(raw, 0xFFFF)]
+        size = len(codes) - 2
+        rows = np.repeat(np.arange(len(pieces), dtype=np.int64), [len(piece) for piece in pieces])
+        letter = codes != _SPACE
+        letters = np.bincount(rows[letter[:size]], minlength=len(pieces))
+
+        c = codes.astype(np.uint64)
+        keys = np.empty((3, size), dtype=np.uint64)
+        keys[0] = _gram_key(c[:size])
+        keys[1] = _gram_key(c[:size], c[1 : size + 1])
+        keys[2] = _gram_key(c[:size], c[1 : size + 1], c[2:])
+        valid = np.empty((3, size), dtype=bool)
+        valid[0] = letter[:size]
+        valid[1] = letter[:size] | letter[1 : size + 1]
+        valid[2] = letter[1 : size + 1]
+
+        buckets = 1 << self.bits
+        trash = len(pieces) * buckets
+        flat = np.where(valid, rows * buckets + _buckets(keys, self.bits).astype(np.int64), trash)
+        counts = np.bincount(flat.ravel(), minlength=trash + 1)[:trash].reshape(len(pieces), buckets)
+        scores = counts.astype(np.float32) @ self._weights
+        scores -= scores.max(axis=1, keepdims=True)
+        posterior = np.exp(scores)
+        posterior /= posterior.sum(axis=1, keepdims=True)
+        best = posterior.argmax(axis=1)
+        results = []
+        for row in range(len(pieces)):
+            if letters[row] < MIN_LETTERS:
+                results.append(Detection(None, 0.0))
+            else:
+                index = int(best[row])
+                results.append(Detection(self.languages[index], round(float(posterior[row, index]), 4)))
+        return results
+
+
+_identifier: Optional[LanguageIdentifier] = None
+_identifier_lock = threading.Lock()
+
+
+def identifier() -> LanguageIdentifier:
+    """Process-wide identifier; the bundled model is loaded on first use."""
+    global _identifier
+    with _identifier_lock:
+        if _identifier is None:
+            _identifier = LanguageIdentifier()
+        return _identifier
+
+
+def detect_language(text: str) -> Detection:
+    return identifier().detect(text)
+
+
+def detect_languages(texts: Sequence[str]) -> List[Detection]:
+    return identifier().detect_many(texts)
+
+
+def build_model(
+    profiles: Dict[str, Dict[str, Any]],
+    output: Union[str, Path],
+    *,
+    bits: int = 13,
+    cjk_map: Optional[Dict[str, str]] = None,
+    floor: float = 1e-6,
+) -> Dict[str, Any]:
+    """Write a model file from langdetect-format profiles (``freq`` and ``n_words``).
+
+    Gram frequencies are case-folded, normalised per gram length, summed per
+    bucket and stored as uint8 log-probabilities; `floor` is the probability
+    given to buckets a language never saw.
+    """
+    import numpy as np
+
+    buckets = 1 << bits
+    cjk_map = cjk_map or {}
+    pairs = sorted((ord(source), ord(target)) for source, target in cjk_map.items())
+    cjk = (
+        np.array([source for source, _ in pairs], dtype=np.uint32),
+        np.array([target for _, target in pairs], dtype=np.uint32),
+    )
+    table = _normalizer(*cjk)
+    languages = sorted(profiles)
+    logp = np.empty((len(languages), buckets), dtype=np.float64)
+    for row, language in enumerate(languages):
+        profile = profiles[language]
+        totals = profile["n_words"]
+        mass = np.zeros(buckets, dtype=np.float64)
+        for gram, frequency in profile["freq"].items():
+            codes = [int(table[min(ord(char), 0xFFFF)]) for char in gram.lower()]
+            length = len(codes)
+            if not _valid_gram(codes):
+                continue
+            with np.errstate(over="ignore"):
+                bucket = int(_buckets(_gram_key(*np.array(codes, dtype=np.uint64)), bits))
+            mass[bucket] += frequency / max(totals[length - 1], 1)
+        logp[row] = np.log(mass + floor)
+    offset = float(logp.min())
+    scale = (float(logp.max()) - offset) / 255 or 1.0
+    weights = np.rint((logp - offset) / scale).astype(np.uint8)
+    np.savez_compressed(
+        str(output),
+        languages=np.array(languages),
+        bits=np.array(bits),
+        scale=np.array(scale),
+        offset=np.array(offset),
+        weights=weights,
+        cjk_from=cjk[0],
+        cjk_to=cjk[1],
+    )
+    return {"languages": len(languages), "bits": bits, "bytes": Path(output).stat().st_size}
+
+
+def load_profiles(directory: Union[str, Path], merge: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Read a directory of langdetect profiles, summing those mapped together by `merge`."""
+    merge = merge or {}
+    profiles: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(Path(directory).iterdir()):
+        profile = json.loads(path.read_text(encoding="utf-8"))
+        code = merge.get(profile["name"], profile["name"])
+        target = profiles.setdefault(code, {"freq": {}, "n_words": [0, 0, 0]})
+        for gram, frequency in profile["freq"].items():
+            target["freq"][gram] = target["freq"].get(gram, 0) + frequency
+        target["n_words"] = [a + b for a, b in zip(target["n_words"], profile["n_words"])]
+    return profiles
+
+
+__all__ = [
+    "Detection",
+    "LanguageIdentifier",
+    "build_model",
+    "detect_language",
+    "detect_languages",
+    "identifier",
+    "load_profiles",
+]
@@ -1,27 +1,225 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-try:
-    from llama_cpp import Llama  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    Llama = None  # type: ignore
+from .timing import record, span
+
+if TYPE_CHECKING:
+    from .generation import GenerationScheduler
+    from .packing import TokenCounter
+    from .study import StudySuggestion
+
+_UNRESOLVED = object()
+Llama: Any = _UNRESOLVED
+
+
+def _llama_class() -> Any:
+    """Import llama.cpp on first use; `None` when the optional extra is missing."""
+    global Llama
+    if Llama is _UNRESOLVED:
+        try:
+            from llama_cpp import Llama as _Llama  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            _Llama = None
+        Llama = _Llama
+    return Llama
+
+
+ModelKey = Tuple[str, int, int]
+
+
+class ModelRegistry:
+    """Process-wide LRU of loaded llama.cpp models keyed by (model_path, n_ctx, n_threads).
+
+    Loading a GGUF file mmaps and initialises several GB, so each combination is
+    built once and shared by every `MaybeModel` pointing at it. When more
+    variants are configured than `capacity` allows, the least recently used
+    model is released.
+
+    Each model gets one `GenerationScheduler` that owns it for completions;
+    `max_batch` and `max_queue_delay` configure every scheduler created here.
+    """
+
+    def __init__(self, capacity: int = 2, *, max_batch: int = 4, max_queue_delay: float = 0.005) -> None:
+        self.capacity = max(1, capacity)
+        self.max_batch = max_batch
+        self.max_queue_delay = max_queue_delay
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._loading: Dict[ModelKey, Future] = {}
+        self._schedulers: Dict[ModelKey, "GenerationScheduler"] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_path: Path, n_ctx: int, n_threads: int) -> Optional[Any]:
+        """The cached model for this key, loading it on first use.
+
+        The load runs outside the registry lock, so other models stay
+        available meanwhile; concurrent callers for the same key wait on one
+        shared load instead of starting their own.
+        """
+        llama_cls = _llama_class()
+        if llama_cls is None:
+            return None
+        key = (str(model_path), n_ctx, n_threads)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+            loading = self._loading.get(key)
+            owner = loading is None
+            if owner:
+                loading = self._loading[key] = Future()
+        if not owner:
+            return loading.result()
+        try:
+            with span("model.load"):
+                model = llama_cls(model_path=key[0], n_ctx=n_ctx, n_threads=n_threads)
+        except BaseException as exc:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(exc)
+            raise
+        with self._lock:
+            del self._loading[key]
+            self._models[key] = model
+            evicted = []
+            while len(self._models) > self.capacity:
+                evicted.append(self._detach(*self._models.popitem(last=False)))
+        for scheduler, old in evicted:
+            _close(scheduler, old)
+        loading.set_result(model)
+        return model
+
+    def scheduler(self, model_path: Path, n_ctx: int, n_threads: int) -> Optional["GenerationScheduler"]:
+        model = self.get(model_path, n_ctx, n_threads)
+        if model is None:
+            return None
+        key = (str(model_path), n_ctx, n_threads)
+        with self._lock:
+            scheduler = self._schedulers.get(key)
+            if scheduler is None or scheduler.backend is not model:
+                from .generation import GenerationScheduler
+
+                scheduler = GenerationScheduler(
+                    model, max_batch=self.max_batch, max_queue_delay=self.max_queue_delay
+                )
+                self._schedulers[key] = scheduler
+            return scheduler
+
+    def _detach(self, key: ModelKey, model: Any) -> Tuple[Optional["GenerationScheduler"], Any]:
+        # Callers hold the lock; closing happens after it is released.
+        return self._schedulers.pop(key, None), model
+
+    def unload(self, model_path: Optional[Path] = None) -> int:
+        """Release every cached model, or only those loaded from `model_path`."""
+        with self._lock:
+            keys = [
+                key for key in self._models if model_path is None or key[0] == str(model_path)
+            ]
+            released = [self._detach(key, self._models.pop(key)) for key in keys]
+        for scheduler, model in released:
+            _close(scheduler, model)
+        return len(keys)
+
+    def loaded(self) -> List[ModelKey]:
+        with self._lock:
+            return list(self._models.keys())
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            schedulers = list(self._schedulers.items())
+        return {key[0]: scheduler.stats() for key, scheduler in schedulers}
+
+
+def _close(scheduler: Optional["GenerationScheduler"], model: Any) -> None:
+    if scheduler is not None:
+        scheduler.close()
+    close = getattr(model, "close", None)
+    if callable(close):
+        close()
+
+
+MAX_TOKENS = 512
+# Tokens kept free for the topic/keyword lines and tokenizer drift.
+_PROMPT_MARGIN = 64
+
+# Keys the prompt asks for; camelCase spellings some models emit map onto them.
+STUDY_FIELDS = ("spotlight_subject", "questions", "presentation_prompt", "presentation_question", "impact_hints")
+_FIELD_ALIASES = {"spotlightSubject": "spotlight_subject", "presentationQuestion": "presentation_question"}
+
+_counters_lock = threading.Lock()
+_counters: Dict[str, float] = {
+    "generations": 0,
+    "generation_ms": 0.0,
+    "parse_failures": 0,
+    "constrained": 0,
+    "packed_articles": 0,
+    "article_tokens": 0,
+    "prompt_article_tokens": 0,
+}
+
+
+def _count(**amounts: float) -> None:
+    with _counters_lock:
+        for key, amount in amounts.items():
+            _counters[key] += amount
+
+
+def model_stats() -> Dict[str, Any]:
+    """Generation counters for this process plus the response cache hit rates."""
+    from .response_cache import response_cache
+
+    with _counters_lock:
+        stats: Dict[str, Any] = dict(_counters)
+    generations = stats["generations"]
+    stats["mean_generation_ms"] = round(stats["generation_ms"] / generations, 3) if generations else 0.0
+    stats["generation_ms"] = round(stats["generation_ms"], 3)
+    stats["responses"] = response_cache().stats()
+    return stats
+
+
+registry = ModelRegistry(
+    capacity=int(os.environ.get("OYB_MODEL_CACHE_SIZE", "2")),
+    max_batch=int(os.environ.get("OYB_GENERATION_MAX_BATCH", "4")),
+    max_queue_delay=float(os.environ.get("OYB_GENERATION_MAX_DELAY_MS", "5")) / 1000,
+)
 
 
 @dataclass
 class MaybeModel:
     model_path: Optional[Path] = None
     preferred: str = "quen-3.4b"
+    n_ctx: int = 2048
+    n_threads: int = 4
+    # Article tokens allowed in the prompt; defaults to whatever n_ctx leaves after the prefix and output.
+    article_budget: Optional[int] = None
+    _token_counter: Optional["TokenCounter"] = field(default=None, init=False, repr=False, compare=False)
 
-    def _make(self) -> Optional["Llama"]:
-        if Llama is None or self.model_path is None:
+    def _make(self) -> Optional[Any]:
+        if self.model_path is None:
             return None
-        return Llama(model_path=str(self.model_path), n_ctx=2048, n_threads=4)
+        return registry.get(self.model_path, self.n_ctx, self.n_threads)
+
+    def warmup(self) -> bool:
+        """Load the model ahead of the first request; returns whether one is ready."""
+        return self._make() is not None
+
+    def unload(self) -> int:
+        if self.model_path is None:
+            return 0
+        self._token_counter = None
+        return registry.unload(self.model_path)
 
     def available(self, mode: str) -> bool:
-        if self.model_path is None or Llama is None:
+        if self.model_path is None or _llama_class() is None:
             return False
         requested = mode.split(":", 1)[0]
         return requested in {"quen-3.4b", "quen-3.4b-thinking", "quen-2.5", "quen-2.5-thinking"}
@@ -34,35 +232,186 @@ class MaybeModel:
         article_text: str,
         mode: str,
     ) -> Optional["StudySuggestion"]:
-        llm = self._make()
-        if llm is None:
+        if self.model_path is None:
+            return None
+        keywords = list(keywords)
+        prefix = self._prompt_prefix(mode)
+        # Keyed on the full article: packing is deterministic, and a hit then never loads the model.
+        unpacked = self._prompt_suffix(topic=topic, keywords=keywords, article_text=article_text)
+        key = self._cache_key(mode, prefix + unpacked)
+        cached = self._cached(key)
+        if cached is not None:
+            return self.from_payload(cached)
+        scheduler = registry.scheduler(self.model_path, self.n_ctx, self.n_threads)
+        if scheduler is None:
+            return None
+        with span("model.pack"):
+            packed = self._pack(prefix, article_text)
+        suffix = self._prompt_suffix(topic=topic, keywords=keywords, article_text=packed)
+        grammar = self._grammar(mode)
+        started = time.perf_counter()
+        text = scheduler.generate(prefix, suffix, max_tokens=MAX_TOKENS, temperature=0.6, grammar=grammar).strip()
+        elapsed = (time.perf_counter() - started) * 1000
+        record("model.request", elapsed / 1000)
+        _count(generations=1, generation_ms=elapsed, constrained=1 if grammar is not None else 0)
+        payload = self._payload(text)
+        if payload is None:
             return None
-        prompt = self._prompt(topic=topic, keywords=list(keywords), article_text=article_text, mode=mode)
-        response = llm.create_completion(prompt=prompt, max_tokens=512, temperature=0.6)
-        text = response["choices"][0]["text"].strip()
-        return self._parse(text)
+        self._store(key, payload, elapsed)
+        return self.from_payload(payload)
 
-    def _prompt(self, *, topic: str, keywords: List[str], article_text: str, mode: str) -> str:
+    def stream_study(
+        self,
+        *,
+        topic: str,
+        keywords: Iterable[str],
+        article_text: str,
+        mode: str,
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(field, value)`` pairs as the model completes each top-level JSON member.
+
+        Generation stops as soon as every key in `STUDY_FIELDS` has arrived.
+        Raises `StreamAborted` as soon as the output cannot be the expected
+        object, so the caller can fall back without waiting for `MAX_TOKENS`.
+        A cached response is replayed field by field without touching the model.
+        """
+        from .streaming import IncrementalObjectParser, StreamAborted
+
+        if self.model_path is None:
+            return
+        keywords = list(keywords)
+        prefix = self._prompt_prefix(mode)
+        # Keyed on the full article: packing is deterministic, and a hit then never loads the model.
+        unpacked = self._prompt_suffix(topic=topic, keywords=keywords, article_text=article_text)
+        key = self._cache_key(mode, prefix + unpacked)
+        cached = self._cached(key)
+        if cached is not None:
+            yield from cached.items()
+            return
+        scheduler = registry.scheduler(self.model_path, self.n_ctx, self.n_threads)
+        if scheduler is None:
+            return
+        with span("model.pack"):
+            packed = self._pack(prefix, article_text)
+        suffix = self._prompt_suffix(topic=topic, keywords=keywords, article_text=packed)
+        grammar = self._grammar(mode)
+        # Thinking modes write reasoning steps before the object.
+        parser = IncrementalObjectParser(STUDY_FIELDS, preamble_limit=4000 if mode.endswith("thinking") else 16)
+        fields: Dict[str, Any] = {}
+        started = time.perf_counter()
+        pieces = scheduler.stream(prefix, suffix, max_tokens=MAX_TOKENS, temperature=0.6, grammar=grammar)
+        try:
+            for piece in pieces:
+                for name, value in parser.feed(piece):
+                    name = _FIELD_ALIASES.get(name, name)
+                    parser.fields[name] = fields[name] = value
+                    yield name, value
+                if parser.complete:
+                    break
+            parser.finish()
+        except StreamAborted:
+            _count(parse_failures=1)
+            raise
+        finally:
+            pieces.close()
+            elapsed = (time.perf_counter() - started) * 1000
+            record("model.request", elapsed / 1000)
+            _count(generations=1, generation_ms=elapsed, constrained=1 if grammar is not None else 0)
+        self._store(key, fields, elapsed)
+
+    def _tokenize(self, data: bytes) -> List[int]:
+        # Resolved per call: holding on to the backend would keep an unloaded or
+        # evicted model alive, and tokenize on a closed one.
+        backend = self._make()
+        if backend is None:
+            raise RuntimeError("model is not available")
+        return backend.tokenize(data, add_bos=False)
+
+    def _pack(self, prefix: str, article_text: str) -> str:
+        """Trim the article to the passages that fit the context, scored by YAKE keyword weight."""
+        from .keywords import extract_keyword_scores
+        from .packing import TokenCounter, pack_article
+
+        if self._token_counter is None:
+            if self._make() is None:
+                return article_text
+            self._token_counter = TokenCounter(self._tokenize)
+        count = self._token_counter
+        budget = self._budget_setting()
+        if budget is None:
+            budget = self.n_ctx - MAX_TOKENS - count(prefix) - _PROMPT_MARGIN
+        packed = pack_article(article_text, extract_keyword_scores(article_text), max(budget, 64), count)
+        _count(
+            packed_articles=1 if packed.packed else 0,
+            article_tokens=packed.source_tokens,
+            prompt_article_tokens=packed.tokens,
+        )
+        return packed.text
+
+    def _budget_setting(self) -> Optional[int]:
+        if self.article_budget is not None:
+            return self.article_budget
+        configured = os.environ.get("OYB_PROMPT_BUDGET")
+        return int(configured) if configured else None
+
+    def _grammar(self, mode: str) -> Optional[Any]:
+        from .grammar import study_grammar
+
+        return study_grammar(thinking=mode.endswith("thinking"))
+
+    def _cache_key(self, mode: str, prompt: str) -> Tuple[str, str, str]:
+        from .response_cache import model_fingerprint, prompt_digest
+
+        assert self.model_path is not None
+        digest = prompt_digest(
+            prompt, max_tokens=MAX_TOKENS, temperature=0.6, n_ctx=self.n_ctx, article_budget=self._budget_setting()
+        )
+        return (model_fingerprint(self.model_path), mode, digest)
+
+    def _cached(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        from .response_cache import response_cache
+
+        return response_cache().get(key)
+
+    def _store(self, key: Tuple[str, str, str], payload: Dict[str, Any], generation_ms: float) -> None:
+        from .response_cache import response_cache
+
+        response_cache().put(key, payload, generation_ms)
+
+    def _prompt_prefix(self, mode: str) -> str:
+        # Everything that does not depend on the article goes first so the
+        # evaluated prefix can be reused across requests.
         thinking = mode.endswith("thinking")
         baseline = mode.split(":", 1)[0]
         reasoning = "Provide numbered reasoning steps before the answer." if thinking else "Respond succinctly."
         return (
             "You are an analyst coach helping people study relevant news. "
+            "Return JSON with keys spotlight_subject (string), questions (list), presentation_prompt,"
+            " presentation_question, and impact_hints (list).\n"
             f"Model variant: {baseline}. {reasoning}\n"
-            f"Topic: {topic}\n"
-            f"Keywords: {', '.join(keywords[:6])}\n"
-            "Article:\n" + article_text + "\n"
-            "Return JSON with keys questions (list), presentation_prompt, presentation_question, impact_hints (list),"
-            " and spotlight_subject (string)."
         )
 
-    def _parse(self, text: str):
-        import json
+    def _prompt_suffix(self, *, topic: str, keywords: List[str], article_text: str) -> str:
+        return f"Topic: {topic}\nKeywords: {', '.join(keywords[:6])}\nArticle:\n{article_text}\nJSON:\n"
 
+    def _prompt(self, *, topic: str, keywords: List[str], article_text: str, mode: str) -> str:
+        return self._prompt_prefix(mode) + self._prompt_suffix(
+            topic=topic, keywords=keywords, article_text=article_text
+        )
+
+    def _payload(self, text: str) -> Optional[Dict[str, Any]]:
+        # Thinking modes may put reasoning before the object.
+        start = text.find("{")
         try:
-            payload = json.loads(text)
+            payload = json.loads(text[start:] if start > 0 else text)
         except json.JSONDecodeError:
+            payload = None
+        if not isinstance(payload, dict):
+            _count(parse_failures=1)
             return None
+        return {_FIELD_ALIASES.get(key, key): value for key, value in payload.items()}
+
+    def from_payload(self, payload: Dict[str, Any]) -> "StudySuggestion":
         from .study import StudySuggestion
 
         return StudySuggestion(
@@ -79,4 +428,4 @@ class MaybeModel:
         )
 
 
-__all__ = ["MaybeModel"]
+__all__ = ["STUDY_FIELDS", "MaybeModel", "ModelRegistry", "model_stats", "registry"]
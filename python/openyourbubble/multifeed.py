@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from .ingest import IngestedItem, Ingestor
+from .timing import span
+
+
+@dataclass
+class FeedSource:
+    url: str
+    title: Optional[str] = None
+    limit: Optional[int] = None
+
+
+def _looks_like_opml(text: str) -> bool:
+    return text.lstrip("\ufeff \t\r\n").startswith("<")
+
+
+def read_feed_list(text: str, fmt: Optional[str] = None) -> List[FeedSource]:
+    """Parse an OPML document or NDJSON lines into feed sources.
+
+    NDJSON lines are anything `feed_source` accepts, as JSON.
+    The format is detected from the first character unless `fmt` is given.
+    """
+    fmt = (fmt or ("opml" if _looks_like_opml(text) else "ndjson")).lower()
+    if fmt == "opml":
+        sources = _read_opml(text)
+    elif fmt == "ndjson":
+        sources = _read_ndjson(text)
+    else:
+        raise ValueError(f"unknown feed list format: {fmt} (expected opml or ndjson)")
+    return sources
+
+
+def _read_opml(text: str) -> List[FeedSource]:
+    try:
+        root = ElementTree.fromstring(text.lstrip("\ufeff"))
+    except ElementTree.ParseError as exc:
+        raise ValueError(f"invalid OPML: {exc}") from exc
+    return [
+        FeedSource(url=outline.get("xmlUrl", "").strip(), title=outline.get("title") or outline.get("text"))
+        for outline in root.iter("outline")
+        if outline.get("xmlUrl", "").strip()
+    ]
+
+
+def feed_source(record: Any) -> FeedSource:
+    """A feed URL string, or an object with ``url`` (or ``feed_url`` / ``xmlUrl``), ``title`` and ``limit``."""
+    if isinstance(record, FeedSource):
+        return record
+    if isinstance(record, str):
+        record = {"url": record}
+    if not isinstance(record, dict):
+        raise ValueError("a feed must be a URL or a JSON object")
+    url = str(record.get("url") or record.get("feed_url") or record.get("xmlUrl") or "").strip()
+    if not url:
+        raise ValueError("feed has no url")
+    limit = record.get("limit")
+    return FeedSource(url=url, title=record.get("title"), limit=int(limit) if limit is not None else None)
+
+
+def _read_ndjson(text: str) -> List[FeedSource]:
+    sources = []
+    for index, line in enumerate(text.splitlines()):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            sources.append(feed_source(json.loads(line)))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"line {index + 1}: {exc}") from exc
+    return sources
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+class HostLimiter:
+    """Global and per-host concurrency caps plus a per-host request spacing.
+
+    A request first takes its host's slot and waits out the spacing, so a
+    slow or rate-limited host queues its own requests without holding any of
+    the global slots the other hosts could use. Create it inside the event
+    loop that uses it.
+    """
+
+    def __init__(self, concurrency: int = 16, per_host: int = 2, rate: float = 0.0) -> None:
+        self.per_host = max(1, per_host)
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._global = asyncio.Semaphore(max(1, concurrency))
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self.waited = 0.0
+
+    @asynccontextmanager
+    async def slot(self, url: str, delay: float = 0.0) -> AsyncIterator[None]:
+        """Hold a request slot for `url`; `delay` (e.g. a robots.txt Crawl-delay) widens the spacing."""
+        host = _host(url)
+        semaphore = self._slots.get(host)
+        if semaphore is None:
+            semaphore = self._slots[host] = asyncio.Semaphore(self.per_host)
+        async with semaphore:
+            interval = max(self.interval, delay)
+            if interval:
+                now = asyncio.get_running_loop().time()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + interval
+                if start > now:
+                    self.waited += start - now
+                    await asyncio.sleep(start - now)
+            async with self._global:
+                yield
+
+
+class RobotsCache:
+    """robots.txt rules per scheme and host, fetched once and kept for `ttl` seconds.
+
+    A 401/403 disallows the whole host and any other 4xx allows it, as
+    `urllib.robotparser` does. A 5xx or a failed fetch allows the host too but
+    is only kept for `error_ttl`, so a flaky host is asked again soon.
+    Concurrent checks for the same host share one fetch.
+    """
+
+    def __init__(self, ingestor: Ingestor, ttl: float = 24 * 3600, error_ttl: float = 600) -> None:
+        self.ingestor = ingestor
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.user_agent = str(ingestor.session.headers.get("User-Agent") or "*")
+        self._rules: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._pending: Dict[str, "asyncio.Future[RobotFileParser]"] = {}
+        self._stats = {"fetched": 0, "hits": 0, "errors": 0, "disallowed": 0}
+
+    def _fetch(self, robots_url: str) -> Tuple[RobotFileParser, bool]:
+        parser = RobotFileParser(robots_url)
+        try:
+            with span("ingest.robots"):
+                response = self.ingestor.session.get(robots_url, timeout=self.ingestor.timeout)
+        except Exception:
+            parser.allow_all = True
+            return parser, False
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif 400 <= response.status_code < 500:
+            parser.allow_all = True
+        elif response.status_code >= 500:
+            parser.allow_all = True
+            return parser, False
+        else:
+            parser.parse(response.text.splitlines())
+        return parser, True
+
+    async def rules(self, url: str, limiter: HostLimiter, executor: ThreadPoolExecutor) -> RobotFileParser:
+        host = _host(url)
+        cached = self._rules.get(host)
+        if cached is not None and cached[1] > time.monotonic():
+            self._stats["hits"] += 1
+            return cached[0]
+        pending = self._pending.get(host)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[RobotFileParser]" = loop.create_future()
+        self._pending[host] = future
+        try:
+            async with limiter.slot(url):
+                parser, ok = await loop.run_in_executor(executor, self._fetch, f"{host}/robots.txt")
+            self._stats["fetched"] += 1
+            if not ok:
+                self._stats["errors"] += 1
+            self._rules[host] = (parser, time.monotonic() + (self.ttl if ok else self.error_ttl))
+            future.set_result(parser)
+            return parser
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; do not warn when there are none
+            raise
+        finally:
+            self._pending.pop(host, None)
+
+    async def check(self, url: str, limiter: HostLimiter, executor: ThreadPoolExecutor) -> Tuple[bool, float]:
+        """Whether `url` may be fetched, and the host's Crawl-delay in seconds (0 when unset)."""
+        if urlsplit(url).scheme not in ("http", "https"):
+            return True, 0.0
+        parser = await self.rules(url, limiter, executor)
+        allowed = parser.can_fetch(self.user_agent, url)
+        if not allowed:
+            self._stats["disallowed"] += 1
+        delay = parser.crawl_delay(self.user_agent)
+        return allowed, float(delay or 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["hosts"] = len(self._rules)
+        return stats
+
+
+class RobotsDisallowed(Exception):
+    pass
+
+
+_DONE = object()
+
+
+class MultiFeedIngestor:
+    """Ingest many feeds at once on an asyncio event loop.
+
+    Feed and article requests run on a thread pool of `concurrency` workers
+    through the wrapped `Ingestor` (so its HTTP cache, dedup index, keyword
+    and novelty settings all apply) and are gated by a `HostLimiter`: at most
+    `concurrency` requests overall, `per_host` per host, and no more than
+    `rate` request starts per second per host (0 for no spacing). With
+    `robots`, each host's robots.txt is fetched once, its Crawl-delay widens
+    the spacing, and disallowed feeds and articles are not requested.
+
+    Items are produced as soon as each article is done, across all feeds, as
+    ``IngestedItem.to_dict()`` tagged with its ``feed`` URL and ``feed_title``;
+    when the ingestor keywords or novelty-scores items, a feed's items are
+    finished together once all of its articles are done and produced then.
+    A feed or article that fails produces an ``error`` line instead. A feed
+    listed twice is only ingested once.
+    """
+
+    def __init__(
+        self,
+        ingestor: Ingestor,
+        *,
+        concurrency: int = 16,
+        per_host: int = 2,
+        rate: float = 1.0,
+        robots: bool = True,
+        limit: Optional[int] = 20,
+    ) -> None:
+        self.ingestor = ingestor
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.rate = max(0.0, rate)
+        self.robots = RobotsCache(ingestor) if robots else None
+        self.limit = limit
+        self._stats: Dict[str, Any] = {}
+
+    async def stream(self, feeds: Iterable[FeedSource]) -> AsyncIterator[Dict[str, Any]]:
+        self._stats = {
+            "feeds": 0,
+            "feeds_failed": 0,
+            "items": 0,
+            "articles_failed": 0,
+            "duplicates_skipped": 0,
+            "robots_blocked": 0,
+        }
+        started = time.perf_counter()
+        limiter = HostLimiter(self.concurrency, self.per_host, self.rate)
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.concurrency * 4)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        sources: Dict[str, FeedSource] = {}
+        for source in feeds:
+            sources.setdefault(source.url, source)
+        tasks = [asyncio.create_task(self._run_feed(source, limiter, executor, queue)) for source in sources.values()]
+
+        async def finish() -> None:
+            await asyncio.gather(*tasks)
+            await queue.put(_DONE)
+
+        closer = asyncio.create_task(finish())
+        try:
+            while True:
+                line = await queue.get()
+                if line is _DONE:
+                    break
+                yield line
+        finally:
+            for task in tasks + [closer]:
+                task.cancel()
+            await asyncio.gather(*tasks, closer, return_exceptions=True)
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.ingestor.novelty is not None:
+                self.ingestor.novelty.flush()
+            self._stats["seconds"] = round(time.perf_counter() - started, 3)
+            self._stats["rate_wait_seconds"] = round(limiter.waited, 3)
+
+    def iter_ingest(self, feeds: Iterable[FeedSource]) -> Iterator[Dict[str, Any]]:
+        """Synchronous form of `stream`, running its own event loop."""
+        loop = asyncio.new_event_loop()
+        lines = self.stream(feeds)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(lines.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(lines.aclose())
+            loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        if self.robots is not None:
+            stats["robots"] = self.robots.stats()
+        return stats
+
+    async def _gate(self, url: str, limiter: HostLimiter, executor: ThreadPoolExecutor) -> float:
+        if self.robots is None:
+            return 0.0
+        allowed, delay = await self.robots.check(url, limiter, executor)
+        if not allowed:
+            raise RobotsDisallowed(f"disallowed by robots.txt: {url}")
+        return delay
+
+    async def _run_feed(
+        self,
+        source: FeedSource,
+        limiter: HostLimiter,
+        executor: ThreadPoolExecutor,
+        queue: "asyncio.Queue[Any]",
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        self._stats["feeds"] += 1
+        try:
+            delay = await self._gate(source.url, limiter, executor)
+            async with limiter.slot(source.url, delay):
+                feed = await loop.run_in_executor(executor, self.ingestor._pull_feed, source.url)
+            if feed.get("status", 200) >= 400:
+                response = requests.Response()
+                response.status_code, response.url = feed.status, source.url
+                raise requests.HTTPError(f"{feed.status} error fetching feed: {source.url}", response=response)
+            if not feed.entries and feed.get("bozo") and feed.get("bozo_exception") is not None:
+                raise feed.bozo_exception
+        except Exception as exc:
+            self._stats["feeds_failed"] += 1
+            self._feed_done(source, None, exc)
+            await queue.put({"feed": source.url, "error": {"message": str(exc), "type": type(exc).__name__}})
+            return
+        limit = source.limit if source.limit is not None else self.limit
+        tag = {"feed": source.url, "feed_title": feed.feed.get("title") or source.title}
+        entries = self._select_entries(source, feed, limit)
+        hold = self.ingestor._holds_items
+        held = await asyncio.gather(
+            *(self._run_entry(source, feed, entry, tag, limiter, executor, queue, hold) for entry in entries)
+        )
+        held = [pair for pair in held if pair is not None]
+        if held:
+            try:
+                await loop.run_in_executor(executor, self.ingestor._finish_items, [item for _, item in held])
+            except Exception as exc:
+                self._stats["articles_failed"] += len(held)
+                error = {"message": str(exc), "type": type(exc).__name__}
+                for _, item in held:
+                    await queue.put({**tag, "url": item.url, "error": error})
+            else:
+                for entry, item in held:
+                    await self._emit(source, entry, tag, item, queue)
+        self._feed_done(source, feed, None)
+
+    def _select_entries(self, source: FeedSource, feed: Any, limit: Optional[int]) -> List[dict]:
+        """Entries of a fetched feed to ingest; subclasses can drop ones they have already seen."""
+        return self.ingestor._feed_entries(feed, limit)
+
+    def _entry_done(self, source: FeedSource, entry: dict) -> None:
+        """Called once an entry is ingested or skipped as a duplicate (not when it failed)."""
+
+    def _feed_done(self, source: FeedSource, feed: Optional[Any], error: Optional[Exception]) -> None:
+        """Called once a feed's entries are all done, or with the error that stopped it."""
+
+    async def _run_entry(
+        self,
+        source: FeedSource,
+        feed: Any,
+        entry: dict,
+        tag: Dict[str, Any],
+        limiter: HostLimiter,
+        executor: ThreadPoolExecutor,
+        queue: "asyncio.Queue[Any]",
+        hold: bool = False,
+    ) -> Optional[Tuple[dict, IngestedItem]]:
+        """Fetch and process one entry; with `hold`, return the item for `_run_feed` to finish and emit."""
+        loop = asyncio.get_running_loop()
+        link = entry.get("link")
+        try:
+            delay = await self._gate(link, limiter, executor)
+        except RobotsDisallowed:
+            self._stats["robots_blocked"] += 1
+            return None
+        try:
+            async with limiter.slot(link, delay):
+                text = await loop.run_in_executor(executor, self.ingestor._extract_html, link)
+            item = await loop.run_in_executor(executor, self.ingestor._process_entry, feed, entry, text)
+        except Exception as exc:
+            self._stats["articles_failed"] += 1
+            await queue.put({**tag, "url": link, "error": {"message": str(exc), "type": type(exc).__name__}})
+            return None
+        if item is None:
+            self._entry_done(source, entry)
+            self._stats["duplicates_skipped"] += 1
+            return None
+        if hold:
+            return entry, item
+        await self._emit(source, entry, tag, item, queue)
+        return None
+
+    async def _emit(
+        self, source: FeedSource, entry: dict, tag: Dict[str, Any], item: IngestedItem, queue: "asyncio.Queue[Any]"
+    ) -> None:
+        self._entry_done(source, entry)
+        self._stats["items"] += 1
+        await queue.put({**tag, **item.to_dict()})
+
+
+__all__ = [
+    "FeedSource",
+    "HostLimiter",
+    "MultiFeedIngestor",
+    "RobotsCache",
+    "RobotsDisallowed",
+    "feed_source",
+    "read_feed_list",
+]
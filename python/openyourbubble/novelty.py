@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+_TOKENS = re.compile(r"[^\W\d_]{3,}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    category TEXT PRIMARY KEY,
+    documents INTEGER NOT NULL,
+    df BLOB NOT NULL,
+    centroid BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+DIMENSIONS = 1 << 18
+
+
+@lru_cache(maxsize=262_144)
+def _bucket(token: str) -> int:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % DIMENSIONS
+
+
+@dataclass
+class CategoryStats:
+    """Document frequencies and the decayed TF-IDF centroid of one category.
+
+    Both are sparse: ``(sorted feature ids, values)`` pairs over the hashed
+    feature space.
+    """
+
+    documents: int
+    df_ids: Any
+    df_counts: Any
+    centroid_ids: Any
+    centroid_values: Any
+
+    @classmethod
+    def empty(cls) -> "CategoryStats":
+        import numpy as np
+
+        ids = np.zeros(0, dtype=np.uint32)
+        return cls(0, ids, np.zeros(0, dtype=np.uint32), ids, np.zeros(0, dtype=np.float32))
+
+    def encode(self) -> Tuple[bytes, bytes]:
+        return (
+            self.df_ids.astype("<u4").tobytes() + self.df_counts.astype("<u4").tobytes(),
+            self.centroid_ids.astype("<u4").tobytes() + self.centroid_values.astype("<f4").tobytes(),
+        )
+
+    @classmethod
+    def decode(cls, documents: int, df: bytes, centroid: bytes) -> "CategoryStats":
+        import numpy as np
+
+        df_half, centroid_half = len(df) // 2, len(centroid) // 2
+        return cls(
+            documents,
+            np.frombuffer(df[:df_half], dtype="<u4").astype(np.uint32),
+            np.frombuffer(df[df_half:], dtype="<u4").astype(np.uint32),
+            np.frombuffer(centroid[:centroid_half], dtype="<u4").astype(np.uint32),
+            np.frombuffer(centroid[centroid_half:], dtype="<f4").astype(np.float32),
+        )
+
+
+@dataclass
+class NoveltyResult:
+    """Novelty of one item: ``1 - cosine`` to each category centroid, `None` while a category is too new."""
+
+    score: Optional[float]
+    categories: Dict[str, Optional[float]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {"novelty": self.score, "categories": self.categories}
+
+
+def _lookup(ids: Any, values: Any, keys: Any, default: float = 0.0) -> Any:
+    """Values for `keys` in a sparse ``(sorted ids, values)`` vector."""
+    import numpy as np
+
+    if not len(ids):
+        return np.full(len(keys), default, dtype=np.float64)
+    slots = np.minimum(np.searchsorted(ids, keys), len(ids) - 1)
+    found = ids[slots] == keys
+    return np.where(found, values[slots], default)
+
+
+def _merge(ids: Any, values: Any, new_ids: Any, new_values: Any) -> Tuple[Any, Any]:
+    """Sum two sparse vectors."""
+    import numpy as np
+
+    merged, inverse = np.unique(np.concatenate((ids, new_ids)), return_inverse=True)
+    totals = np.bincount(inverse, weights=np.concatenate((values, new_values)), minlength=len(merged))
+    return merged.astype(np.uint32), totals
+
+
+class NoveltyScorer:
+    """Scores items by TF-IDF cosine distance from their categories' recent centroids.
+
+    Text is tokenised into words of three or more letters and feature-hashed
+    into `DIMENSIONS` columns of a SciPy CSR matrix with sublinear term
+    frequencies. Each category keeps incremental document frequencies and a
+    centroid of its items' L2-normalised TF-IDF vectors, decayed so an item's
+    weight halves every `half_life` later items and pruned to the
+    `centroid_size` heaviest features. A batch is scored against the
+    centroids as they stood before it, then folded into them.
+
+    Statistics live in memory and are written to an optional SQLite file by
+    `flush`, so a store carries across ingest cycles.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        *,
+        half_life: float = 200.0,
+        centroid_size: int = 4096,
+        min_documents: int = 5,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.half_life = max(1.0, half_life)
+        self.centroid_size = max(1, centroid_size)
+        self.min_documents = max(1, min_documents)
+        self._categories: Dict[str, CategoryStats] = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        self._stats = {"scored": 0, "cold": 0, "batches": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'dimensions'").fetchone()
+            if row is None:
+                self._conn.execute("INSERT INTO meta (name, value) VALUES ('dimensions', ?)", (str(DIMENSIONS),))
+            elif int(row[0]) != DIMENSIONS:
+                raise ValueError(f"{self.path} was built with {row[0]} feature dimensions, expected {DIMENSIONS}")
+
+    def _category(self, name: str) -> CategoryStats:
+        stats = self._categories.get(name)
+        if stats is None:
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT documents, df, centroid FROM categories WHERE category = ?", (name,)
+                ).fetchone()
+            stats = CategoryStats.decode(*row) if row else CategoryStats.empty()
+            self._categories[name] = stats
+        return stats
+
+    def vectorize(self, texts: Sequence[str]) -> Any:
+        """CSR matrix of sublinear term frequencies, one row per text."""
+        import numpy as np
+        from scipy import sparse
+
+        rows: List[Any] = []
+        columns: List[Any] = []
+        for row, text in enumerate(texts):
+            buckets = [_bucket(token) for token in _TOKENS.findall((text or "").lower())]
+            columns.append(np.array(buckets, dtype=np.int64))
+            rows.append(np.full(len(buckets), row, dtype=np.int64))
+        row_ids = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        column_ids = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(row_ids), dtype=np.float64), (row_ids, column_ids)), shape=(len(texts), DIMENSIONS)
+        )
+        matrix.sum_duplicates()
+        np.log1p(matrix.data, out=matrix.data)
+        return matrix
+
+    def score_many(
+        self,
+        items: Sequence[Tuple[str, Sequence[str]]],
+        *,
+        update: bool = True,
+    ) -> List[NoveltyResult]:
+        """Score ``(text, categories)`` pairs; with `update`, fold them into the category statistics."""
+        import numpy as np
+
+        results = [NoveltyResult(None) for _ in items]
+        if not items:
+            return results
+        matrix = self.vectorize([text for text, _ in items])
+        members: Dict[str, List[int]] = {}
+        for row, (_, categories) in enumerate(items):
+            for category in dict.fromkeys(categories):
+                members.setdefault(category, []).append(row)
+        with self._lock:
+            for category, rows in members.items():
+                stats = self._category(category)
+                block = matrix[rows]
+                weighted = self._tfidf(block, stats)
+                if stats.documents >= self.min_documents and len(stats.centroid_ids):
+                    centroid = _lookup(stats.centroid_ids, stats.centroid_values, weighted.indices)
+                    norm = float(np.linalg.norm(stats.centroid_values)) or 1.0
+                    owners = np.repeat(np.arange(len(rows)), np.diff(weighted.indptr))
+                    dots = np.bincount(owners, weights=weighted.data * centroid, minlength=len(rows))
+                    distances = 1.0 - dots / norm
+                    for row, distance in zip(rows, distances):
+                        results[row].categories[category] = round(float(np.clip(distance, 0.0, 1.0)), 4)
+                else:
+                    self._stats["cold"] += len(rows)
+                    for row in rows:
+                        results[row].categories[category] = None
+                if update:
+                    self._fold(category, stats, block, weighted)
+            self._stats["scored"] += len(items)
+            self._stats["batches"] += 1
+        for result in results:
+            known = [value for value in result.categories.values() if value is not None]
+            # An item is only as novel as its closest category.
+            result.score = min(known) if known else None
+        return results
+
+    def _tfidf(self, block: Any, stats: CategoryStats) -> Any:
+        import numpy as np
+        from scipy import sparse
+
+        df = _lookup(stats.df_ids, stats.df_counts, block.indices)
+        weighted = block.copy()
+        weighted.data = block.data * (np.log((1.0 + stats.documents) / (1.0 + df)) + 1.0)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return (sparse.diags(1.0 / norms) @ weighted).tocsr()
+
+    def _fold(self, category: str, stats: CategoryStats, block: Any, weighted: Any) -> None:
+        import numpy as np
+
+        count = block.shape[0]
+        present, counts = np.unique(block.indices, return_counts=True)
+        stats.df_ids, df = _merge(stats.df_ids, stats.df_counts, present.astype(np.uint32), counts)
+        stats.df_counts = df.astype(np.uint32)
+
+        keep = 0.5 ** (1.0 / self.half_life)
+        # Item i of n ends up with weight (1 - keep) * keep ** (n - 1 - i).
+        weights = (1.0 - keep) * keep ** np.arange(count - 1, -1, -1, dtype=np.float64)
+        contribution = weighted.T @ weights
+        nonzero = np.flatnonzero(contribution)
+        ids, values = _merge(
+            stats.centroid_ids,
+            stats.centroid_values.astype(np.float64) * keep**count,
+            nonzero.astype(np.uint32),
+            contribution[nonzero],
+        )
+        if len(ids) > self.centroid_size:
+            top = np.sort(np.argpartition(values, -self.centroid_size)[-self.centroid_size :])
+            ids, values = ids[top], values[top]
+        stats.centroid_ids, stats.centroid_values = ids, values.astype(np.float32)
+        stats.documents += count
+        self._dirty.add(category)
+
+    def flush(self) -> int:
+        """Write changed categories to the SQLite file; returns how many were written."""
+        with self._lock:
+            if self._conn is None or not self._dirty:
+                self._dirty.clear()
+                return 0
+            now = time.time()
+            rows = []
+            for category in sorted(self._dirty):
+                stats = self._categories[category]
+                rows.append((category, stats.documents, *stats.encode(), now))
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO categories (category, documents, df, centroid, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self._dirty.clear()
+            return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["categories_loaded"] = len(self._categories)
+            stats["pending_writes"] = len(self._dirty)
+            if self._conn is not None:
+                stats["categories_stored"] = self._conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+__all__ = ["CategoryStats", "NoveltyResult", "NoveltyScorer"]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+_PARAGRAPHS = re.compile(r"\s*\n\s*")
+_SENTENCES = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class Passage:
+    paragraph: int
+    position: int
+    text: str
+
+
+@dataclass
+class PackedArticle:
+    text: str
+    tokens: int
+    source_tokens: int
+    kept: int
+    total: int
+
+    @property
+    def packed(self) -> bool:
+        return self.kept < self.total
+
+
+def split_passages(text: str) -> List[Passage]:
+    passages: List[Passage] = []
+    for paragraph, block in enumerate(_PARAGRAPHS.split(text)):
+        for sentence in _SENTENCES.split(block.strip()):
+            sentence = sentence.strip()
+            if sentence:
+                passages.append(Passage(paragraph, len(passages), sentence))
+    return passages
+
+
+class TokenCounter:
+    """Token counts from the model's own tokenizer, cached per passage.
+
+    The same sentences come back for the suggestion, the brief and every repeat
+    view of an article, so each distinct passage is tokenized once.
+    """
+
+    def __init__(self, tokenize: Callable[[bytes], Sequence[int]], capacity: int = 16384) -> None:
+        self._tokenize = tokenize
+        self.capacity = max(1, capacity)
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, text: str) -> int:
+        data = text.encode("utf-8")
+        digest = hashlib.blake2b(data, digest_size=12).digest()
+        with self._lock:
+            count = self._counts.get(digest)
+            if count is not None:
+                self._counts.move_to_end(digest)
+                self.hits += 1
+                return count
+        count = len(self._tokenize(data))
+        with self._lock:
+            self.misses += 1
+            self._counts[digest] = count
+            while len(self._counts) > self.capacity:
+                self._counts.popitem(last=False)
+        return count
+
+
+def _weights(keywords: Sequence[Tuple[str, float]]) -> Dict[str, float]:
+    # YAKE scores are lower for better phrases; scale them so the best keyword weighs 1.
+    positive = [score for _, score in keywords if score > 0]
+    best = min(positive) if positive else 1.0
+    return {phrase.lower(): min(1.0, best / score) if score > 0 else 1.0 for phrase, score in keywords}
+
+
+def pack_article(
+    text: str,
+    keywords: Sequence[Tuple[str, float]],
+    budget: int,
+    count_tokens: Callable[[str], int],
+) -> PackedArticle:
+    """Keep the passages that carry the most keyword weight per token within `budget`.
+
+    Sentences are scored by the YAKE weight of the keywords they contain, with
+    a bonus for the lede; the best weight-per-token passages are kept greedily
+    and emitted in their original order, paragraph breaks preserved. Passages
+    with no keyword (bylines, newsletter prompts) are dropped even when budget
+    remains. Articles already within the budget are returned unchanged.
+    """
+    passages = split_passages(text)
+    counts = [count_tokens(passage.text) for passage in passages]
+    source_tokens = sum(counts)
+    if source_tokens <= budget:
+        return PackedArticle(text, source_tokens, source_tokens, len(passages), len(passages))
+    weights = _weights(keywords)
+    scores = []
+    for passage in passages:
+        lowered = passage.text.lower()
+        score = sum(weight for phrase, weight in weights.items() if phrase in lowered)
+        if passage.position == 0:
+            score += 1.0
+        scores.append(score)
+    order = sorted(
+        range(len(passages)),
+        key=lambda index: (-scores[index] / max(counts[index], 1), index),
+    )
+    chosen: List[int] = []
+    used = 0
+    for index in order:
+        if scores[index] <= 0:
+            break
+        if used + counts[index] <= budget:
+            chosen.append(index)
+            used += counts[index]
+    if not chosen:
+        # Nothing keyword-bearing fits: fall back to the opening sentences.
+        for index, tokens in enumerate(counts):
+            if used + tokens > budget:
+                break
+            chosen.append(index)
+            used += tokens
+    chosen.sort()
+    paragraphs: List[List[str]] = []
+    last_paragraph = None
+    for index in chosen:
+        passage = passages[index]
+        if passage.paragraph != last_paragraph:
+            paragraphs.append([])
+            last_paragraph = passage.paragraph
+        paragraphs[-1].append(passage.text)
+    packed = "\n".join(" ".join(sentences) for sentences in paragraphs)
+    return PackedArticle(packed, used, source_tokens, len(chosen), len(passages))
+
+
+__all__ = ["PackedArticle", "Passage", "TokenCounter", "pack_article", "split_passages"]
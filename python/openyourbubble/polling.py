@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import calendar
+import heapq
+import sqlite3
+import threading
+import time
+import urllib.error
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from .ingest import Ingestor
+from .multifeed import FeedSource, MultiFeedIngestor
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    next_poll REAL NOT NULL,
+    last_polled REAL,
+    interval REAL,
+    last_published REAL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    polls INTEGER NOT NULL DEFAULT 0,
+    items INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS seen (
+    key TEXT PRIMARY KEY,
+    feed_url TEXT NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS seen_by_age ON seen (seen_at);
+"""
+
+_COLUMNS = (
+    "url",
+    "title",
+    "next_poll",
+    "last_polled",
+    "interval",
+    "last_published",
+    "failures",
+    "last_error",
+    "polls",
+    "items",
+)
+
+
+@dataclass
+class FeedState:
+    url: str
+    title: Optional[str] = None
+    next_poll: float = 0.0
+    last_polled: Optional[float] = None
+    # Average seconds between the feed's entries, from their published dates.
+    interval: Optional[float] = None
+    last_published: Optional[float] = None
+    failures: int = 0
+    last_error: Optional[str] = None
+    polls: int = 0
+    items: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {column: getattr(self, column) for column in _COLUMNS}
+
+
+def entry_keys(feed_url: str, entry: dict) -> List[str]:
+    """Keys an entry is remembered by: its link (across feeds) and its GUID (within its feed)."""
+    keys = []
+    if entry.get("link"):
+        keys.append(f"link:{entry['link']}")
+    if entry.get("id"):
+        keys.append(f"guid:{feed_url}\n{entry['id']}")
+    return keys
+
+
+def _published(entry: dict) -> Optional[float]:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return float(calendar.timegm(parsed)) if parsed else None
+
+
+class FeedStateStore:
+    """Per-feed polling state and the keys of every entry already ingested, in SQLite.
+
+    Seen keys are refreshed whenever their entry is still listed in its feed,
+    so `prune` only forgets entries that have dropped out of every feed.
+    Without a `path` the store lives in memory for the life of the process.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path else ":memory:", check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[FeedState]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM feeds WHERE url = ?", (url,)).fetchone()
+        return FeedState(*row) if row else None
+
+    def all(self) -> List[FeedState]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM feeds ORDER BY url").fetchall()
+        return [FeedState(*row) for row in rows]
+
+    def put(self, state: FeedState) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO feeds ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                tuple(getattr(state, column) for column in _COLUMNS),
+            )
+
+    def seen(self, keys: Sequence[str], now: float) -> set:
+        """The subset of `keys` already ingested; their last-seen time is moved to `now`."""
+        found: set = set()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start : start + 500])
+                marks = ", ".join("?" * len(chunk))
+                found.update(
+                    key for (key,) in self._conn.execute(f"SELECT key FROM seen WHERE key IN ({marks})", chunk)
+                )
+                self._conn.execute(f"UPDATE seen SET seen_at = ? WHERE key IN ({marks})", [now, *chunk])
+        return found
+
+    def mark_seen(self, feed_url: str, keys: Sequence[str], now: float) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (key, feed_url, seen_at) VALUES (?, ?, ?)",
+                [(key, feed_url, now) for key in keys],
+            )
+
+    def prune(self, before: float) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (before,)).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            feeds, failing = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(failures > 0), 0) FROM feeds"
+            ).fetchone()
+            seen = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        return {"feeds": feeds, "failing": failing, "seen_entries": seen}
+
+
+def _host_error(error: Exception) -> bool:
+    """Whether a feed error says the host itself is unwell rather than this one feed."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, urllib.error.URLError, TimeoutError)):
+        return True
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+class _PollingFetcher(MultiFeedIngestor):
+    """`MultiFeedIngestor` that only ingests unseen entries and reports each poll to its daemon."""
+
+    def __init__(self, daemon: "IngestDaemon", ingestor: Ingestor, **options: Any) -> None:
+        super().__init__(ingestor, **options)
+        self.daemon = daemon
+
+    def _select_entries(self, source: FeedSource, feed: Any, limit: Optional[int]) -> List[dict]:
+        return self.daemon._unseen(source.url, self.ingestor._feed_entries(feed), limit)
+
+    def _entry_done(self, source: FeedSource, entry: dict) -> None:
+        self.daemon._ingested(source.url, entry)
+
+    def _feed_done(self, source: FeedSource, feed: Optional[Any], error: Optional[Exception]) -> None:
+        self.daemon._polled(source, feed, error)
+
+
+class IngestDaemon:
+    """Poll feeds on their own schedule instead of all of them every cycle.
+
+    Each feed's next poll sits in a heap keyed by due time. A successful poll
+    re-estimates the feed's publish interval from its entries' published
+    dates (a moving average across polls) and schedules the next poll
+    `poll_factor` of an interval later; a feed that has gone quiet for
+    longer than its interval is stretched towards half the quiet spell.
+    Delays are clamped to ``[min_interval, max_interval]``. A failing feed
+    backs off exponentially from `min_interval` up to `max_backoff`; when
+    the failure says the host is down (connection errors, timeouts, 429 or
+    5xx), every feed on that host waits out the same backoff.
+
+    Entries whose link or GUID was already ingested are skipped before any
+    article is fetched. Fetching goes through `MultiFeedIngestor`, so the
+    global and per-host caps, rate limit and robots.txt rules apply to each
+    round of due feeds. State lives in a `FeedStateStore` and survives
+    restarts; `clock` and `sleep` can be replaced to drive the daemon on
+    simulated time.
+    """
+
+    def __init__(
+        self,
+        ingestor: Ingestor,
+        state: Optional[FeedStateStore] = None,
+        *,
+        concurrency: int = 16,
+        per_host: int = 2,
+        rate: float = 1.0,
+        robots: bool = True,
+        limit: Optional[int] = 20,
+        min_interval: float = 300,
+        max_interval: float = 86400,
+        default_interval: float = 3600,
+        poll_factor: float = 0.5,
+        max_backoff: float = 86400,
+        retention: float = 30 * 86400,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.state = state or FeedStateStore()
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.default_interval = default_interval
+        self.poll_factor = poll_factor
+        self.max_backoff = max_backoff
+        self.retention = retention
+        self.clock = clock
+        self.sleep = sleep
+        self.fetcher = _PollingFetcher(
+            self, ingestor, concurrency=concurrency, per_host=per_host, rate=rate, robots=robots, limit=limit
+        )
+        self._heap: List[Tuple[float, int, str]] = []
+        self._scheduled: Dict[str, float] = {}
+        self._sources: Dict[str, FeedSource] = {}
+        self._counter = 0
+        self._hosts: Dict[str, Tuple[int, float]] = {}
+        self._round: Dict[str, Any] = {}
+        self._now = 0.0
+        self._stats = {
+            "rounds": 0,
+            "polls": 0,
+            "polls_failed": 0,
+            "items": 0,
+            "entries_seen": 0,
+            "host_deferrals": 0,
+        }
+
+    def add_feeds(self, sources: Iterable[FeedSource]) -> None:
+        """Schedule `sources`; feeds new to the store are due now, known ones keep their next poll."""
+        now = self.clock()
+        for source in sources:
+            state = self.state.get(source.url)
+            if state is None:
+                state = FeedState(url=source.url, title=source.title, next_poll=now)
+                self.state.put(state)
+            self._sources[source.url] = source
+            self._schedule(source.url, state.next_poll)
+
+    def load(self) -> None:
+        """Schedule every feed in the store."""
+        self.add_feeds(FeedSource(url=state.url, title=state.title) for state in self.state.all())
+
+    def _schedule(self, url: str, due: float) -> None:
+        # Superseded heap entries stay behind and are skipped when popped.
+        self._scheduled[url] = due
+        self._counter += 1
+        heapq.heappush(self._heap, (due, self._counter, url))
+
+    def next_due(self) -> Optional[float]:
+        while self._heap:
+            due, _, url = self._heap[0]
+            if self._scheduled.get(url) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def poll_due(self, now: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Poll every feed due by `now` in one round, yielding NDJSON lines as they complete."""
+        now = self.clock() if now is None else now
+        due: List[FeedSource] = []
+        while self.next_due() is not None and self._heap[0][0] <= now:
+            _, _, url = heapq.heappop(self._heap)
+            del self._scheduled[url]
+            _, until = self._hosts.get(urlsplit(url).netloc.lower(), (0, 0.0))
+            if until > now:
+                self._stats["host_deferrals"] += 1
+                self._schedule(url, until)
+                continue
+            due.append(self._sources[url])
+        if not due:
+            return
+        self._now = now
+        self._round = {source.url: 0 for source in due}
+        self._stats["rounds"] += 1
+        yield from self.fetcher.iter_ingest(due)
+        self.state.prune(now - self.retention)
+
+    def run(self, once: bool = False) -> Iterator[Dict[str, Any]]:
+        """Poll feeds as they fall due, forever; with `once`, only those due now."""
+        while True:
+            due = self.next_due()
+            if due is None:
+                return
+            wait = due - self.clock()
+            if wait > 0:
+                if once:
+                    return
+                self.sleep(wait)
+            yield from self.poll_due()
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["scheduled"] = len(self._scheduled)
+        stats["next_due"] = self.next_due()
+        stats["store"] = self.state.stats()
+        if self.fetcher.robots is not None:
+            stats["robots"] = self.fetcher.robots.stats()
+        return stats
+
+    def _unseen(self, feed_url: str, entries: List[dict], limit: Optional[int]) -> List[dict]:
+        keys = [entry_keys(feed_url, entry) for entry in entries]
+        seen = self.state.seen([key for entry in keys for key in entry], self._now)
+        fresh = [entry for entry, entry_key in zip(entries, keys) if not seen.intersection(entry_key)]
+        self._stats["entries_seen"] += len(entries) - len(fresh)
+        return fresh[: max(0, limit)] if limit is not None else fresh
+
+    def _ingested(self, feed_url: str, entry: dict) -> None:
+        self.state.mark_seen(feed_url, entry_keys(feed_url, entry), self._now)
+        self._round[feed_url] = self._round.get(feed_url, 0) + 1
+
+    def _polled(self, source: FeedSource, feed: Optional[Any], error: Optional[Exception]) -> None:
+        now = self._now
+        state = self.state.get(source.url) or FeedState(url=source.url, title=source.title)
+        state.polls += 1
+        state.last_polled = now
+        host = urlsplit(source.url).netloc.lower()
+        self._stats["polls"] += 1
+        if error is not None:
+            self._stats["polls_failed"] += 1
+            state.failures += 1
+            state.last_error = f"{type(error).__name__}: {error}"
+            delay = self._backoff(state.failures)
+            if _host_error(error):
+                failures = self._hosts.get(host, (0, 0.0))[0] + 1
+                delay = max(delay, self._backoff(failures))
+                self._hosts[host] = (failures, now + delay)
+        else:
+            state.failures = 0
+            state.last_error = None
+            self._hosts.pop(host, None)
+            new_items = self._round.get(source.url, 0)
+            state.items += new_items
+            self._stats["items"] += new_items
+            state.title = feed.feed.get("title") or state.title
+            self._observe(state, feed, new_items, now)
+            delay = self._delay(state, now)
+        state.next_poll = now + delay
+        self.state.put(state)
+        self._schedule(source.url, state.next_poll)
+
+    def _observe(self, state: FeedState, feed: Any, new_items: int, now: float) -> None:
+        published = sorted({stamp for stamp in map(_published, feed.entries) if stamp is not None and stamp <= now})
+        observed = None
+        if len(published) >= 2:
+            observed = (published[-1] - published[0]) / (len(published) - 1)
+        elif new_items and state.last_published is not None:
+            # Undated entries: the time since new ones last appeared stands in for the interval.
+            observed = now - state.last_published
+        if published:
+            state.last_published = max(published[-1], state.last_published or 0.0)
+        elif new_items:
+            state.last_published = now
+        if observed is not None and observed > 0:
+            state.interval = observed if state.interval is None else (state.interval + observed) / 2
+
+    def _delay(self, state: FeedState, now: float) -> float:
+        interval = state.interval or self.default_interval
+        if state.last_published is not None:
+            interval = max(interval, (now - state.last_published) / 2)
+        return min(self.max_interval, max(self.min_interval, interval * self.poll_factor))
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.max_backoff, self.min_interval * 2 ** min(failures - 1, 32))
+
+
+__all__ = ["FeedState", "FeedStateStore", "IngestDaemon", "entry_keys"]
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
 from .categories import CategoryGraph, load_graph
 from .llm import MaybeModel
-from .study import extract_keywords
+from .keywords import extract_keywords
+from .streaming import StreamAborted
+
+if TYPE_CHECKING:
+    from .study import StudySuggestion
+
+# Study fields the model generates and the brief fields they become.
+_BRIEF_FIELDS = {
+    "questions": "key_points",
+    "presentation_prompt": "creative_hook",
+    "impact_hints": "pitch_outline",
+    "presentation_question": "canvas_prompt",
+}
 
 
 @dataclass
@@ -39,9 +51,11 @@ class ProfessionalBriefing:
         self,
         graph: Optional[CategoryGraph] = None,
         model: Optional[MaybeModel] = None,
+        keyword_engine: Optional[str] = None,
     ) -> None:
         self.graph = graph or load_graph()
         self.model = model or MaybeModel()
+        self.keyword_engine = keyword_engine
 
     def _persona_vibe(self, persona: str) -> str:
         return {
@@ -99,13 +113,11 @@ class ProfessionalBriefing:
         article_text: str,
         persona: str = "strategist",
         mode: str = "quen-3.4b",
+        keywords: Optional[List[str]] = None,
     ) -> ProfessionalBrief:
-        keywords = extract_keywords(article_text)
-        category_node = self.graph.get(category)
-        category_label = category_node.label if category_node else category
-        spotlight = keywords[0].strip() if keywords else topic
-        palette = self._palette_from_keywords(keywords)
-
+        if keywords is None:
+            keywords = extract_keywords(article_text, engine=self.keyword_engine)
+        enriched = None
         if self.model.available(mode):
             enriched = self.model.generate_study(
                 topic=topic,
@@ -113,20 +125,67 @@ class ProfessionalBriefing:
                 article_text=article_text,
                 mode=mode,
             )
-            if enriched:
-                effective_spotlight = enriched.spotlight_subject or f"{category_label} · {spotlight}"
-                return ProfessionalBrief(
-                    topic=topic,
-                    category=category_label,
-                    key_points=enriched.questions,
-                    creative_hook=enriched.presentation_prompt,
-                    pitch_outline=enriched.impact_hints,
-                    visual_mood=self._visual_mood(effective_spotlight, persona, palette),
-                    palette_ideas=palette,
-                    canvas_prompt=enriched.presentation_question
-                    or self._canvas_prompt(effective_spotlight, persona, keywords),
-                    method="quen",
-                )
+        return self._compose(
+            topic=topic, category=category, keywords=keywords, persona=persona, enriched=enriched
+        )
+
+    def brief_stream(
+        self,
+        *,
+        topic: str,
+        category: str,
+        article_text: str,
+        persona: str = "strategist",
+        mode: str = "quen-3.4b",
+    ) -> Iterator[Dict[str, Any]]:
+        """Like `brief`, but yields model fields (under their brief names) as they are generated."""
+        keywords = extract_keywords(article_text, engine=self.keyword_engine)
+        enriched = None
+        if self.model.available(mode):
+            fields: Dict[str, Any] = {}
+            try:
+                for key, value in self.model.stream_study(
+                    topic=topic, keywords=keywords, article_text=article_text, mode=mode
+                ):
+                    fields[key] = value
+                    yield {"event": "field", "field": _BRIEF_FIELDS.get(key, key), "value": value}
+            except StreamAborted as exc:
+                yield {"event": "fallback", "reason": str(exc)}
+            else:
+                enriched = self.model.from_payload(fields) if fields else None
+        result = self._compose(
+            topic=topic, category=category, keywords=keywords, persona=persona, enriched=enriched
+        )
+        yield {"event": "result", "result": result}
+
+    def _compose(
+        self,
+        *,
+        topic: str,
+        category: str,
+        keywords: List[str],
+        persona: str,
+        enriched: Optional[StudySuggestion],
+    ) -> ProfessionalBrief:
+        category_node = self.graph.get(category)
+        category_label = category_node.label if category_node else category
+        spotlight = keywords[0].strip() if keywords else topic
+        palette = self._palette_from_keywords(keywords)
+
+        if enriched:
+            effective_spotlight = enriched.spotlight_subject or f"{category_label} · {spotlight}"
+            return ProfessionalBrief(
+                topic=topic,
+                category=category_label,
+                key_points=enriched.questions,
+                creative_hook=enriched.presentation_prompt,
+                pitch_outline=enriched.impact_hints,
+                visual_mood=self._visual_mood(effective_spotlight, persona, palette),
+                palette_ideas=palette,
+                canvas_prompt=enriched.presentation_question
+                or self._canvas_prompt(effective_spotlight, persona, keywords),
+                method="quen",
+            )
 
         persona_angle = {
             "strategist": "Highlight strategic leverage and risk mitigation",
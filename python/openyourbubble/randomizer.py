@@ -1,32 +1,47 @@
 from __future__ import annotations
 
+import heapq
 import random
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from .categories import CategoryGraph, load_graph
+from .categories import Category, CategoryGraph, load_graph
+
+PoolKey = Tuple[Optional[str], Optional[bool]]
 
 
 class Randomizer:
     def __init__(self, graph: Optional[CategoryGraph] = None) -> None:
         self.graph = graph or load_graph()
+        self._pools: Dict[PoolKey, List[Category]] = {}
+        self._paths: Dict[str, List[str]] = {}
 
-    def pick_subject(self, group: Optional[str] = None, professional: Optional[bool] = None) -> dict:
-        if group:
-            pool = self.graph.by_group(group, professional=professional)
-        else:
-            pool = [
-                cat
-                for cat in self.graph.all()
-                if professional is None or cat.professional is professional
-            ]
-        if not pool:
-            raise ValueError("no categories available for the selected filters")
-        choice = random.choice(pool)
-        lineage = []
-        for parent_slug in choice.parents:
-            parent = self.graph.get(parent_slug)
-            if parent:
-                lineage.append(parent.label)
+    def _pool(self, group: Optional[str], professional: Optional[bool]) -> List[Category]:
+        key = (group or None, professional)
+        pool = self._pools.get(key)
+        if pool is None:
+            if group:
+                pool = self.graph.by_group(group, professional=professional)
+            else:
+                pool = [
+                    cat
+                    for cat in self.graph.all()
+                    if professional is None or cat.professional is professional
+                ]
+            self._pools[key] = pool
+        return pool
+
+    def _path(self, choice: Category) -> List[str]:
+        lineage = self._paths.get(choice.slug)
+        if lineage is None:
+            lineage = []
+            for parent_slug in choice.parents:
+                parent = self.graph.get(parent_slug)
+                if parent:
+                    lineage.append(parent.label)
+            self._paths[choice.slug] = lineage
+        return lineage
+
+    def _describe(self, choice: Category) -> dict:
         return {
             "slug": choice.slug,
             "label": choice.label,
@@ -34,5 +49,65 @@ class Randomizer:
             "tags": choice.tags,
             "professional": choice.professional,
             "parents": choice.parents,
-            "path": lineage,
+            "path": list(self._path(choice)),
         }
+
+    def pick_subject(self, group: Optional[str] = None, professional: Optional[bool] = None) -> dict:
+        pool = self._pool(group, professional)
+        if not pool:
+            raise ValueError("no categories available for the selected filters")
+        return self._describe(random.choice(pool))
+
+    def pick_subjects(
+        self,
+        n: int,
+        *,
+        group: Optional[str] = None,
+        professional: Optional[bool] = None,
+        unique: bool = True,
+        seed: Optional[int] = None,
+        recent: Iterable[str] = (),
+        recent_weight: float = 0.25,
+    ) -> List[dict]:
+        """Draw `n` subjects in one call, e.g. to fill a deck page.
+
+        Slugs listed in `recent` are drawn with weight `recent_weight` instead of
+        1, so recently shown subjects still appear but less often. With
+        `unique`, at most one draw per subject is returned (fewer than `n` when
+        the pool is smaller).
+        """
+        pool = self._pool(group, professional)
+        if not pool:
+            raise ValueError("no categories available for the selected filters")
+        rng = random.Random(seed) if seed is not None else random
+        recent_slugs = set(recent)
+        if not recent_slugs or recent_weight == 1:
+            if unique:
+                picks = rng.sample(pool, min(n, len(pool)))
+            else:
+                picks = rng.choices(pool, k=n)
+        elif unique and 0 < recent_weight < 1 and n * 4 <= len(pool):
+            # Small batch from a large pool: rejection sampling keeps each draw O(1)
+            # and matches successive weighted sampling without replacement.
+            chosen: Dict[int, None] = {}
+            while len(chosen) < n:
+                index = rng.randrange(len(pool))
+                if index in chosen:
+                    continue
+                if pool[index].slug in recent_slugs and rng.random() >= recent_weight:
+                    continue
+                chosen[index] = None
+            picks = [pool[index] for index in chosen]
+        else:
+            weights = [recent_weight if cat.slug in recent_slugs else 1.0 for cat in pool]
+            if unique:
+                # Efraimidis-Spirakis: the n largest u ** (1 / w) keys form a weighted sample without replacement.
+                keyed = (
+                    (rng.random() ** (1.0 / weight), index)
+                    for index, weight in enumerate(weights)
+                    if weight > 0
+                )
+                picks = [pool[index] for _, index in heapq.nlargest(n, keyed)]
+            else:
+                picks = rng.choices(pool, weights=weights, k=n)
+        return [self._describe(choice) for choice in picks]
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+ResponseKey = Tuple[str, str, str]
+
+# GGUF files run to several GB; the fingerprint hashes the size plus the head
+# (header, metadata, vocab) and tail of the file instead of every byte.
+_FINGERPRINT_SPAN = 8 * 1024 * 1024
+_fingerprints: Dict[Tuple[str, int, int], str] = {}
+
+
+def model_fingerprint(model_path: Union[str, Path]) -> str:
+    path = str(model_path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return hashlib.blake2b(f"path\0{path}".encode("utf-8"), digest_size=16).hexdigest()
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _fingerprints.get(key)
+    if digest is None:
+        hasher = hashlib.blake2b(str(stat.st_size).encode("ascii"), digest_size=16)
+        with open(path, "rb") as handle:
+            hasher.update(handle.read(_FINGERPRINT_SPAN))
+            if stat.st_size > 2 * _FINGERPRINT_SPAN:
+                handle.seek(-_FINGERPRINT_SPAN, os.SEEK_END)
+                hasher.update(handle.read(_FINGERPRINT_SPAN))
+        digest = hasher.hexdigest()
+        _fingerprints[key] = digest
+    return digest
+
+
+def prompt_digest(prompt: str, **settings: Any) -> str:
+    """Digest of the prompt text and the decoding settings that shape the output."""
+    extras = json.dumps(settings, sort_keys=True)
+    return hashlib.blake2b(f"{extras}\0{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Parsed model responses keyed by ``(model fingerprint, mode, prompt digest)``.
+
+    An in-process LRU of `capacity` entries sits over an optional SQLite file,
+    so repeated study suggestions or briefs for the same article, topic and
+    mode reuse the first generation instead of running the model again.
+    """
+
+    def __init__(self, capacity: int = 256, path: Optional[Union[str, Path]] = None) -> None:
+        self.capacity = max(0, capacity)
+        self.path = Path(path) if path else None
+        self._memory: "OrderedDict[ResponseKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stored": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (model_hash TEXT NOT NULL, mode TEXT NOT NULL,"
+                " prompt_hash TEXT NOT NULL, payload TEXT NOT NULL, generation_ms REAL NOT NULL,"
+                " created_at REAL NOT NULL, PRIMARY KEY (model_hash, mode, prompt_hash))"
+            )
+
+    def _remember(self, key: ResponseKey, payload: Dict[str, Any]) -> None:
+        if not self.capacity:
+            return
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get(self, key: ResponseKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return dict(payload)
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT payload FROM responses WHERE model_hash = ? AND mode = ? AND prompt_hash = ?", key
+                ).fetchone()
+                if row is not None:
+                    payload = json.loads(row[0])
+                    self._remember(key, payload)
+                    self._stats["disk_hits"] += 1
+                    return dict(payload)
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: ResponseKey, payload: Dict[str, Any], generation_ms: float = 0.0) -> None:
+        with self._lock:
+            self._remember(key, dict(payload))
+            self._stats["stored"] += 1
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses"
+                    " (model_hash, mode, prompt_hash, payload, generation_ms, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, json.dumps(payload, ensure_ascii=False), generation_ms, time.time()),
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            if self._conn is not None:
+                stats["disk_entries"] = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def response_cache() -> ResponseCache:
+    """Process-wide cache; `OYB_RESPONSE_CACHE` points the persistent tier at a SQLite file."""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(
+            capacity=int(os.environ.get("OYB_RESPONSE_CACHE_SIZE", "256")),
+            path=os.environ.get("OYB_RESPONSE_CACHE") or None,
+        )
+    return _cache
+
+
+def configure_response_cache(cache: Optional[ResponseCache]) -> None:
+    global _cache
+    _cache = cache
+
+
+__all__ = [
+    "ResponseCache",
+    "configure_response_cache",
+    "model_fingerprint",
+    "prompt_digest",
+    "response_cache",
+]
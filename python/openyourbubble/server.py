@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO
+
+from . import timing
+from .service import IngestOptions, Toolkit
+
+
+class ToolServer:
+    """Newline-delimited JSON-RPC worker over a pair of text streams.
+
+    Each request is one JSON object per line::
+
+        {"id": 1, "method": "study-suggest", "params": {"topic": "...", "category": "...", "text": "..."}}
+
+    and each response is written as a single line carrying the same ``id`` with
+    either a ``result`` (identical to the CLI JSON output) or an ``error``.
+    With ``"stream": true`` in its params, ``study-suggest`` and
+    ``professional-brief`` first write ``{"id", "event"}`` lines for each model
+    field as it is generated, then the usual ``result`` line.
+
+    With ``"profile": true`` in its params, a response also carries the
+    request's per-stage ``timings`` (on the final ``result`` or ``error`` line
+    of a streamed request). Started with ``OYB_PROFILE=1``, the worker
+    keeps process-wide totals that the ``timings`` method returns (and clears
+    with ``"reset": true``) for latency dashboards.
+    """
+
+    def __init__(self, toolkit: Optional[Toolkit] = None) -> None:
+        self.toolkit = toolkit or Toolkit()
+        self._methods: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "ping": lambda params: {"ok": True},
+            "random-subject": self._random_subject,
+            "study-suggest": self._study_suggest,
+            "professional-brief": self._professional_brief,
+            "translate": self._translate,
+            "ingest": self._ingest,
+            "ingest-many": self._ingest_many,
+            "novelty-score": self._novelty_score,
+            "warmup": self._warmup,
+            "unload": self._unload,
+            "cache-stats": lambda params: self.toolkit.cache_stats(),
+            "timings": lambda params: timing.timings(reset=bool(params.get("reset"))) or {"enabled": False},
+        }
+        self._streams: Dict[str, Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]]] = {
+            "study-suggest": lambda params: self.toolkit.study_suggest_stream(**self._study_params(params)),
+            "professional-brief": lambda params: self.toolkit.professional_brief_stream(
+                persona=params.get("persona") or "strategist", **self._study_params(params)
+            ),
+        }
+
+    def _param(self, params: Dict[str, Any], key: str) -> Any:
+        value = params.get(key)
+        if value is None or value == "":
+            raise ValueError(f"missing parameter: {key}")
+        return value
+
+    def _require_text(self, params: Dict[str, Any]) -> str:
+        text = params.get("text")
+        if not text and params.get("article_path"):
+            text = Path(params["article_path"]).read_text(encoding="utf-8")
+        if not text or not str(text).strip():
+            raise ValueError("Article text required via text or article_path")
+        return str(text).strip()
+
+    def _model_path(self, params: Dict[str, Any]) -> Optional[Path]:
+        value = params.get("model_path")
+        return Path(value) if value else None
+
+    def _random_subject(self, params: Dict[str, Any]) -> Any:
+        count = int(params.get("count") or 1)
+        if count != 1 or params.get("seed") is not None or params.get("recent"):
+            recent = params.get("recent") or []
+            subjects = self.toolkit.random_subjects(
+                count=count,
+                group=params.get("group"),
+                professional=bool(params.get("professional", False)),
+                unique=not params.get("allow_repeats", False),
+                seed=int(params["seed"]) if params.get("seed") is not None else None,
+                recent=recent.split(",") if isinstance(recent, str) else list(recent),
+            )
+            return subjects[0] if count == 1 else subjects
+        return self.toolkit.random_subject(
+            group=params.get("group"),
+            professional=bool(params.get("professional", False)),
+        )
+
+    def _study_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "topic": self._param(params, "topic"),
+            "category": self._param(params, "category"),
+            "text": self._require_text(params),
+            "mode": params.get("mode") or "quen-3.4b",
+            "model_path": self._model_path(params),
+            "keyword_engine": params.get("keyword_engine") or None,
+        }
+
+    def _study_suggest(self, params: Dict[str, Any]) -> Any:
+        return self.toolkit.study_suggest(**self._study_params(params))
+
+    def _professional_brief(self, params: Dict[str, Any]) -> Any:
+        return self.toolkit.professional_brief(
+            persona=params.get("persona") or "strategist", **self._study_params(params)
+        )
+
+    def _translate(self, params: Dict[str, Any]) -> Any:
+        if isinstance(params.get("texts"), list):
+            return self.toolkit.translate_many(
+                texts=[str(text or "") for text in params["texts"]],
+                source_lang=params.get("source_lang"),
+                target_lang=params.get("target_lang") or "en",
+            )
+        text = str(params.get("text") or "").strip()
+        if not text:
+            raise ValueError("Translation text required")
+        return self.toolkit.translate(
+            text=text,
+            source_lang=params.get("source_lang"),
+            target_lang=params.get("target_lang") or "en",
+        )
+
+    def _ingest(self, params: Dict[str, Any]) -> Any:
+        return self.toolkit.ingest(
+            feed_url=self._param(params, "feed_url"),
+            limit=int(params.get("limit", 20)),
+            concurrency=int(params.get("concurrency", 1)),
+            per_host=int(params.get("per_host", 2)),
+            options=IngestOptions.from_params(params),
+        )
+
+    def _ingest_many(self, params: Dict[str, Any]) -> Any:
+        feeds = params.get("feeds")
+        if params.get("feed_list"):
+            from .multifeed import read_feed_list
+
+            feeds = read_feed_list(str(params["feed_list"]), params.get("format"))
+        if not isinstance(feeds, list) or not feeds:
+            raise ValueError("missing parameter: feeds (a list of feed URLs or objects, or feed_list text)")
+        return self.toolkit.ingest_many(
+            feeds=feeds,
+            limit=int(params.get("limit", 20)),
+            concurrency=int(params.get("concurrency", 16)),
+            per_host=int(params.get("per_host", 2)),
+            rate=float(params.get("rate", 1.0)),
+            robots=bool(params.get("robots", True)),
+            options=IngestOptions.from_params(params),
+        )
+
+    def _novelty_score(self, params: Dict[str, Any]) -> Any:
+        options = {
+            "store_path": Path(params["store"]) if params.get("store") else None,
+            "update": bool(params.get("update", True)),
+        }
+        if isinstance(params.get("items"), list):
+            return self.toolkit.novelty_score(items=params["items"], **options)
+        item = {
+            "text": self._require_text(params),
+            "categories": params.get("categories"),
+            "category": params.get("category"),
+        }
+        return self.toolkit.novelty_score(items=[item], **options)[0]
+
+    def _warmup(self, params: Dict[str, Any]) -> Any:
+        return {"ready": self.toolkit.model(self._model_path(params)).warmup()}
+
+    def _unload(self, params: Dict[str, Any]) -> Any:
+        return {"unloaded": self.toolkit.model(self._model_path(params)).unload()}
+
+    def _params(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        params = request.get("params")
+        if params is None:
+            return {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be a JSON object")
+        return {str(key).replace("-", "_"): value for key, value in params.items()}
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = request.get("id")
+        method = str(request.get("method") or "").replace("_", "-")
+        handler = self._methods.get(method)
+        if handler is None:
+            return {"id": request_id, "error": {"message": f"unknown method: {method or '<missing>'}"}}
+        try:
+            params = self._params(request)
+        except ValueError as exc:
+            return {"id": request_id, "error": {"message": str(exc)}}
+        if params.get("profile") and method != "timings":
+            with timing.recording() as recorder:
+                response = self._call(request_id, handler, params)
+            response["timings"] = recorder.snapshot()
+            return response
+        return self._call(request_id, handler, params)
+
+    def _call(
+        self, request_id: Any, handler: Callable[[Dict[str, Any]], Any], params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        try:
+            result = handler(params)
+        except Exception as exc:  # surface the failure without killing the worker
+            return {"id": request_id, "error": {"message": str(exc), "type": type(exc).__name__}}
+        return {"id": request_id, "result": result}
+
+    def handle_stream(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Like `handle`, but yields event lines before the result for streaming requests."""
+        method = str(request.get("method") or "").replace("_", "-")
+        stream = self._streams.get(method)
+        try:
+            params = self._params(request)
+        except ValueError:
+            params = {}
+        if not params.get("stream") or stream is None:
+            yield self.handle(request)
+            return
+        request_id = request.get("id")
+        if params.get("profile"):
+            with timing.recording() as recorder:
+                for response in self._stream_events(request_id, stream, params):
+                    if "event" not in response:
+                        response["timings"] = recorder.snapshot()
+                    yield response
+            return
+        yield from self._stream_events(request_id, stream, params)
+
+    def _stream_events(
+        self,
+        request_id: Any,
+        stream: Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]],
+        params: Dict[str, Any],
+    ) -> Iterator[Dict[str, Any]]:
+        try:
+            for event in stream(params):
+                if event["event"] == "result":
+                    yield {"id": request_id, "result": event["result"]}
+                else:
+                    yield {"id": request_id, "event": event}
+        except Exception as exc:  # surface the failure without killing the worker
+            yield {"id": request_id, "error": {"message": str(exc), "type": type(exc).__name__}}
+
+    def serve(self, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout) -> None:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as exc:
+                responses: Iterator[Dict[str, Any]] = iter(
+                    [{"id": None, "error": {"message": f"invalid JSON: {exc}"}}]
+                )
+            else:
+                if not isinstance(request, dict):
+                    responses = iter([{"id": None, "error": {"message": "each request must be a JSON object"}}])
+                elif request.get("method") == "shutdown":
+                    stdout.write(json.dumps({"id": request.get("id"), "result": {"ok": True}}) + "\n")
+                    stdout.flush()
+                    return
+                else:
+                    responses = self.handle_stream(request)
+            for response in responses:
+                stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+                stdout.flush()
+
+
+__all__ = ["ToolServer"]
@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .categories import CategoryGraph, load_graph
+
+if TYPE_CHECKING:  # pragma: no cover - heavy modules load on first use
+    from .cache import HttpCache
+    from .dedup import DedupIndex
+    from .ingest import Ingestor
+    from .llm import MaybeModel
+    from .multifeed import FeedSource, MultiFeedIngestor
+    from .novelty import NoveltyScorer
+    from .polling import IngestDaemon
+    from .professional import ProfessionalBriefing
+    from .randomizer import Randomizer
+    from .study import StudySuggester
+    from .translate import Translator
+
+
+@dataclass(frozen=True)
+class IngestOptions:
+    """Ingestor options shared by `oyb ingest`, `ingest-many` and `ingest-daemon` (CLI and `oyb serve`)."""
+
+    cache_path: Optional[Path] = None
+    keywords: bool = False
+    detect_language: bool = False
+    dedup_path: Optional[Path] = None
+    skip_duplicates: bool = False
+    novelty_path: Optional[Path] = None
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "IngestOptions":
+        """Options from `oyb serve` params, which use the CLI names (``cache``, ``dedup``, ``novelty``)."""
+        return cls(
+            cache_path=Path(params["cache"]) if params.get("cache") else None,
+            keywords=bool(params.get("keywords", False)),
+            detect_language=bool(params.get("detect_language", False)),
+            dedup_path=Path(params["dedup"]) if params.get("dedup") else None,
+            skip_duplicates=bool(params.get("skip_duplicates", False)),
+            novelty_path=Path(params["novelty"]) if params.get("novelty") else None,
+        )
+
+
+class Toolkit:
+    """Shared command implementations backing both the CLI and `oyb serve`.
+
+    A single instance keeps the category graph, suggesters, briefings and
+    translators warm so a long-lived worker only pays their setup once. Each
+    helper imports its module on first use so a command only loads what it needs.
+    """
+
+    def __init__(self, graph: Optional[CategoryGraph] = None) -> None:
+        self.graph = graph or load_graph()
+        self._randomizer: Optional[Randomizer] = None
+        self._models: Dict[Optional[str], MaybeModel] = {}
+        self._suggesters: Dict[Tuple[Optional[str], Optional[str]], StudySuggester] = {}
+        self._briefings: Dict[Tuple[Optional[str], Optional[str]], ProfessionalBriefing] = {}
+        self._translators: Dict[str, Translator] = {}
+        self._caches: Dict[str, HttpCache] = {}
+        self._dedup: Dict[str, DedupIndex] = {}
+        self._novelty: Dict[str, NoveltyScorer] = {}
+
+    def model(self, model_path: Optional[Path] = None) -> MaybeModel:
+        key = str(model_path) if model_path else None
+        model = self._models.get(key)
+        if model is None:
+            from .llm import MaybeModel
+
+            model = MaybeModel(model_path=model_path) if model_path else MaybeModel()
+            self._models[key] = model
+        return model
+
+    def randomizer(self) -> Randomizer:
+        if self._randomizer is None:
+            from .randomizer import Randomizer
+
+            self._randomizer = Randomizer(self.graph)
+        return self._randomizer
+
+    def suggester(self, model_path: Optional[Path] = None, keyword_engine: Optional[str] = None) -> StudySuggester:
+        key = (str(model_path) if model_path else None, keyword_engine)
+        suggester = self._suggesters.get(key)
+        if suggester is None:
+            from .study import StudySuggester
+
+            suggester = StudySuggester(
+                graph=self.graph, model=self.model(model_path), keyword_engine=keyword_engine
+            )
+            self._suggesters[key] = suggester
+        return suggester
+
+    def briefing(
+        self, model_path: Optional[Path] = None, keyword_engine: Optional[str] = None
+    ) -> ProfessionalBriefing:
+        key = (str(model_path) if model_path else None, keyword_engine)
+        briefing = self._briefings.get(key)
+        if briefing is None:
+            from .professional import ProfessionalBriefing
+
+            briefing = ProfessionalBriefing(
+                graph=self.graph, model=self.model(model_path), keyword_engine=keyword_engine
+            )
+            self._briefings[key] = briefing
+        return briefing
+
+    def translator(self, target_lang: str = "en") -> Translator:
+        translator = self._translators.get(target_lang)
+        if translator is None:
+            from .translate import Translator
+
+            translator = Translator(to_lang=target_lang)
+            self._translators[target_lang] = translator
+        return translator
+
+    def _category_label(self, category: str) -> str:
+        node = self.graph.get(category)
+        return node.label if node else category
+
+    def random_subject(self, *, group: Optional[str] = None, professional: bool = False) -> dict:
+        return self.randomizer().pick_subject(group=group, professional=professional or None)
+
+    def random_subjects(
+        self,
+        *,
+        count: int,
+        group: Optional[str] = None,
+        professional: bool = False,
+        unique: bool = True,
+        seed: Optional[int] = None,
+        recent: Sequence[str] = (),
+    ) -> List[dict]:
+        return self.randomizer().pick_subjects(
+            count,
+            group=group,
+            professional=professional or None,
+            unique=unique,
+            seed=seed,
+            recent=recent,
+        )
+
+    def study_suggest(
+        self,
+        *,
+        topic: str,
+        category: str,
+        text: str,
+        mode: str = "quen-3.4b",
+        model_path: Optional[Path] = None,
+        keyword_engine: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
+    ) -> dict:
+        suggestion = self.suggester(model_path, keyword_engine).suggest(
+            topic=topic, category=category, article_text=text, mode=mode, keywords=keywords
+        )
+        suggestion.category = self._category_label(category)
+        return suggestion.to_dict()
+
+    def professional_brief(
+        self,
+        *,
+        topic: str,
+        category: str,
+        text: str,
+        persona: str = "strategist",
+        mode: str = "quen-3.4b",
+        model_path: Optional[Path] = None,
+        keyword_engine: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
+    ) -> dict:
+        brief = self.briefing(model_path, keyword_engine).brief(
+            topic=topic, category=category, article_text=text, persona=persona, mode=mode, keywords=keywords
+        )
+        brief.category = self._category_label(category)
+        return brief.to_dict()
+
+    def study_suggest_stream(
+        self,
+        *,
+        topic: str,
+        category: str,
+        text: str,
+        mode: str = "quen-3.4b",
+        model_path: Optional[Path] = None,
+        keyword_engine: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream events from `StudySuggester.suggest_stream`; the final ``result`` matches `study_suggest`."""
+        events = self.suggester(model_path, keyword_engine).suggest_stream(
+            topic=topic, category=category, article_text=text, mode=mode
+        )
+        for event in events:
+            if event["event"] == "result":
+                event["result"].category = self._category_label(category)
+                event["result"] = event["result"].to_dict()
+            yield event
+
+    def professional_brief_stream(
+        self,
+        *,
+        topic: str,
+        category: str,
+        text: str,
+        persona: str = "strategist",
+        mode: str = "quen-3.4b",
+        model_path: Optional[Path] = None,
+        keyword_engine: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        events = self.briefing(model_path, keyword_engine).brief_stream(
+            topic=topic, category=category, article_text=text, persona=persona, mode=mode
+        )
+        for event in events:
+            if event["event"] == "result":
+                event["result"].category = self._category_label(category)
+                event["result"] = event["result"].to_dict()
+            yield event
+
+    def translate(
+        self,
+        *,
+        text: str,
+        source_lang: Optional[str] = None,
+        target_lang: str = "en",
+    ) -> dict:
+        return self.translator(target_lang).translate(text, source_lang)
+
+    def translate_many(
+        self,
+        *,
+        texts: Sequence[str],
+        source_lang: Optional[str] = None,
+        target_lang: str = "en",
+    ) -> List[dict]:
+        return self.translator(target_lang).translate_many(texts, source_lang)
+
+    def _ingestor_options(self, options: Optional[IngestOptions]) -> Dict[str, Any]:
+        """`Ingestor` keyword arguments for `options`, reusing the stores earlier calls opened."""
+        options = options or IngestOptions()
+        cache = None
+        if options.cache_path:
+            cache = self._caches.get(str(options.cache_path))
+            if cache is None:
+                from .cache import HttpCache
+
+                cache = HttpCache(options.cache_path)
+                self._caches[str(options.cache_path)] = cache
+        return {
+            "cache": cache,
+            "keywords": options.keywords,
+            "detect_language": options.detect_language,
+            "dedup": self.dedup_index(options.dedup_path) if options.dedup_path else None,
+            "skip_duplicates": options.skip_duplicates,
+            "novelty": self.novelty_scorer(options.novelty_path) if options.novelty_path else None,
+        }
+
+    def ingestor(
+        self,
+        *,
+        concurrency: int = 1,
+        per_host: int = 2,
+        options: Optional[IngestOptions] = None,
+    ) -> "Ingestor":
+        from .ingest import Ingestor
+
+        return Ingestor(
+            self.graph, concurrency=concurrency, per_host=per_host, **self._ingestor_options(options)
+        )
+
+    def dedup_index(self, path: Path) -> "DedupIndex":
+        index = self._dedup.get(str(path))
+        if index is None:
+            from .dedup import DedupIndex
+
+            index = DedupIndex(path)
+            self._dedup[str(path)] = index
+        return index
+
+    def novelty_scorer(self, path: Optional[Path] = None) -> "NoveltyScorer":
+        key = str(path) if path else ""
+        scorer = self._novelty.get(key)
+        if scorer is None:
+            from .novelty import NoveltyScorer
+
+            scorer = NoveltyScorer(path)
+            self._novelty[key] = scorer
+        return scorer
+
+    def novelty_score(
+        self,
+        *,
+        items: Sequence[Dict[str, Any]],
+        store_path: Optional[Path] = None,
+        update: bool = True,
+    ) -> List[dict]:
+        """Score ``{"text", "categories"}`` items against the store's category centroids.
+
+        A malformed ``categories`` or ``category`` raises `ValueError` before anything is scored.
+        """
+        scorer = self.novelty_scorer(store_path)
+        results = scorer.score_many(
+            [(str(item.get("text") or ""), novelty_categories(item)) for item in items], update=update
+        )
+        scorer.flush()
+        return [result.to_dict() for result in results]
+
+    def iter_ingest(
+        self,
+        *,
+        feed_url: str,
+        limit: int = 20,
+        concurrency: int = 1,
+        per_host: int = 2,
+        options: Optional[IngestOptions] = None,
+    ) -> Iterator[dict]:
+        ingestor = self.ingestor(concurrency=concurrency, per_host=per_host, options=options)
+        for item in ingestor.iter_feed(feed_url, limit=limit):
+            yield item.to_dict()
+
+    def ingest(
+        self,
+        *,
+        feed_url: str,
+        limit: int = 20,
+        concurrency: int = 1,
+        per_host: int = 2,
+        options: Optional[IngestOptions] = None,
+    ) -> list:
+        return list(
+            self.iter_ingest(
+                feed_url=feed_url, limit=limit, concurrency=concurrency, per_host=per_host, options=options
+            )
+        )
+
+    def multi_ingestor(
+        self,
+        *,
+        limit: int = 20,
+        concurrency: int = 16,
+        per_host: int = 2,
+        rate: float = 1.0,
+        robots: bool = True,
+        options: Optional[IngestOptions] = None,
+    ) -> "MultiFeedIngestor":
+        from .multifeed import MultiFeedIngestor
+
+        ingestor = self.ingestor(concurrency=concurrency, per_host=per_host, options=options)
+        return MultiFeedIngestor(
+            ingestor, concurrency=concurrency, per_host=per_host, rate=rate, robots=robots, limit=limit
+        )
+
+    def ingest_daemon(
+        self,
+        *,
+        state_path: Optional[Path] = None,
+        limit: int = 20,
+        concurrency: int = 16,
+        per_host: int = 2,
+        rate: float = 1.0,
+        robots: bool = True,
+        min_interval: float = 300,
+        max_interval: float = 86400,
+        max_backoff: float = 86400,
+        options: Optional[IngestOptions] = None,
+    ) -> "IngestDaemon":
+        from .polling import FeedStateStore, IngestDaemon
+
+        ingestor = self.ingestor(concurrency=concurrency, per_host=per_host, options=options)
+        return IngestDaemon(
+            ingestor,
+            FeedStateStore(state_path),
+            concurrency=concurrency,
+            per_host=per_host,
+            rate=rate,
+            robots=robots,
+            limit=limit,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            max_backoff=max_backoff,
+        )
+
+    def ingest_many(self, *, feeds: Sequence[Any], **options: Any) -> Dict[str, Any]:
+        """Ingest every feed in `feeds` (URLs, feed objects or `FeedSource`s); see `multi_ingestor` for options."""
+        from .multifeed import feed_source
+
+        sources: List[FeedSource] = [feed_source(feed) for feed in feeds]
+        ingestor = self.multi_ingestor(**options)
+        items = list(ingestor.iter_ingest(sources))
+        return {"items": items, "stats": ingestor.stats()}
+
+    def cache_stats(self) -> Dict[str, dict]:
+        from .keywords import keyword_cache_stats
+        from .llm import model_stats, registry
+        from .translate import translation_memory
+
+        return {
+            "http": {path: cache.stats() for path, cache in self._caches.items()},
+            "dedup": {path: index.stats() for path, index in self._dedup.items()},
+            "novelty": {path or ":memory:": scorer.stats() for path, scorer in self._novelty.items()},
+            "keywords": keyword_cache_stats(),
+            "generation": registry.stats(),
+            "model": model_stats(),
+            "translations": translation_memory().stats(),
+        }
+
+
+def novelty_categories(item: Dict[str, Any]) -> List[str]:
+    """Category slugs of a novelty record: ``categories`` (a list or comma-separated string) or ``category``.
+
+    Raises `ValueError` for any other shape, so callers can reject the one record.
+    """
+    categories = item.get("categories")
+    if categories is None:
+        category = item.get("category")
+        if category is not None and not isinstance(category, str):
+            raise ValueError("category must be a string")
+        categories = [category] if category else []
+    elif isinstance(categories, str):
+        categories = categories.split(",")
+    elif not isinstance(categories, list) or not all(isinstance(category, str) for category in categories):
+        raise ValueError("categories must be a list of strings or a comma-separated string")
+    return [category.strip() for category in categories if category.strip()]
+
+
+__all__ = ["IngestOptions", "Toolkit", "novelty_categories"]
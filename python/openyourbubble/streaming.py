@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class StreamAborted(ValueError):
+    """Raised when streamed model output can no longer become the expected JSON object."""
+
+
+class IncrementalObjectParser:
+    """Parse a JSON object from model output as it streams in.
+
+    `feed` scans each new chunk once, tracking string/escape state and nesting
+    depth, and returns the top-level members completed by it. Text before the
+    opening brace is tolerated up to `preamble_limit` characters (a code fence,
+    or reasoning steps in thinking modes); past that, or when a member fails to
+    parse, `StreamAborted` is raised so the caller can stop generating.
+    `complete` turns true as soon as every `required` key has been seen, which
+    lets callers stop before the model emits the closing brace.
+    """
+
+    def __init__(self, required: Iterable[str] = (), *, preamble_limit: int = 16) -> None:
+        self.required = frozenset(required)
+        self.preamble_limit = preamble_limit
+        self.fields: Dict[str, Any] = {}
+        self.closed = False
+        self._source = ""
+        self._preamble = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start: Optional[int] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.closed or (bool(self.required) and self.required.issubset(self.fields))
+
+    def _finish_member(self, end: int) -> Optional[Tuple[str, Any]]:
+        start = self._member_start
+        self._member_start = end + 1
+        if start is None:
+            return None
+        source = self._source[start:end].strip()
+        if not source:
+            return None
+        try:
+            member = json.loads("{" + source + "}")
+        except json.JSONDecodeError as exc:
+            raise StreamAborted(f"invalid JSON member: {exc.msg}") from None
+        key, value = next(iter(member.items()))
+        self.fields[key] = value
+        return key, value
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        if self.closed:
+            return []
+        completed: List[Tuple[str, Any]] = []
+        offset = len(self._source)
+        self._source += chunk
+        for index, char in enumerate(chunk, start=offset):
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = index + 1
+                    continue
+                self._preamble += 1
+                if self._preamble > self.preamble_limit:
+                    raise StreamAborted("no JSON object at the start of the output")
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1:
+                    if char == "]":
+                        raise StreamAborted("unbalanced ']' in output")
+                    member = self._finish_member(index)
+                    if member:
+                        completed.append(member)
+                    self._depth = 0
+                    self.closed = True
+                    break
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                member = self._finish_member(index)
+                if member:
+                    completed.append(member)
+        return completed
+
+    def finish(self) -> Dict[str, Any]:
+        """Return the parsed fields once the stream has ended, or raise if the object is incomplete."""
+        if not self.complete:
+            raise StreamAborted("output ended before the JSON object was complete")
+        return dict(self.fields)
+
+
+__all__ = ["IncrementalObjectParser", "StreamAborted"]
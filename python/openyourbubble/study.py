@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
-
-import yake
+from typing import Any, Dict, Iterator, List, Optional
 
 from .categories import Category, CategoryGraph, load_graph
+from .keywords import extract_keywords
 from .llm import MaybeModel
+from .streaming import StreamAborted
 
 
 @dataclass
@@ -33,25 +33,19 @@ class StudySuggestion:
         }
 
 
-_keyword_engine = yake.KeywordExtractor(n=3, top=12)
-
-
-def extract_keywords(text: str) -> List[str]:
-    scored = _keyword_engine.extract_keywords(text)
-    return [phrase for phrase, score in sorted(scored, key=lambda item: item[1])]
-
-
 class StudySuggester:
     def __init__(
         self,
         graph: Optional[CategoryGraph] = None,
         model: Optional[MaybeModel] = None,
+        keyword_engine: Optional[str] = None,
     ) -> None:
         self.graph = graph or load_graph()
         self.model = model or MaybeModel()
+        self.keyword_engine = keyword_engine
 
     def _keywords(self, text: str) -> List[str]:
-        return extract_keywords(text)
+        return extract_keywords(text, engine=self.keyword_engine)
 
     def _compose_questions(self, topic: str, keywords: List[str], thinking: bool) -> List[str]:
         if not keywords:
@@ -131,27 +125,72 @@ class StudySuggester:
         category: str,
         article_text: str,
         mode: str = "quen-3.4b",
+        keywords: Optional[List[str]] = None,
     ) -> StudySuggestion:
-        thinking = mode.endswith("thinking")
+        if keywords is None:
+            keywords = self._keywords(article_text)
+        enriched = None
+        if self.model.available(mode):
+            enriched = self.model.generate_study(topic=topic, keywords=keywords, article_text=article_text, mode=mode)
+        return self._compose(topic=topic, category=category, keywords=keywords, mode=mode, enriched=enriched)
+
+    def suggest_stream(
+        self,
+        *,
+        topic: str,
+        category: str,
+        article_text: str,
+        mode: str = "quen-3.4b",
+    ) -> Iterator[Dict[str, Any]]:
+        """Like `suggest`, but yields model fields as they are generated.
+
+        Emits ``{"event": "field", "field", "value"}`` per completed field, a
+        ``{"event": "fallback", "reason"}`` if the model output is abandoned,
+        and finally ``{"event": "result", "result": StudySuggestion}``.
+        """
         keywords = self._keywords(article_text)
+        enriched = None
+        if self.model.available(mode):
+            fields: Dict[str, Any] = {}
+            try:
+                for key, value in self.model.stream_study(
+                    topic=topic, keywords=keywords, article_text=article_text, mode=mode
+                ):
+                    fields[key] = value
+                    yield {"event": "field", "field": key, "value": value}
+            except StreamAborted as exc:
+                yield {"event": "fallback", "reason": str(exc)}
+            else:
+                enriched = self.model.from_payload(fields) if fields else None
+        result = self._compose(topic=topic, category=category, keywords=keywords, mode=mode, enriched=enriched)
+        yield {"event": "result", "result": result}
+
+    def _compose(
+        self,
+        *,
+        topic: str,
+        category: str,
+        keywords: List[str],
+        mode: str,
+        enriched: Optional[StudySuggestion],
+    ) -> StudySuggestion:
+        thinking = mode.endswith("thinking")
         category_node = self.graph.get(category)
         category_label = category_node.label if category_node else category
         spotlight = self._spotlight_subject(category_node, keywords, topic)
-        if self.model.available(mode):
-            enriched = self.model.generate_study(topic=topic, keywords=keywords, article_text=article_text, mode=mode)
-            if enriched:
-                enriched.category = category_label
-                enriched.spotlight_subject = enriched.spotlight_subject or spotlight
-                enriched.presentation_question = (
-                    enriched.presentation_question
-                    or self._presentation_question(
-                        spotlight=enriched.spotlight_subject,
-                        topic=topic,
-                        keywords=keywords,
-                        thinking=thinking,
-                    )
+        if enriched:
+            enriched.category = category_label
+            enriched.spotlight_subject = enriched.spotlight_subject or spotlight
+            enriched.presentation_question = (
+                enriched.presentation_question
+                or self._presentation_question(
+                    spotlight=enriched.spotlight_subject,
+                    topic=topic,
+                    keywords=keywords,
+                    thinking=thinking,
                 )
-                return enriched
+            )
+            return enriched
         questions = self._compose_questions(topic, keywords, thinking)
         impact = self._impact(keywords, thinking)
         angle = keywords[0] if keywords else topic
@@ -0,0 +1,367 @@
+"""Compact binary taxonomy format with a memory-mapped `CategoryGraph`.
+
+`compile_taxonomy` writes a little-endian file made of 8-byte aligned sections:
+
+* a string table (``u32`` offsets + UTF-8 blob) holding slugs, labels, groups,
+  tags and lowercased match terms, each stored once;
+* one fixed-size record per category (slug, label, group, flags, parent span,
+  tag span) with parents as category indices and tags as string indices;
+* category indices sorted by slug for binary-search lookups;
+* one membership bitset per group plus a professional bitset;
+* the sorted term index with postings used by `resolve`.
+
+`CompiledCategoryGraph` mmaps the file and only materializes `Category`
+objects that are actually requested, so start-up cost no longer grows with
+the taxonomy size.
+"""
+
+from __future__ import annotations
+
+import array
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .categories import Category, CategoryGraph
+
+MAGIC = b"OYBT"
+VERSION = 1
+_HEADER = struct.Struct("<4sIIIII")
+_SECTIONS = (
+    "string_offsets",
+    "string_blob",
+    "records",
+    "parents",
+    "tags",
+    "slug_order",
+    "groups",
+    "bitsets",
+    "term_order",
+    "term_offsets",
+    "postings",
+)
+_SECTION_TABLE = struct.Struct("<" + "II" * len(_SECTIONS))
+_RECORD_FIELDS = 8
+_FLAG_PROFESSIONAL = 1
+
+
+def _require_little_endian() -> None:
+    if sys.byteorder != "little":  # pragma: no cover - no big-endian deployments today
+        raise RuntimeError("compiled taxonomies are only supported on little-endian hosts")
+
+
+def is_compiled(path: Union[str, Path]) -> bool:
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(4) == MAGIC
+    except OSError:
+        return False
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def add(self, value: str) -> int:
+        found = self.index.get(value)
+        if found is None:
+            found = len(self.values)
+            self.index[value] = found
+            self.values.append(value)
+        return found
+
+
+def _u32(values: Iterable[int]) -> bytes:
+    return array.array("I", values).tobytes()
+
+
+def compile_taxonomy(entries: Iterable[Dict], path: Union[str, Path]) -> Dict[str, int]:
+    """Write `entries` (the `categories.json` shape) to `path` in the compiled format."""
+    _require_little_endian()
+    graph = CategoryGraph(entries)
+    categories = graph.all()
+    position = {cat.slug: index for index, cat in enumerate(categories)}
+    strings = _StringTable()
+    groups = graph.groups()
+    group_index = {group: index for index, group in enumerate(groups)}
+
+    records: List[int] = []
+    parents: List[int] = []
+    tags: List[int] = []
+    dropped_parents = 0
+    for cat in categories:
+        parent_start = len(parents)
+        for parent in cat.parents:
+            if parent in position:
+                parents.append(position[parent])
+            else:
+                dropped_parents += 1
+        tag_start = len(tags)
+        tags.extend(strings.add(tag) for tag in cat.tags)
+        records.extend(
+            (
+                strings.add(cat.slug),
+                strings.add(cat.label),
+                group_index[cat.group],
+                _FLAG_PROFESSIONAL if cat.professional else 0,
+                parent_start,
+                len(parents) - parent_start,
+                tag_start,
+                len(tags) - tag_start,
+            )
+        )
+    group_strings = [strings.add(group) for group in groups]
+
+    words = (len(categories) + 63) // 64
+    bitsets = [bytearray(words * 8) for _ in range(len(groups) + 1)]
+    for index, cat in enumerate(categories):
+        bitsets[group_index[cat.group]][index >> 3] |= 1 << (index & 7)
+        if cat.professional:
+            bitsets[-1][index >> 3] |= 1 << (index & 7)
+
+    postings_by_term: Dict[str, List[int]] = {}
+    for index, cat in enumerate(categories):
+        for term in {cat.slug.lower(), cat.label.lower(), *(tag.lower() for tag in cat.tags)}:
+            postings_by_term.setdefault(term, []).append(index)
+    terms = sorted(postings_by_term, key=lambda term: term.encode("utf-8"))
+    term_offsets = [0]
+    postings: List[int] = []
+    for term in terms:
+        postings.extend(postings_by_term[term])
+        term_offsets.append(len(postings))
+    term_strings = [strings.add(term) for term in terms]
+
+    encoded = [value.encode("utf-8") for value in strings.values]
+    string_offsets = [0]
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+    slug_order = sorted(range(len(categories)), key=lambda index: encoded[records[index * _RECORD_FIELDS]])
+
+    sections = {
+        "string_offsets": _u32(string_offsets),
+        "string_blob": b"".join(encoded),
+        "records": _u32(records),
+        "parents": _u32(parents),
+        "tags": _u32(tags),
+        "slug_order": _u32(slug_order),
+        "groups": _u32(group_strings),
+        "bitsets": b"".join(bytes(bits) for bits in bitsets),
+        "term_order": _u32(term_strings),
+        "term_offsets": _u32(term_offsets),
+        "postings": _u32(postings),
+    }
+    offset = _HEADER.size + _SECTION_TABLE.size
+    table: List[int] = []
+    body = bytearray()
+    for name in _SECTIONS:
+        padding = -offset % 8
+        body.extend(b"\0" * padding)
+        offset += padding
+        table.extend((offset, len(sections[name])))
+        body.extend(sections[name])
+        offset += len(sections[name])
+    header = _HEADER.pack(MAGIC, VERSION, len(categories), len(strings.values), len(groups), len(terms))
+    Path(path).write_bytes(header + _SECTION_TABLE.pack(*table) + bytes(body))
+    return {
+        "categories": len(categories),
+        "strings": len(strings.values),
+        "groups": len(groups),
+        "terms": len(terms),
+        "dropped_parents": dropped_parents,
+        "bytes": offset,
+    }
+
+
+class CompiledCategoryGraph(CategoryGraph):
+    """Read-only `CategoryGraph` over a memory-mapped compiled taxonomy."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        # Deliberately skips CategoryGraph.__init__: nothing is parsed up front.
+        _require_little_endian()
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+        magic, version, self._count, _, _, self._term_count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} compiled taxonomy")
+        table = _SECTION_TABLE.unpack_from(view, _HEADER.size)
+        spans = {name: (table[2 * i], table[2 * i + 1]) for i, name in enumerate(_SECTIONS)}
+
+        def section(name: str) -> memoryview:
+            start, length = spans[name]
+            return view[start : start + length]
+
+        self._string_offsets = section("string_offsets").cast("I")
+        self._string_blob = section("string_blob")
+        self._records = section("records").cast("I")
+        self._parents = section("parents").cast("I")
+        self._tags = section("tags").cast("I")
+        self._slug_order = section("slug_order").cast("I")
+        self._group_strings = section("groups").cast("I")
+        self._bitsets = section("bitsets")
+        self._term_order = section("term_order").cast("I")
+        self._term_offsets = section("term_offsets").cast("I")
+        self._postings = section("postings").cast("I")
+        self._bitset_bytes = ((self._count + 63) // 64) * 8
+        self._group_names = [self._string(index) for index in self._group_strings]
+        self._group_index = {name: index for index, name in enumerate(self._group_names)}
+        self._materialized: Dict[int, Category] = {}
+        self._slug_positions: Dict[str, Optional[int]] = {}
+        self._ancestors: Dict[str, Tuple[str, ...]] = {}
+
+    # -- low-level readers -------------------------------------------------
+
+    def _string_bytes(self, index: int) -> bytes:
+        return bytes(self._string_blob[self._string_offsets[index] : self._string_offsets[index + 1]])
+
+    def _string(self, index: int) -> str:
+        return self._string_bytes(index).decode("utf-8")
+
+    def _slug_at(self, index: int) -> str:
+        return self._string(self._records[index * _RECORD_FIELDS])
+
+    def _record(self, index: int) -> Sequence[int]:
+        start = index * _RECORD_FIELDS
+        return self._records[start : start + _RECORD_FIELDS]
+
+    def _category(self, index: int) -> Category:
+        cat = self._materialized.get(index)
+        if cat is None:
+            slug, label, group, flags, p_start, p_len, t_start, t_len = self._record(index)
+            cat = Category(
+                slug=self._string(slug),
+                label=self._string(label),
+                group=self._group_names[group],
+                parents=[self._slug_at(parent) for parent in self._parents[p_start : p_start + p_len]],
+                tags=[self._string(tag) for tag in self._tags[t_start : t_start + t_len]],
+                professional=bool(flags & _FLAG_PROFESSIONAL),
+            )
+            self._materialized[index] = cat
+        return cat
+
+    def _bisect(self, order: memoryview, key, target: bytes) -> Optional[int]:
+        low, high = 0, len(order)
+        while low < high:
+            mid = (low + high) // 2
+            if key(order[mid]) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(order) and key(order[low]) == target:
+            return low
+        return None
+
+    def _position(self, slug: str) -> Optional[int]:
+        if slug in self._slug_positions:
+            return self._slug_positions[slug]
+        found = self._bisect(
+            self._slug_order,
+            lambda index: self._string_bytes(self._records[index * _RECORD_FIELDS]),
+            slug.encode("utf-8"),
+        )
+        position = None if found is None else self._slug_order[found]
+        self._slug_positions[slug] = position
+        return position
+
+    def _bits(self, slot: int) -> memoryview:
+        start = slot * self._bitset_bytes
+        return self._bitsets[start : start + self._bitset_bytes]
+
+    def _members(self, bits: bytes) -> Iterator[int]:
+        for byte_index, byte in enumerate(bits):
+            while byte:
+                low = byte & -byte
+                yield (byte_index << 3) + low.bit_length() - 1
+                byte ^= low
+
+    # -- CategoryGraph API -------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def all(self) -> List[Category]:
+        return [self._category(index) for index in range(self._count)]
+
+    def groups(self) -> List[str]:
+        return sorted(self._group_names)
+
+    def by_group(self, group: str, professional: Optional[bool] = None) -> List[Category]:
+        slot = self._group_index.get(group)
+        if slot is None:
+            return []
+        bits = bytes(self._bits(slot))
+        if professional is not None:
+            flags = self._bits(len(self._group_names))
+            if professional:
+                bits = bytes(a & b for a, b in zip(bits, flags))
+            else:
+                bits = bytes(a & ~b & 0xFF for a, b in zip(bits, flags))
+        return [self._category(index) for index in self._members(bits)]
+
+    def get(self, slug: str) -> Optional[Category]:
+        position = self._position(slug)
+        return None if position is None else self._category(position)
+
+    def professional_categories(self) -> List[Category]:
+        return [self._category(index) for index in self._members(bytes(self._bits(len(self._group_names))))]
+
+    def ancestors(self, slug: str) -> Tuple[str, ...]:
+        cached = self._ancestors.get(slug)
+        if cached is not None:
+            return cached
+        start = self._position(slug)
+        seen: List[int] = []
+        if start is not None:
+            frontier = list(self._parent_indices(start))
+            while frontier:
+                parent = frontier.pop(0)
+                if parent in seen or parent == start:
+                    continue
+                seen.append(parent)
+                frontier.extend(self._parent_indices(parent))
+        result = tuple(self._slug_at(index) for index in seen)
+        self._ancestors[slug] = result
+        return result
+
+    def _parent_indices(self, index: int) -> Sequence[int]:
+        record = self._record(index)
+        return self._parents[record[4] : record[4] + record[5]]
+
+    def resolve(self, terms: Iterable[Optional[str]], *, include_ancestors: bool = False) -> List[str]:
+        matched = set()
+        for term in terms:
+            if not term:
+                continue
+            found = self._bisect(self._term_order, self._string_bytes, term.strip().lower().encode("utf-8"))
+            if found is not None:
+                matched.update(self._postings[self._term_offsets[found] : self._term_offsets[found + 1]])
+        if include_ancestors:
+            for index in list(matched):
+                for parent in self.ancestors(self._slug_at(index)):
+                    matched.add(self._position(parent))
+        return [self._slug_at(index) for index in sorted(matched)]
+
+    def close(self) -> None:
+        self._materialized.clear()
+        for name in (
+            "_string_offsets",
+            "_string_blob",
+            "_records",
+            "_parents",
+            "_tags",
+            "_slug_order",
+            "_group_strings",
+            "_bitsets",
+            "_term_order",
+            "_term_offsets",
+            "_postings",
+        ):
+            getattr(self, name).release()
+        self._mm.close()
+
+
+__all__ = ["CompiledCategoryGraph", "compile_taxonomy", "is_compiled"]
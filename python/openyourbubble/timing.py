@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Timings:
+    """Per-stage totals for named spans: call count, total, mean and max milliseconds.
+
+    Spans from every thread land in one table, so the totals for a stage
+    that runs on a worker pool can exceed the wall time. A recorder with a
+    `parent` forwards every span to it as well.
+    """
+
+    def __init__(self, parent: Optional["Timings"] = None) -> None:
+        self.parent = parent
+        self._lock = threading.Lock()
+        self._spans: Dict[str, list] = {}
+        self._started = time.perf_counter()
+
+    def record(self, name: str, seconds: float) -> None:
+        if self.parent is not None:
+            self.parent.record(name, seconds)
+        with self._lock:
+            entry = self._spans.get(name)
+            if entry is None:
+                self._spans[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+    def snapshot(self, *, reset: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            spans = {name: list(entry) for name, entry in self._spans.items()}
+            wall = time.perf_counter() - self._started
+            if reset:
+                self._spans.clear()
+                self._started = time.perf_counter()
+        return {
+            "wall_ms": round(wall * 1000, 3),
+            "spans": {
+                name: {
+                    "count": count,
+                    "total_ms": round(total * 1000, 3),
+                    "mean_ms": round(total * 1000 / count, 3),
+                    "max_ms": round(longest * 1000, 3),
+                }
+                for name, (count, total, longest) in sorted(spans.items())
+            },
+        }
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "started")
+
+    def __init__(self, recorder: Timings, name: str) -> None:
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.recorder.record(self.name, time.perf_counter() - self.started)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+# Set `OYB_PROFILE` to record from process start, e.g. in a long-lived `oyb serve` worker.
+_recorder: Optional[Timings] = Timings() if os.environ.get("OYB_PROFILE") else None
+
+
+def span(name: str) -> Any:
+    """Context manager timing one stage; a shared no-op object while recording is off."""
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of `span` for functions that are one stage end to end."""
+
+    def decorate(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            recorder = _recorder
+            if recorder is None:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                recorder.record(name, time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def record(name: str, seconds: float) -> None:
+    """Add a duration measured elsewhere (e.g. queue wait) under `name`."""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.record(name, seconds)
+
+
+def enable() -> Timings:
+    """Start recording spans process-wide; returns the active recorder."""
+    global _recorder
+    if _recorder is None:
+        _recorder = Timings()
+    return _recorder
+
+
+def disable() -> None:
+    global _recorder
+    _recorder = None
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def timings(*, reset: bool = False) -> Optional[Dict[str, Any]]:
+    """Snapshot of the recorded spans, or `None` while recording is off."""
+    recorder = _recorder
+    return recorder.snapshot(reset=reset) if recorder is not None else None
+
+
+@contextmanager
+def recording() -> Iterator[Timings]:
+    """Record spans for the duration of the block into a fresh recorder.
+
+    A process-wide recorder that was already running keeps receiving them.
+    """
+    global _recorder
+    previous = _recorder
+    _recorder = Timings(parent=previous)
+    try:
+        yield _recorder
+    finally:
+        _recorder = previous
+
+
+__all__ = ["Timings", "disable", "enable", "enabled", "record", "recording", "span", "timed", "timings"]
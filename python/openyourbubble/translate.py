@@ -1,14 +1,190 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-try:  # pragma: no cover - optional dependency
-    from argostranslate import package as argos_package  # type: ignore
-    from argostranslate import translate as argos_translate  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    argos_package = None  # type: ignore
-    argos_translate = None  # type: ignore
+from .timing import span
+
+argos_package: Any = None
+argos_translate: Any = None
+_argos_checked = False
+
+
+def _load_argos() -> bool:
+    """Import Argos Translate on first use; its import cost is paid only when translating."""
+    global argos_package, argos_translate, _argos_checked
+    if not _argos_checked:
+        _argos_checked = True
+        try:  # pragma: no cover - optional dependency
+            from argostranslate import package as _package  # type: ignore
+            from argostranslate import translate as _translate  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            return False
+        argos_package, argos_translate = _package, _translate
+    return bool(argos_package and argos_translate)
+
+
+Pair = Tuple[str, str]
+
+_pairs: Dict[Pair, Any] = {}
+_pairs_lock = threading.Lock()
+_pair_loads = 0
+
+
+def translation_pair(from_code: str, to_code: str) -> Optional[Any]:
+    """Loaded Argos translation for a language pair, kept for the life of the process.
+
+    `get_translation` builds the CTranslate2 model and tokenizers for the pair,
+    which dominates the cost of translating a single article.
+    """
+    global _pair_loads
+    key = (from_code, to_code)
+    with _pairs_lock:
+        if key not in _pairs:
+            with span("translate.load_pair"):
+                _pairs[key] = argos_translate.get_translation(from_code, to_code)
+            _pair_loads += 1
+        return _pairs[key]
+
+
+def clear_translation_pairs() -> None:
+    global _pair_loads
+    with _pairs_lock:
+        _pairs.clear()
+        _pair_loads = 0
+
+
+# Sentence ends (Latin and CJK punctuation) and line breaks; separators are kept
+# so translated text is reassembled with the original layout.
+_SEGMENTS = re.compile(r"((?<=[.!?。！？])[ \t]+|\s*\n\s*)")
+
+
+def split_segments(text: str) -> List[str]:
+    """Alternating sentence / separator pieces; even indexes are sentences."""
+    return _SEGMENTS.split(text)
+
+
+def sentence_digest(sentence: str) -> str:
+    return hashlib.blake2b(sentence.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TranslationMemory:
+    """Translated sentences keyed by ``(pair, sentence hash)``: an LRU over an optional SQLite file.
+
+    Bylines, newsletter prompts and other boilerplate repeat across every
+    article of a feed, so each cycle only translates sentences it has not seen.
+    """
+
+    def __init__(self, capacity: int = 50_000, path: Optional[Union[str, Path]] = None) -> None:
+        self.capacity = max(1, capacity)
+        self.path = Path(path) if path else None
+        self._memory: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stored": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations (pair TEXT NOT NULL, digest TEXT NOT NULL,"
+                " text TEXT NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (pair, digest))"
+            )
+
+    def _remember(self, key: Tuple[str, str], text: str) -> None:
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get_many(self, pair: str, digests: Sequence[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        with self._lock:
+            missing = []
+            for digest in digests:
+                text = self._memory.get((pair, digest))
+                if text is None:
+                    missing.append(digest)
+                else:
+                    self._memory.move_to_end((pair, digest))
+                    found[digest] = text
+            self._stats["memory_hits"] += len(found)
+            if missing and self._conn is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start : start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT digest, text FROM translations WHERE pair = ? AND digest IN ({marks})",
+                        (pair, *chunk),
+                    ).fetchall()
+                    for digest, text in rows:
+                        self._remember((pair, digest), text)
+                        found[digest] = text
+                        self._stats["disk_hits"] += 1
+            self._stats["misses"] += len(digests) - len(found)
+        return found
+
+    def put_many(self, pair: str, entries: Dict[str, str]) -> None:
+        with self._lock:
+            for digest, text in entries.items():
+                self._remember((pair, digest), text)
+            self._stats["stored"] += len(entries)
+            if self._conn is not None and entries:
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO translations (pair, digest, text, created_at) VALUES (?, ?, ?, ?)",
+                    [(pair, digest, text, now) for digest, text in entries.items()],
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            if self._conn is not None:
+                stats["disk_entries"] = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["pair_loads"] = _pair_loads
+        return stats
+
+
+_memory: Optional[TranslationMemory] = None
+
+
+def translation_memory() -> TranslationMemory:
+    """Process-wide memory; `OYB_TRANSLATION_MEMORY` points the persistent tier at a SQLite file."""
+    global _memory
+    if _memory is None:
+        _memory = TranslationMemory(
+            capacity=int(os.environ.get("OYB_TRANSLATION_MEMORY_SIZE", "50000")),
+            path=os.environ.get("OYB_TRANSLATION_MEMORY") or None,
+        )
+    return _memory
+
+
+def configure_translation_memory(memory: Optional[TranslationMemory]) -> None:
+    global _memory
+    _memory = memory
+
+
+def _translate_sentences(translator: Any, sentences: List[str]) -> List[str]:
+    # Argos translates a newline-separated text paragraph by paragraph, so one
+    # call covers the whole batch; fall back to per-sentence calls if the line
+    # structure does not survive.
+    if len(sentences) > 1:
+        lines = translator.translate("\n".join(sentences)).split("\n")
+        if len(lines) == len(sentences):
+            return lines
+    return [translator.translate(sentence) for sentence in sentences]
 
 
 @dataclass
@@ -17,34 +193,90 @@ class Translator:
     to_lang: str = "en"
 
     def available(self) -> bool:
-        return bool(argos_package and argos_translate)
+        return _load_argos()
 
     def translate(self, text: str, source_lang: Optional[str] = None) -> dict:
-        if not text.strip():
-            return {"text": "", "provider": "none", "detected": source_lang or None}
-        if not self.available():
-            return {
-                "text": text,
-                "provider": "identity",
-                "detected": source_lang or None,
-                "note": "Argos Translate not installed; returning original text.",
-            }
-        argos_package.install_from_path  # ensure module is imported
+        return self.translate_many([text], source_lang)[0]
+
+    def translate_many(self, texts: Sequence[str], source_lang: Optional[str] = None) -> List[dict]:
+        """Translate several texts in a single pass per source language.
+
+        Texts are split into sentences, and each distinct sentence is looked up in
+        the translation memory or translated once for the whole batch. With an
+        ``auto`` source the texts are run through the bundled language
+        identifier first: texts already in the target language are returned as
+        they are and the rest are grouped by detected language.
+        """
+        results: List[dict] = [{} for _ in texts]
         from_code = source_lang or self.from_lang
-        translator = argos_translate.get_translation(from_code, self.to_lang)
+        pending = []
+        for index, text in enumerate(texts):
+            if text.strip():
+                pending.append(index)
+            else:
+                results[index] = {"text": "", "provider": "none", "detected": source_lang or None}
+        groups: Dict[str, List[int]] = {}
+        if from_code == "auto" and pending:
+            from .langid import detect_languages
+
+            target = self.to_lang.split("-")[0].lower()
+            with span("translate.detect_language"):
+                detections = detect_languages([texts[index] for index in pending])
+            for index, detection in zip(pending, detections):
+                if detection.language == target:
+                    results[index] = {"text": texts[index], "provider": "none", "detected": detection.language}
+                else:
+                    groups.setdefault(detection.language or "auto", []).append(index)
+        elif pending:
+            groups[from_code] = pending
+        for code, indexes in groups.items():
+            self._translate_group(texts, indexes, code, results)
+        return results
+
+    def _translate_group(self, texts: Sequence[str], pending: List[int], from_code: str, results: List[dict]) -> None:
+        detected = from_code if from_code != "auto" else None
+
+        def identity(note: str) -> None:
+            for index in pending:
+                results[index] = {"text": texts[index], "provider": "identity", "detected": detected, "note": note}
+
+        if from_code == "auto":
+            return identity("Source language could not be detected; returning original text.")
+        if not self.available():
+            return identity("Argos Translate not installed; returning original text.")
+        translator = translation_pair(from_code, self.to_lang)
         if translator is None:
-            return {
-                "text": text,
-                "provider": "identity",
-                "detected": source_lang or None,
-                "note": "No translation pair available; returning original text.",
-            }
-        translated = translator.translate(text)
-        return {
-            "text": translated,
-            "provider": "argos-translate",
-            "detected": from_code if from_code != "auto" else None,
-        }
-
-
-__all__ = ["Translator"]
+            return identity("No translation pair available; returning original text.")
+
+        pieces = {index: split_segments(texts[index]) for index in pending}
+        unique: Dict[str, str] = {}
+        for segments in pieces.values():
+            for sentence in segments[::2]:
+                if sentence.strip():
+                    unique.setdefault(sentence_digest(sentence), sentence)
+        pair = f"{from_code}:{self.to_lang}"
+        memory = translation_memory()
+        translated = memory.get_many(pair, list(unique))
+        missing = [digest for digest in unique if digest not in translated]
+        if missing:
+            with span("translate.argos"):
+                fresh = dict(zip(missing, _translate_sentences(translator, [unique[digest] for digest in missing])))
+            memory.put_many(pair, fresh)
+            translated.update(fresh)
+        for index, segments in pieces.items():
+            rebuilt = [
+                translated[sentence_digest(piece)] if position % 2 == 0 and piece.strip() else piece
+                for position, piece in enumerate(segments)
+            ]
+            results[index] = {"text": "".join(rebuilt), "provider": "argos-translate", "detected": detected}
+
+
+__all__ = [
+    "TranslationMemory",
+    "Translator",
+    "clear_translation_pairs",
+    "configure_translation_memory",
+    "split_segments",
+    "translation_memory",
+    "translation_pair",
+]
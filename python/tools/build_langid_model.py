@@ -0,0 +1,59 @@
+"""Rebuild ``openyourbubble/langid.npz`` from the langdetect language profiles.
+
+The profiles (1-3 character gram frequencies for 55 languages, built from
+Wikipedia) and the CJK ideograph classes ship in the langdetect source
+distribution under the Apache License 2.0::
+
+    pip download --no-deps --no-binary :all: langdetect==1.0.9 -d /tmp/langdetect
+    tar xzf /tmp/langdetect/langdetect-1.0.9.tar.gz -C /tmp/langdetect
+    python tools/build_langid_model.py /tmp/langdetect/langdetect-1.0.9/langdetect
+
+The model is a derivative of those profiles, so it ships with
+``openyourbubble/langid.NOTICE`` (attribution and the upstream notices) and
+``openyourbubble/langid.LICENSE`` (the Apache License 2.0 text); keep both
+next to ``langid.npz`` and update the notice if the source version changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from openyourbubble.langid import MODEL_PATH, build_model, load_profiles  # noqa: E402
+
+# Simplified and traditional Chinese share most grams; the feed hint tells them apart.
+MERGE = {"zh-cn": "zh", "zh-tw": "zh"}
+
+
+def cjk_classes(messages: Path) -> dict:
+    mapping = {}
+    for line in messages.read_text(encoding="utf-8").splitlines():
+        key, _, value = line.strip().partition("=")
+        if key.startswith("NGram.KANJI_"):
+            members = value.encode().decode("unicode_escape")
+            for member in members:
+                mapping[member] = members[0]
+    return mapping
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("langdetect", type=Path, help="langdetect package directory (contains profiles/)")
+    parser.add_argument("--output", type=Path, default=MODEL_PATH)
+    parser.add_argument("--bits", type=int, default=13)
+    args = parser.parse_args()
+    stats = build_model(
+        load_profiles(args.langdetect / "profiles", merge=MERGE),
+        args.output,
+        bits=args.bits,
+        cjk_map=cjk_classes(args.langdetect / "utils" / "messages.properties"),
+    )
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import { EventEmitter } from "node:events";
+
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+
+const { spawnMock } = vi.hoisted(() => ({ spawnMock: vi.fn() }));
+
+vi.mock("node:child_process", () => ({ spawn: spawnMock }));
+
+const ORIGINAL_ENV = { ...process.env };
+
+class FakeChild extends EventEmitter {
+  stdin = Object.assign(new EventEmitter(), { write: vi.fn(), end: vi.fn() });
+  stdout = new EventEmitter();
+  stderr = new EventEmitter();
+  exitCode: number | null = null;
+  killed = false;
+  kill = vi.fn(() => {
+    this.killed = true;
+    return true;
+  });
+
+  requestIds(): number[] {
+    return this.stdin.write.mock.calls.map(([line]) => JSON.parse(String(line)).id);
+  }
+
+  reply(line: string) {
+    this.stdout.emit("data", `${line}\n`);
+  }
+
+  exit(code: number, stderr = "") {
+    if (stderr) this.stderr.emit("data", stderr);
+    this.exitCode = code;
+    this.emit("close", code);
+  }
+}
+
+let children: FakeChild[] = [];
+
+async function loadRunPython() {
+  // The worker, its pending calls and the request counter live at module level.
+  vi.resetModules();
+  const { runPython } = await import("./python");
+  return runPython;
+}
+
+describe("runPython (worker mode)", () => {
+  beforeEach(() => {
+    process.env = { ...ORIGINAL_ENV, OYB_PYTHON_SERVE: "true", OYB_PYTHON_TIMEOUT_MS: "1000" };
+    children = [];
+    spawnMock.mockReset();
+    spawnMock.mockImplementation(() => {
+      const child = new FakeChild();
+      children.push(child);
+      return child;
+    });
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+    process.env = { ...ORIGINAL_ENV };
+  });
+
+  it("shares one worker and resolves each call by its id", async () => {
+    const runPython = await loadRunPython();
+
+    const first = runPython("translate", { input: "hola" });
+    const second = runPython("random-subject", { args: ["--count", "2"] });
+    const [firstId, secondId] = children[0].requestIds();
+    children[0].reply(JSON.stringify({ id: secondId, result: { subjects: ["a", "b"] } }));
+    children[0].reply(JSON.stringify({ id: firstId, result: { text: "hello" } }));
+
+    await expect(first).resolves.toEqual({ text: "hello" });
+    await expect(second).resolves.toEqual({ subjects: ["a", "b"] });
+    expect(spawnMock).toHaveBeenCalledTimes(1);
+  });
+
+  it("kills a worker that misses a deadline, rejects its calls and respawns", async () => {
+    vi.useFakeTimers();
+    const runPython = await loadRunPython();
+
+    const first = runPython("translate", { input: "hola" });
+    const second = runPython("random-subject");
+    const firstRejected = expect(first).rejects.toThrow("Python tool translate timed out after 1000 ms");
+    const secondRejected = expect(second).rejects.toThrow("timed out after 1000 ms");
+
+    vi.advanceTimersByTime(1000);
+
+    await firstRejected;
+    await secondRejected;
+    expect(children[0].kill).toHaveBeenCalledTimes(1);
+    expect(spawnMock).toHaveBeenCalledTimes(2);
+
+    const third = runPython("study-suggest", { args: ["--topic", "climate"] });
+    expect(children[0].stdin.write).toHaveBeenCalledTimes(2);
+    const [thirdId] = children[1].requestIds();
+    children[1].reply(JSON.stringify({ id: thirdId, result: { suggestions: [] } }));
+
+    await expect(third).resolves.toEqual({ suggestions: [] });
+    expect(children[1].kill).not.toHaveBeenCalled();
+  });
+
+  it("rejects every in-flight call when the worker exits and respawns on the next call", async () => {
+    const runPython = await loadRunPython();
+
+    const first = runPython("translate", { input: "hola" });
+    const second = runPython("professional-brief", { args: ["--topic", "energy"] });
+    const firstRejected = expect(first).rejects.toThrow("Python worker exited: Traceback: boom");
+    const secondRejected = expect(second).rejects.toThrow("Python worker exited: Traceback: boom");
+
+    children[0].exit(1, "Traceback: boom");
+
+    await firstRejected;
+    await secondRejected;
+    expect(children[0].kill).not.toHaveBeenCalled();
+
+    const third = runPython("translate", { input: "adios" });
+    expect(spawnMock).toHaveBeenCalledTimes(2);
+    const [thirdId] = children[1].requestIds();
+    children[1].reply(JSON.stringify({ id: thirdId, result: { text: "goodbye" } }));
+
+    await expect(third).resolves.toEqual({ text: "goodbye" });
+  });
+
+  it("maps an error response to a rejection and keeps the worker", async () => {
+    const runPython = await loadRunPython();
+
+    const call = runPython("study-suggest", { args: ["--topic", "x"] });
+    const [id] = children[0].requestIds();
+    children[0].reply(JSON.stringify({ id, error: { message: "unknown category" } }));
+
+    await expect(call).rejects.toThrow("Python tool study-suggest failed: unknown category");
+    expect(children[0].kill).not.toHaveBeenCalled();
+
+    const next = runPython("translate", { input: "hola" });
+    const [, nextId] = children[0].requestIds();
+    children[0].reply(JSON.stringify({ id: nextId, result: null }));
+
+    await expect(next).resolves.toBeNull();
+    expect(spawnMock).toHaveBeenCalledTimes(1);
+  });
+
+  it.each(["[1]", '"ok"', "42", "null"])("rejects and retires the worker on a non-object response %s", async (line) => {
+    const runPython = await loadRunPython();
+
+    const call = runPython("translate", { input: "hola" });
+    children[0].reply(line);
+
+    await expect(call).rejects.toThrow("Unexpected response from Python worker");
+    expect(children[0].kill).toHaveBeenCalledTimes(1);
+
+    const retry = runPython("translate", { input: "again" });
+    expect(spawnMock).toHaveBeenCalledTimes(2);
+    const [retryId] = children[1].requestIds();
+    children[1].reply(JSON.stringify({ id: retryId, result: { text: "again" } }));
+
+    await expect(retry).resolves.toEqual({ text: "again" });
+  });
+
+  it("rejects and retires the worker on a line that is not JSON", async () => {
+    const runPython = await loadRunPython();
+
+    const call = runPython("translate", { input: "hola" });
+    children[0].reply("Loading model...");
+
+    await expect(call).rejects.toThrow("Invalid JSON from Python worker");
+    expect(children[0].kill).toHaveBeenCalledTimes(1);
+  });
+});
@@ -1,6 +1,6 @@
-import { spawn } from "node:child_process";
+import { spawn, type ChildProcessWithoutNullStreams } from "node:child_process";
 
-export type PythonTool = "random-subject" | "study-suggest" | "professional-brief";
+export type PythonTool = "random-subject" | "study-suggest" | "professional-brief" | "translate";
 
 interface RunOptions {
   args?: string[];
@@ -8,11 +8,153 @@ interface RunOptions {
   env?: Record<string, string>;
 }
 
-export async function runPython(tool: PythonTool, options: RunOptions = {}): Promise<unknown> {
+function pythonCommand(tool: string): { python: string; args: string[] } {
   const python = process.env.OYB_PYTHON_BIN ?? "python3";
   const cli = process.env.OYB_PYTHON_CLI ?? "-m";
   const baseArgs = cli === "-m" ? ["openyourbubble", tool] : [cli, tool];
-  const child = spawn(python, [...baseArgs, ...(options.args ?? [])], {
+  return { python, args: baseArgs };
+}
+
+function serveEnabled(): boolean {
+  return (process.env.OYB_PYTHON_SERVE ?? "false").toLowerCase() === "true";
+}
+
+// Converts CLI-style flags (`--topic x --professional`) into `oyb serve` params.
+export function argsToParams(args: string[] = []): Record<string, unknown> {
+  const params: Record<string, unknown> = {};
+  for (let index = 0; index < args.length; index += 1) {
+    const flag = args[index];
+    if (!flag.startsWith("--")) continue;
+    const key = flag.slice(2).replace(/-/g, "_");
+    const next = args[index + 1];
+    if (next === undefined || next.startsWith("--")) {
+      params[key] = true;
+    } else {
+      params[key] = next;
+      index += 1;
+    }
+  }
+  return params;
+}
+
+interface PendingCall {
+  tool: PythonTool;
+  worker: ChildProcessWithoutNullStreams;
+  timer: ReturnType<typeof setTimeout>;
+  resolve: (value: unknown) => void;
+  reject: (error: Error) => void;
+}
+
+interface WorkerResponse {
+  id: number;
+  result?: unknown;
+  error?: { message?: string };
+}
+
+let worker: ChildProcessWithoutNullStreams | null = null;
+let nextId = 1;
+const pending = new Map<number, PendingCall>();
+
+function workerTimeoutMs(): number {
+  const value = Number(process.env.OYB_PYTHON_TIMEOUT_MS ?? "120000");
+  return Number.isFinite(value) && value > 0 ? value : 120000;
+}
+
+// Rejects every call waiting on `child`; calls already sent to a newer worker are left alone.
+function failPending(child: ChildProcessWithoutNullStreams, error: Error) {
+  for (const [id, call] of pending) {
+    if (call.worker !== child) continue;
+    clearTimeout(call.timer);
+    pending.delete(id);
+    call.reject(error);
+  }
+}
+
+// Drops a hung or dead worker so the next call spawns a fresh one.
+function retireWorker(child: ChildProcessWithoutNullStreams, error: Error) {
+  if (worker === child) worker = null;
+  failPending(child, error);
+  if (child.exitCode === null && !child.killed) child.kill();
+}
+
+function ensureWorker(): ChildProcessWithoutNullStreams {
+  if (worker && worker.exitCode === null && !worker.killed) {
+    return worker;
+  }
+  const { python, args } = pythonCommand("serve");
+  const child = spawn(python, args, { stdio: ["pipe", "pipe", "pipe"], env: process.env });
+  let buffer = "";
+  const errors: Buffer[] = [];
+
+  child.stdout.on("data", (chunk) => {
+    buffer += chunk.toString("utf8");
+    let newline = buffer.indexOf("\n");
+    while (newline >= 0) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      newline = buffer.indexOf("\n");
+      if (!line) continue;
+      let message: WorkerResponse;
+      try {
+        message = JSON.parse(line) as WorkerResponse;
+      } catch (error) {
+        retireWorker(child, new Error(`Invalid JSON from Python worker: ${error}`));
+        return;
+      }
+      // Every reply is an object carrying its request id; anything else means the stream is out of sync.
+      if (typeof message !== "object" || message === null || Array.isArray(message)) {
+        retireWorker(child, new Error(`Unexpected response from Python worker: ${line.slice(0, 200)}`));
+        return;
+      }
+      const call = pending.get(message.id);
+      if (!call) continue;
+      pending.delete(message.id);
+      clearTimeout(call.timer);
+      if (message.error) {
+        call.reject(new Error(`Python tool ${call.tool} failed: ${message.error.message ?? "unknown error"}`));
+      } else {
+        call.resolve(message.result ?? null);
+      }
+    }
+  });
+  child.stderr.on("data", (chunk) => {
+    errors.push(Buffer.from(chunk));
+    if (errors.length > 50) errors.shift();
+  });
+  child.on("error", (error) => retireWorker(child, error));
+  child.stdin.on("error", (error) => retireWorker(child, error));
+  child.on("close", (code) => {
+    const errorText = Buffer.concat(errors).toString("utf8");
+    retireWorker(child, new Error(`Python worker exited: ${errorText || code}`));
+  });
+
+  worker = child;
+  return child;
+}
+
+function runWorker(tool: PythonTool, options: RunOptions): Promise<unknown> {
+  const child = ensureWorker();
+  const id = nextId;
+  nextId += 1;
+  const params = argsToParams(options.args);
+  if (options.input) {
+    params.text = options.input;
+  }
+  const timeoutMs = workerTimeoutMs();
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => {
+      // A worker that misses one deadline is presumed stuck: fail everything it holds and start over.
+      retireWorker(child, new Error(`Python tool ${tool} timed out after ${timeoutMs} ms`));
+      ensureWorker();
+    }, timeoutMs);
+    pending.set(id, { tool, worker: child, timer, resolve, reject });
+    child.stdin.write(`${JSON.stringify({ id, method: tool, params })}\n`);
+  });
+}
+
+async function runSpawn(tool: PythonTool, options: RunOptions): Promise<unknown> {
+  const { python, args } = pythonCommand(tool);
+  const child = spawn(python, [...args, ...(options.args ?? [])], {
     stdio: ["pipe", "pipe", "pipe"],
     env: {
       ...process.env,
@@ -49,3 +191,11 @@ export async function runPython(tool: PythonTool, options: RunOptions = {}): Pro
     throw new Error(`Invalid JSON from Python tool ${tool}: ${error}`);
   }
 }
+
+export async function runPython(tool: PythonTool, options: RunOptions = {}): Promise<unknown> {
+  // Per-call env overrides need their own interpreter, so only share the worker without them.
+  if (serveEnabled() && !options.env) {
+    return runWorker(tool, options);
+  }
+  return runSpawn(tool, options);
+}